@@ -0,0 +1,206 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from google.cloud import firestore
+from loguru import logger
+from PySide6.QtCore import QStandardPaths
+
+from app import serialization
+from app.settings import conf
+
+CachedDocument = Tuple[str, str, dict]  # id, update time, data
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    query TEXT NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (project, collection, query)
+);
+CREATE TABLE IF NOT EXISTS documents (
+    entry_id INTEGER NOT NULL REFERENCES entries (id) ON DELETE CASCADE,
+    doc_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    update_time TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (entry_id, doc_id)
+);
+"""
+
+
+def default_cache_path() -> Path:
+    if conf.cache_dir:
+        root = Path(conf.cache_dir)
+    else:
+        location = QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation)
+        root = Path(location) / "stora"
+    return root / "snapshots.sqlite3"
+
+
+class SnapshotCache:
+    """Last seen documents of browsed collections, stored in SQLite.
+
+    An entry is keyed by project, collection path and query. Entries are evicted
+    in least-recently-used order once the stored data exceeds ``max_bytes``.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            path = self.path or default_cache_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _entry_id(self, project: str, collection: str, query: str, create=False):
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT id FROM entries WHERE project = ? AND collection = ? AND query = ?",
+            (project, collection, query),
+        ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE entries SET accessed = ? WHERE id = ?", (time.time(), row[0])
+            )
+            return row[0]
+        if not create:
+            return None
+        cursor = conn.execute(
+            "INSERT INTO entries (project, collection, query, accessed) "
+            "VALUES (?, ?, ?, ?)",
+            (project, collection, query, time.time()),
+        )
+        return cursor.lastrowid
+
+    def load(
+        self,
+        project: str,
+        collection: str,
+        query: str,
+        client: Optional[firestore.Client] = None,
+    ) -> List[CachedDocument]:
+        if not conf.cache_enabled:
+            return []
+        with self._lock:
+            conn = self._connect()
+            entry_id = self._entry_id(project, collection, query)
+            if entry_id is None:
+                return []
+            rows = conn.execute(
+                "SELECT doc_id, update_time, data FROM documents "
+                "WHERE entry_id = ? ORDER BY position",
+                (entry_id,),
+            ).fetchall()
+            conn.commit()
+        return [
+            (doc_id, update_time, serialization.loads(data, client))
+            for doc_id, update_time, data in rows
+        ]
+
+    def store(
+        self,
+        project: str,
+        collection: str,
+        query: str,
+        documents: Iterable[CachedDocument],
+        start: int = 0,
+        replace: bool = False,
+    ):
+        """Save documents starting at ``start`` position of the query results"""
+        if not conf.cache_enabled:
+            return
+        rows = [
+            (doc_id, start + i, update_time, serialization.dumps(data))
+            for i, (doc_id, update_time, data) in enumerate(documents)
+        ]
+        try:
+            with self._lock:
+                conn = self._connect()
+                entry_id = self._entry_id(project, collection, query, create=True)
+                if replace:
+                    conn.execute(
+                        "DELETE FROM documents WHERE entry_id = ?", (entry_id,)
+                    )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO documents "
+                    "(entry_id, doc_id, position, update_time, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(entry_id, *row) for row in rows],
+                )
+                self._update_sizes(conn, [entry_id])
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error:
+            logger.exception(
+                "Failed to store documents of {col} in cache", col=collection
+            )
+
+    def invalidate(
+        self, project: str, collection: str, doc_ids: Optional[Iterable[str]] = None
+    ):
+        """Forget given documents of a collection in every query, or whole entries"""
+        if not conf.cache_enabled:
+            return
+        with self._lock:
+            conn = self._connect()
+            entries = "SELECT id FROM entries WHERE project = ? AND collection = ?"
+            if doc_ids is None:
+                conn.execute(
+                    f"DELETE FROM entries WHERE id IN ({entries})",
+                    (project, collection),
+                )
+            else:
+                doc_ids = list(doc_ids)
+                entry_ids = [
+                    row[0] for row in conn.execute(entries, (project, collection))
+                ]
+                conn.executemany(
+                    "DELETE FROM documents WHERE entry_id = ? AND doc_id = ?",
+                    [(e, doc_id) for e in entry_ids for doc_id in doc_ids],
+                )
+                self._update_sizes(conn, entry_ids)
+            conn.commit()
+
+    def invalidate_path(self, project: str, path: str):
+        """Forget a document given by its full path"""
+        collection, doc_id = path.rsplit("/", 1)
+        self.invalidate(project, collection, [doc_id])
+
+    @staticmethod
+    def _update_sizes(conn: sqlite3.Connection, entry_ids: List[int]):
+        conn.executemany(
+            "UPDATE entries SET size = (SELECT COALESCE(SUM(LENGTH(data)), 0) "
+            "FROM documents WHERE entry_id = entries.id) WHERE id = ?",
+            [(entry_id,) for entry_id in entry_ids],
+        )
+
+    def _evict(self, conn: sqlite3.Connection):
+        max_bytes = self.max_bytes or conf.cache_max_bytes
+        sizes = conn.execute(
+            "SELECT id, size FROM entries ORDER BY accessed DESC"
+        ).fetchall()
+        total = 0
+        evicted = []
+        for entry_id, size in sizes:
+            total += size
+            if total > max_bytes:
+                evicted.append((entry_id,))
+        if evicted:
+            logger.debug("Evicting {n} cache entries", n=len(evicted))
+            conn.executemany("DELETE FROM entries WHERE id = ?", evicted)
+
+
+cache = SnapshotCache()
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from google.cloud import firestore
+from loguru import logger
+
+from app.db import default_emulator_host, get_firestore_emulator_client
+from app.settings import conf
+
+# project and emulator host
+ClientKey = Tuple[str, str]
+
+
+class ClientRegistry:
+    """Firestore clients shared by everything connected to the same database.
+
+    A client, and the gRPC channel it opens, is created once per project and
+    emulator host. Clients nobody uses anymore are kept for a while, so
+    connecting to a database again doesn't open a new channel.
+    """
+
+    def __init__(self, max_idle: Optional[int] = None):
+        self.max_idle = conf.idle_clients if max_idle is None else max_idle
+        self._clients: Dict[ClientKey, firestore.Client] = {}
+        self._users: Dict[ClientKey, int] = {}
+        # unused clients, the least recently released first
+        self._idle: Dict[ClientKey, firestore.Client] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(project: str, emulator_host: Optional[str] = None) -> ClientKey:
+        return project, emulator_host or default_emulator_host()
+
+    def acquire(
+        self, project: str, emulator_host: Optional[str] = None
+    ) -> firestore.Client:
+        """A client of the database, to be given back with release()"""
+        key = self.key(project, emulator_host)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._idle.pop(key, None)
+            if client is None:
+                logger.debug("Creating a client of {} at {}", *key)
+                client = get_firestore_emulator_client(*key)
+            self._clients[key] = client
+            self._users[key] = self._users.get(key, 0) + 1
+            return client
+
+    def release(self, client: firestore.Client):
+        key = self.key(client.project, client._emulator_host)
+        with self._lock:
+            if self._clients.get(key) is not client:
+                return
+            self._users[key] -= 1
+            if self._users[key]:
+                return
+            del self._users[key]
+            del self._clients[key]
+            self._idle[key] = client
+            while len(self._idle) > self.max_idle:
+                _, oldest = self._idle.popitem(last=False)
+                self._close(oldest)
+
+    def close_all(self):
+        with self._lock:
+            clients = [*self._clients.values(), *self._idle.values()]
+            self._clients.clear()
+            self._users.clear()
+            self._idle.clear()
+        for client in clients:
+            self._close(client)
+
+    @staticmethod
+    def _close(client: firestore.Client):
+        try:
+            client.close()
+        except Exception:
+            logger.exception("Failed to close the client of {}", client.project)
+
+
+clients = ClientRegistry()
@@ -1,22 +1,112 @@
+import datetime
+import itertools
 import json
-from typing import Optional, Type
+import os
+import queue
+import string
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
 from unittest.mock import Mock
 
 import google.auth.credentials
-from google.api_core.exceptions import GoogleAPIError
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+from google.api_core.exceptions import FailedPrecondition, GoogleAPIError, NotFound
 from google.cloud import firestore
-from google.cloud.firestore_v1 import DocumentReference
+from google.cloud.firestore_v1 import (
+    CollectionReference,
+    DocumentReference,
+    DocumentSnapshot,
+)
+from google.cloud.firestore_v1.base_query import BaseQuery
+from google.cloud.firestore_v1.field_path import FieldPath
 from loguru import logger
 
-from app.widgets.dialogs.error import show_error
+from app.cache import cache
+from app.metrics import instrument_client
+from app.settings import conf
 
 
 def _make_credentials() -> Mock:
     return Mock(spec=google.auth.credentials.Credentials)
 
 
-def get_firestore_emulator_client(project_name) -> firestore.Client:
-    return firestore.Client(project=project_name, credentials=_make_credentials())
+def get_firestore_emulator_client(
+    project_name: str, emulator_host: Optional[str] = None
+) -> firestore.Client:
+    client = firestore.Client(project=project_name, credentials=_make_credentials())
+    # the client reads the host from the environment, but opens its channel
+    # only on the first request, so every client can have its own emulator
+    client._emulator_host = emulator_host or default_emulator_host()
+    return instrument_client(client)
+
+
+def default_emulator_host() -> str:
+    return os.environ.get("FIRESTORE_EMULATOR_HOST") or conf.emulator_host
+
+
+def _project_of(ref: Union[CollectionReference, DocumentReference]) -> str:
+    return ref._client.project
+
+
+def document_data(doc: DocumentSnapshot) -> dict:
+    """Fields of a snapshot without the deep copy made by ``to_dict()``.
+
+    The result is shared with the snapshot, so it must only be read.
+    """
+    data = getattr(doc, "_data", None)
+    return data if data is not None else doc.to_dict() or {}
+
+
+def update_time_key(doc: DocumentSnapshot) -> str:
+    """A comparable representation of the document's last update time"""
+    return timestamp_key(doc.update_time)
+
+
+def timestamp_key(update_time) -> str:
+    if update_time is None:
+        return ""
+    if isinstance(update_time, datetime.datetime):
+        # much cheaper than rfc3339(), and refresh compares every shown document
+        # times made locally only have microseconds
+        nanosecond = getattr(update_time, "nanosecond", 0) or (
+            update_time.microsecond * 1000
+        )
+        return f"{update_time.isoformat()}/{nanosecond}"
+    if hasattr(update_time, "ToJsonString"):
+        return update_time.ToJsonString()
+    return str(update_time)
+
+
+# types which can be entered in the GUI, by their index in the type dropdown
+TYPE_TO_DROPDOWN_INDEX = {
+    str: 0,
+    bool: 1,
+    int: 2,
+    float: 2,
+    DatetimeWithNanoseconds: 3,
+    list: 4,
+    dict: 4,
+}
+
+
+def timestamp_from_key(key: str) -> DatetimeWithNanoseconds:
+    """Reverse ``timestamp_key``"""
+    text, _, nanosecond = key.partition("/")
+    if not nanosecond:
+        return DatetimeWithNanoseconds.from_rfc3339(text)
+    dt = datetime.datetime.fromisoformat(text)
+    return DatetimeWithNanoseconds(
+        dt.year,
+        dt.month,
+        dt.day,
+        dt.hour,
+        dt.minute,
+        dt.second,
+        nanosecond=int(nanosecond),
+        tzinfo=dt.tzinfo,
+    )
 
 
 def convert_value(value: str, convert_to: Type):
@@ -26,17 +116,442 @@ def convert_value(value: str, convert_to: Type):
         return float(value)
     elif convert_to in {dict, list}:
         return json.loads(value)
+    elif convert_to == bool:
+        return value.strip().lower() in ("true", "1", "yes")
+    elif convert_to == DatetimeWithNanoseconds:
+        return DatetimeWithNanoseconds.from_rfc3339(value)
+    elif convert_to == str:
+        return value
 
 
 def update_document_value(
-    doc_ref: DocumentReference, key: str, value, convert_to: Optional[Type] = None
-) -> bool:
+    doc_ref: DocumentReference,
+    key: str,
+    value,
+    convert_to: Optional[Type] = None,
+    update_time: Optional[str] = None,
+) -> Optional[str]:
+    """Update a field, returns the new update time of the document or None.
+
+    Given the update time the document was read at, the update is done only if
+    nobody changed the document since.
+    """
     if convert_to:
         value = convert_value(value, convert_to)
+    option = None
+    if update_time is not None:
+        option = _write_option(doc_ref._client, update_time)
     try:
-        doc_ref.update({key: value})
+        result = doc_ref.update({key: value}, option=option)
     except GoogleAPIError:
         logger.exception("Failed to update document {path}", path=doc_ref.path)
-        show_error("Failed to update document!")
-        return False
-    return True
+        return None
+    finally:
+        cache.invalidate_path(_project_of(doc_ref), doc_ref.path)
+    return timestamp_key(result.update_time)
+
+
+def add_document(
+    collection: CollectionReference, document: dict, document_id: Optional[str] = None
+) -> DocumentReference:
+    _, doc_ref = collection.add(document, document_id=document_id)
+    # a new document may belong to any cached query of the collection
+    cache.invalidate(_project_of(collection), "/".join(collection._path))
+    return doc_ref
+
+
+def _chunks(items: List, size: int) -> Iterator[List]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _delete_batch(client: firestore.Client, paths: List[str]) -> List[str]:
+    batch = client.batch()
+    for path in paths:
+        batch.delete(client.document(path))
+    try:
+        batch.commit()
+    finally:
+        by_collection = defaultdict(list)
+        for path in paths:
+            collection, doc_id = path.rsplit("/", 1)
+            by_collection[collection].append(doc_id)
+        for collection, doc_ids in by_collection.items():
+            cache.invalidate(client.project, collection, doc_ids)
+    return paths
+
+
+def delete_document_paths(
+    client: firestore.Client,
+    paths: List[str],
+    batch_size: Optional[int] = None,
+    parallelism: Optional[int] = None,
+) -> Iterator[Tuple[List[str], List[str]]]:
+    """Delete documents in write batches committed concurrently.
+
+    Yields ``(deleted, failed)`` paths for every batch as soon as it's committed.
+    """
+    executor = ThreadPoolExecutor(max_workers=parallelism or conf.write_parallelism)
+    try:
+        futures = {
+            executor.submit(_delete_batch, client, chunk): chunk
+            for chunk in _chunks(paths, batch_size or conf.write_batch_size)
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result(), []
+            except GoogleAPIError:
+                logger.exception("Failed to delete a batch of documents")
+                yield [], futures[future]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _changed_paths(client: firestore.Client, update_times: Dict[str, str]) -> List[str]:
+    """Documents which were removed or updated since the given update times"""
+    refs = [client.document(path) for path in update_times]
+    return [
+        snapshot.reference.path
+        for snapshot in client.get_all(refs)
+        if not snapshot.exists
+        or update_time_key(snapshot) != update_times[snapshot.reference.path]
+    ]
+
+
+def _write_option(client: firestore.Client, update_time: str):
+    """A precondition of a write to a document last updated at the given time"""
+    if not update_time:
+        return client.write_option(exists=True)
+    # as protobuf, which unlike datetime keeps nanoseconds
+    timestamp = timestamp_from_key(update_time).timestamp_pb()
+    return client.write_option(last_update_time=timestamp)
+
+
+def _commit_updates(
+    client: firestore.Client, items: List[Tuple[str, Tuple[Dict[str, Any], str]]]
+) -> Dict[str, str]:
+    """Write updates in one batch, returns new update times by path"""
+    batch = client.batch()
+    for path, (fields, update_time) in items:
+        option = _write_option(client, update_time)
+        # keys are whole field names, not paths of nested fields
+        fields = {FieldPath(k).to_api_repr(): v for k, v in fields.items()}
+        batch.update(client.document(path), fields, option=option)
+    results = batch.commit()
+    return {
+        path: timestamp_key(result.update_time)
+        for (path, _), result in zip(items, results)
+    }
+
+
+def commit_document_changes(
+    client: firestore.Client,
+    changes: Dict[str, Tuple[Dict[str, Any], str]],
+    batch_size: Optional[int] = None,
+) -> Tuple[Dict[str, str], List[str]]:
+    """Update fields of documents by path, with one write batch per ``batch_size``.
+
+    Each update is done only if the document wasn't touched since the update
+    time given with its fields. A batch is written as a whole or not at all,
+    so once it's rejected, it's written again without documents which were
+    changed by others. Returned are new update times of committed documents
+    by path, and paths of the changed ones.
+    """
+    committed: Dict[str, str] = {}
+    conflicts: List[str] = []
+    items = list(changes.items())
+    try:
+        for chunk in _chunks(items, batch_size or conf.write_batch_size):
+            while chunk:
+                try:
+                    committed.update(_commit_updates(client, chunk))
+                    break
+                except (FailedPrecondition, NotFound):
+                    logger.warning("Documents were changed since they were edited")
+                    update_times = {
+                        path: update_time for path, (_, update_time) in chunk
+                    }
+                    changed = set(_changed_paths(client, update_times))
+                    if not changed:
+                        # rejected for a reason which can't be told apart, so
+                        # it's given up rather than retried forever
+                        changed = set(update_times)
+                    conflicts.extend(path for path, _ in chunk if path in changed)
+                    chunk = [item for item in chunk if item[0] not in changed]
+    finally:
+        for path, _ in items:
+            collection, doc_id = path.rsplit("/", 1)
+            cache.invalidate(client.project, collection, [doc_id])
+    return committed, conflicts
+
+
+def list_collection_names(
+    client: firestore.Client, doc_path: Optional[str] = None
+) -> List[str]:
+    """Names of root collections, or subcollections of a document"""
+    parent = client.document(doc_path) if doc_path else client
+    return sorted(col.id for col in parent.collections())
+
+
+def iter_document_ids(
+    client: firestore.Client,
+    col_path: str,
+    page_size: int,
+    start_after: Optional[str] = None,
+) -> Iterator[str]:
+    """Ids of documents in a collection, including missing ones with subcollections.
+
+    Documents are listed in order of their ids, so ``start_after`` continues a
+    listing which failed. The listing can't start there, so earlier ids are skipped.
+    """
+    for doc_ref in client.collection(col_path).list_documents(page_size=page_size):
+        if start_after is None or doc_ref.id > start_after:
+            yield doc_ref.id
+
+
+def take(iterator: Iterator, n: int) -> Tuple[List, bool]:
+    """Next ``n`` items of an iterator, and whether there may be more of them"""
+    items = list(itertools.islice(iterator, n))
+    return items, len(items) == n
+
+
+def stream_documents(
+    query: BaseQuery, chunk_size: int = 50
+) -> Iterator[List[DocumentSnapshot]]:
+    """Stream query results grouped in chunks, so they can be shown progressively"""
+    chunk = []
+    for doc in query.stream():
+        chunk.append(doc)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_pages(
+    query: BaseQuery, page_size: int, limit: Optional[int] = None
+) -> Iterator[List[DocumentSnapshot]]:
+    """Read query results with one request per page, resuming after the last one.
+
+    Unlike a single stream, only one page is held at a time and a long read
+    isn't cut by the server's deadline.
+    """
+    last_doc = None
+    read = 0
+    while True:
+        size = page_size if limit is None else min(page_size, limit - read)
+        if size <= 0:
+            return
+        page = query.limit(size)
+        if last_doc is not None:
+            page = page.start_after(last_doc)
+        docs = list(page.stream())
+        if docs:
+            yield docs
+        if len(docs) < size:
+            return
+        read += len(docs)
+        last_doc = docs[-1]
+
+
+# Auto-generated document ids are 20 characters drawn uniformly from this
+# alphabet, which makes it a good source of split points on __name__.
+AUTO_ID_ALPHABET = "".join(sorted(string.ascii_letters + string.digits))
+# printable ASCII characters which can be in a document id, in the order of ids
+_ASCII_ID_ALPHABET = "".join(chr(c) for c in range(0x20, 0x7F) if chr(c) != "/")
+
+
+def _first_and_last_ids(col_ref: CollectionReference) -> Optional[Tuple[str, str]]:
+    """Ids of the first and the last document of a collection, reading only keys"""
+    keys = col_ref.select([]).limit(1)
+    first = keys.order_by("__name__").get()
+    last = keys.order_by("__name__", direction=firestore.Query.DESCENDING).get()
+    if not first or not last:
+        return None
+    return first[0].id, last[0].id
+
+
+def _ids_between(first: str, last: str, count: int, alphabet: str) -> List[str]:
+    """Ids spread evenly between two ids, read as numbers written in the alphabet"""
+    # the shared prefix, the first differing character and two more
+    width = len(os.path.commonprefix([first, last])) + 3
+    base = len(alphabet)
+
+    def to_number(text: str) -> int:
+        number = 0
+        for char in text[:width].ljust(width, alphabet[0]):
+            number = number * base + alphabet.index(char)
+        return number
+
+    low, high = to_number(first), to_number(last)
+    ids = set()
+    for i in range(1, count):
+        number = low + (high - low) * i // count
+        chars = []
+        for _ in range(width):
+            number, digit = divmod(number, base)
+            chars.append(alphabet[digit])
+        ids.add("".join(reversed(chars)).rstrip(alphabet[0]) or alphabet[0])
+    return sorted(
+        i
+        for i in ids
+        if first < i <= last
+        and i not in (".", "..")
+        and not (i.startswith("__") and i.endswith("__"))
+    )
+
+
+def split_points(first: str, last: str, partitions: int) -> List[str]:
+    """Ids splitting the range between the first and last ids into partitions.
+
+    Ids are assumed to be spread evenly over the characters they're made of,
+    like auto-generated ones, ids with a common prefix or numeric ones. Ranges
+    of ids with other characters are split by the auto-id alphabet.
+    """
+    for alphabet in (AUTO_ID_ALPHABET, _ASCII_ID_ALPHABET):
+        if set(first + last) <= set(alphabet):
+            return _ids_between(first, last, partitions, alphabet)
+    step = len(AUTO_ID_ALPHABET) / partitions
+    return [AUTO_ID_ALPHABET[round(i * step)] for i in range(1, partitions)]
+
+
+def split_collection(
+    client: firestore.Client, col_path: str, partitions: int, query=None
+) -> List[BaseQuery]:
+    """Split a collection (or a query on it) into disjoint ranges on __name__.
+
+    Ranges are cut between the first and the last id of the collection, so
+    skewed ids (e.g. all starting with the same character) still get spread.
+    """
+    col_ref = client.collection(col_path)
+    query = query if query is not None else col_ref
+    partitions = max(1, min(partitions, len(AUTO_ID_ALPHABET)))
+    ends = _first_and_last_ids(col_ref) if partitions > 1 else None
+    bounds = split_points(*ends, partitions) if ends else []
+
+    queries = []
+    for start, end in zip([None] + bounds, bounds + [None]):
+        part = query
+        if start is not None:
+            part = part.where("__name__", ">=", col_ref.document(start))
+        if end is not None:
+            part = part.where("__name__", "<", col_ref.document(end))
+        queries.append(part.order_by("__name__"))
+    return queries
+
+
+def collection_group_partitions(
+    client: firestore.Client, collection_id: str, partitions: int
+) -> List[BaseQuery]:
+    """Server-chosen partitions of all collections with the given id"""
+    group = client.collection_group(collection_id)
+    return [p.query() for p in group.get_partitions(partitions)]
+
+
+_SCAN_DONE = object()
+
+
+def _scan_partition(
+    index: int,
+    query: BaseQuery,
+    chunk_size: int,
+    results: queue.Queue,
+    stopped: threading.Event,
+):
+    def put(item):
+        while not stopped.is_set():
+            try:
+                results.put((index, item), timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    try:
+        for chunk in stream_documents(query, chunk_size):
+            if stopped.is_set():
+                return
+            put(chunk)
+    except Exception as e:
+        put(e)
+    else:
+        put(_SCAN_DONE)
+
+
+def scan_documents(
+    queries: List[BaseQuery],
+    parallelism: Optional[int] = None,
+    chunk_size: int = 200,
+    ordered: bool = False,
+) -> Iterator[List[DocumentSnapshot]]:
+    """Stream several partition queries concurrently as one generator of chunks.
+
+    Unordered scans keep at most a few chunks per partition in memory. Ordered
+    scans yield partitions one after another, buffering the ones that are ahead.
+    """
+    parallelism = parallelism or conf.scan_parallelism
+    results = queue.Queue(maxsize=parallelism * 4)
+    stopped = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=parallelism)
+    for i, query in enumerate(queries):
+        executor.submit(_scan_partition, i, query, chunk_size, results, stopped)
+
+    buffered = defaultdict(list)
+    done = set()
+    current = 0
+    try:
+        while len(done) < len(queries):
+            index, item = results.get()
+            if isinstance(item, Exception):
+                raise item
+            if item is _SCAN_DONE:
+                done.add(index)
+            elif not ordered:
+                yield item
+            else:
+                buffered[index].append(item)
+
+            while ordered and current < len(queries):
+                yield from buffered.pop(current, [])
+                if current not in done:
+                    break
+                current += 1
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def scan_collection(
+    client: firestore.Client,
+    col_path: str,
+    query=None,
+    partitions: Optional[int] = None,
+    ordered: bool = False,
+) -> Iterator[List[DocumentSnapshot]]:
+    """Read a whole collection with partitions streamed in parallel"""
+    queries = split_collection(
+        client, col_path, partitions or conf.scan_partitions, query
+    )
+    return scan_documents(queries, ordered=ordered)
+
+
+def scan_collection_group(
+    client: firestore.Client,
+    collection_id: str,
+    partitions: Optional[int] = None,
+    ordered: bool = False,
+) -> Iterator[List[DocumentSnapshot]]:
+    """Read every collection with the given id, in partitions chosen by the server"""
+    queries = collection_group_partitions(
+        client, collection_id, partitions or conf.scan_partitions
+    )
+    return scan_documents(queries, ordered=ordered)
+
+
+def scan_all_collections(
+    client: firestore.Client,
+) -> Iterator[Tuple[str, List[DocumentSnapshot]]]:
+    """Read every root collection, one after another, in chunks of documents"""
+    for col_path in list_collection_names(client):
+        for chunk in scan_collection(client, col_path):
+            yield col_path, chunk
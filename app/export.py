@@ -0,0 +1,135 @@
+import csv
+import json
+import shutil
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from google.cloud.firestore_v1 import DocumentSnapshot
+
+from app.db import document_data
+from app.serialization import TYPE_KEY, encode_value
+from app.utils import format_bytes
+
+NDJSON = "ndjson"
+CSV = "csv"
+FORMATS = {".ndjson": NDJSON, ".jsonl": NDJSON, ".csv": CSV}
+# Firestore reserves field names like __this__, so it can't clash with a field
+ID_FIELD = "__id__"
+
+Pages = Iterable[List[DocumentSnapshot]]
+
+
+@dataclass
+class ExportProgress:
+    documents: int = 0
+    bytes_written: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.documents / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.documents} document(s), {self.rate:.0f}/s, "
+            f"{format_bytes(self.bytes_written)}"
+        )
+
+
+def format_of(path: Union[str, Path]) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Unknown export format: {suffix or path}")
+    return FORMATS[suffix]
+
+
+def ndjson_line(doc: DocumentSnapshot) -> str:
+    """A document as one JSON line; typed values keep their serialization tags"""
+    record = {ID_FIELD: doc.id}
+    record.update(encode_value(document_data(doc)))
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def csv_cell(value: Any) -> str:
+    """Strings as they are, typed values as plain text, maps and arrays as JSON"""
+    if isinstance(value, str):
+        return value
+    encoded = encode_value(value)
+    if isinstance(encoded, dict) and TYPE_KEY in encoded:
+        encoded = encoded["value"]
+        if isinstance(encoded, str):
+            return encoded
+    return json.dumps(encoded, separators=(",", ":"), ensure_ascii=False)
+
+
+def _write_ndjson(pages: Pages, path: Path) -> Iterator[ExportProgress]:
+    progress = ExportProgress()
+    with path.open("w", encoding="utf-8", newline="\n") as f:
+        for page in pages:
+            f.writelines(map(ndjson_line, page))
+            progress.documents += len(page)
+            progress.bytes_written = f.tell()
+            yield progress
+
+
+def _write_csv(pages: Pages, path: Path) -> Iterator[ExportProgress]:
+    # the header is known only at the end, so rows go to a separate file first;
+    # rows written before a field was seen are just shorter than the header
+    rows_path = path.with_name(path.name + ".rows")
+    columns: Dict[str, int] = {}
+    progress = ExportProgress()
+    try:
+        with rows_path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            for page in pages:
+                for doc in page:
+                    data = document_data(doc)
+                    for key in data:
+                        columns.setdefault(key, len(columns) + 1)
+                    row = [""] * (len(columns) + 1)
+                    row[0] = doc.id
+                    for key, value in data.items():
+                        row[columns[key]] = csv_cell(value)
+                    writer.writerow(row)
+                progress.documents += len(page)
+                progress.bytes_written = f.tell()
+                yield progress
+
+        with path.open("w", encoding="utf-8", newline="") as out:
+            csv.writer(out).writerow([ID_FIELD, *columns])
+            with rows_path.open(encoding="utf-8", newline="") as f:
+                shutil.copyfileobj(f, out)
+            progress.bytes_written = out.tell()
+    finally:
+        rows_path.unlink(missing_ok=True)
+
+
+def export_documents(
+    pages: Pages, path: Union[str, Path], format_: Optional[str] = None
+) -> Iterator[ExportProgress]:
+    """Write pages of documents to a file, reporting progress after every page.
+
+    Pages are consumed one by one, so memory use doesn't depend on the amount
+    of documents. The file appears under its name only once it's complete.
+    """
+    path = Path(path)
+    format_ = format_ or format_of(path)
+    write = _write_csv if format_ == CSV else _write_ndjson
+    partial_path = path.with_name(path.name + ".part")
+    started = time.perf_counter()
+    progress = ExportProgress()
+    writer = write(pages, partial_path)
+    try:
+        for progress in writer:
+            progress.elapsed = time.perf_counter() - started
+            # a copy, the writer keeps updating its own one in the worker thread
+            yield replace(progress)
+        partial_path.replace(path)
+    finally:
+        # closes the file of a cancelled export before it's removed
+        writer.close()
+        partial_path.unlink(missing_ok=True)
+    progress.elapsed = time.perf_counter() - started
+    return progress
@@ -0,0 +1,313 @@
+import csv
+import hashlib
+import json
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from google.api_core import exceptions
+from google.cloud import firestore
+from google.cloud.firestore_v1 import DocumentReference, GeoPoint
+from loguru import logger
+
+from app.cache import cache
+from app.db import AUTO_ID_ALPHABET, TYPE_TO_DROPDOWN_INDEX, convert_value, take
+from app.export import CSV, ID_FIELD, format_of
+from app.query import parse_value
+from app.serialization import TYPE_KEY, decode_value
+from app.settings import conf
+
+# an id (None for a generated one) and fields of a document
+Record = Tuple[Optional[str], Dict[str, Any]]
+# a record and its line (or row) in the source, counting blank ones
+PositionedRecord = Tuple[int, Record]
+
+# errors of an overloaded server, worth retrying after a while
+RETRYABLE_ERRORS = (
+    exceptions.Aborted,
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+    exceptions.ResourceExhausted,
+    exceptions.ServiceUnavailable,
+)
+_MAX_BACKOFF = 30
+# types the CSV export writes as plain text, which can't be entered in the GUI
+_TAGGED_TYPES = {GeoPoint: "geopoint", DocumentReference: "reference", bytes: "bytes"}
+
+
+def coerce_value(
+    text: str, type_: Optional[Type] = None, client: Optional[firestore.Client] = None
+) -> Any:
+    """Parse a CSV cell, written by the CSV export, as a value of the given type.
+
+    Cells of unknown columns are parsed as JSON when possible.
+    """
+    if type_ in (int, float):
+        # like the number input, which doesn't tell integers from floats
+        type_ = int if text.lstrip("-").isdigit() else float
+    if type_ in TYPE_TO_DROPDOWN_INDEX:
+        value = convert_value(text, type_)
+        return decode_value(value, client) if type_ in (dict, list) else value
+    if type_ in _TAGGED_TYPES:
+        value = parse_value(text) if type_ is GeoPoint else text
+        return decode_value({TYPE_KEY: _TAGGED_TYPES[type_], "value": value}, client)
+    return decode_value(parse_value(text), client)
+
+
+@contextmanager
+def _open_source(path: Union[str, Path]) -> Iterator[IO[str]]:
+    if str(path) == "-":
+        yield sys.stdin
+    else:
+        with open(path, encoding="utf-8", newline="") as f:
+            yield f
+
+
+def read_ndjson(
+    path: Union[str, Path], start: int = 0, client: Optional[firestore.Client] = None
+) -> Iterator[PositionedRecord]:
+    """Documents of an NDJSON file, skipping the first ``start`` and blank lines"""
+    with _open_source(path) as f:
+        for position, line in enumerate(f):
+            if position < start:
+                continue
+            line = line.strip()
+            if not line:
+                continue
+            data = decode_value(json.loads(line), client)
+            yield position, (data.pop(ID_FIELD, None), data)
+
+
+def read_csv(
+    path: Union[str, Path],
+    start: int = 0,
+    structure: Optional[Dict[str, Type]] = None,
+    client: Optional[firestore.Client] = None,
+) -> Iterator[PositionedRecord]:
+    """Documents of a CSV file, skipping the first ``start`` rows after the header.
+
+    Empty cells are missing fields, the rest is coerced to types of the
+    ``structure``. Blank lines are skipped.
+    """
+    structure = structure or {}
+    with _open_source(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        types = [structure.get(key) for key in header]
+        for position, row in enumerate(reader):
+            if position < start or not row:
+                continue
+            data = {
+                key: coerce_value(text, type_, client)
+                for key, type_, text in zip(header, types, row)
+                if text != ""
+            }
+            yield position, (data.pop(ID_FIELD, None), data)
+
+
+def read_records(
+    path: Union[str, Path],
+    start: int = 0,
+    client: Optional[firestore.Client] = None,
+    structure: Optional[Dict[str, Type]] = None,
+    format_: Optional[str] = None,
+) -> Iterator[PositionedRecord]:
+    if (format_ or format_of(path)) == CSV:
+        return read_csv(path, start, structure, client)
+    return read_ndjson(path, start, client)
+
+
+def generated_id(seed: str, position: int) -> str:
+    """An id looking like an auto-generated one, but the same for every attempt"""
+    digest = hashlib.blake2b(f"{seed}/{position}".encode(), digest_size=16).digest()
+    number = int.from_bytes(digest, "big")
+    chars = []
+    for _ in range(20):
+        number, index = divmod(number, len(AUTO_ID_ALPHABET))
+        chars.append(AUTO_ID_ALPHABET[index])
+    return "".join(chars)
+
+
+@dataclass
+class Checkpoint:
+    """Progress of an import saved next to its source, to resume it later.
+
+    Every record before ``position`` is written. The seed makes ids generated
+    for records without one the same after resuming, so nothing is duplicated.
+    """
+
+    source: str
+    collection: str
+    position: int = 0
+    seed: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Checkpoint"]:
+        try:
+            return cls(**json.loads(path.read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, path: Path):
+        # written aside first, so a crash never leaves a broken checkpoint
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(asdict(self)))
+        tmp.replace(path)
+
+
+def checkpoint_path(source: Union[str, Path]) -> Path:
+    return Path(f"{source}.checkpoint")
+
+
+@dataclass
+class ImportProgress:
+    written: int = 0
+    failed: int = 0
+    retries: int = 0
+    # every record before it is written
+    position: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.written / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        text = f"{self.written} document(s), {self.rate:.0f}/s"
+        if self.retries:
+            text += f", {self.retries} retries"
+        if self.failed:
+            text += f", {self.failed} failed"
+        return text
+
+
+@dataclass
+class _Batch:
+    # positions of the records, and of blank lines among and before them
+    start: int
+    end: int
+    records: List[Record]
+    attempt: int = 0
+
+
+def _commit_batch(
+    client: firestore.Client, col_path: str, batch: _Batch, delay: float
+) -> int:
+    if delay:
+        time.sleep(delay)
+    col_ref = client.collection(col_path)
+    write_batch = client.batch()
+    for doc_id, data in batch.records:
+        write_batch.set(col_ref.document(doc_id), data)
+    write_batch.commit()
+    return len(batch.records)
+
+
+def _backoff(attempt: int) -> float:
+    delay = min(_MAX_BACKOFF, conf.import_backoff * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1)
+
+
+def import_documents(
+    client: firestore.Client,
+    col_path: str,
+    source: Union[str, Path],
+    structure: Optional[Dict[str, Type]] = None,
+    batch_size: Optional[int] = None,
+    parallelism: Optional[int] = None,
+    checkpoint: Optional[Checkpoint] = None,
+    checkpoint_file: Optional[Path] = None,
+    format_: Optional[str] = None,
+) -> Iterator[ImportProgress]:
+    """Write documents of an NDJSON or CSV file in batches committed concurrently.
+
+    Like Firestore's BulkWriter, the amount of batches in flight is halved
+    whenever the server pushes back and grows by one with every success;
+    failed batches are retried with an exponential backoff. Progress is saved
+    to ``checkpoint_file`` as batches complete, so a stopped import can be
+    resumed by passing the loaded checkpoint back.
+    """
+    batch_size = min(batch_size or conf.write_batch_size, 500)
+    parallelism = parallelism or conf.import_parallelism
+    if checkpoint is None:
+        checkpoint = Checkpoint(source=str(source), collection=col_path)
+    if checkpoint_file is not None:
+        # the seed has to survive even if no batch is written
+        checkpoint.save(checkpoint_file)
+    records = read_records(source, checkpoint.position, client, structure, format_)
+
+    progress = ImportProgress(position=checkpoint.position)
+    started = time.perf_counter()
+    limit = parallelism
+    pending: Dict[Future, _Batch] = {}
+    # starts and ends of written batches the checkpoint can't move past yet
+    done: Dict[int, int] = {}
+    has_more = True
+    next_start = checkpoint.position
+    executor = ThreadPoolExecutor(max_workers=parallelism)
+
+    def submit(batch: _Batch, delay: float = 0):
+        future = executor.submit(_commit_batch, client, col_path, batch, delay)
+        pending[future] = batch
+
+    try:
+        while has_more or pending:
+            while has_more and len(pending) < limit:
+                items, has_more = take(records, batch_size)
+                if not items:
+                    break
+                batch = _Batch(next_start, items[-1][0] + 1, [])
+                next_start = batch.end
+                for position, (doc_id, data) in items:
+                    doc_id = doc_id or generated_id(checkpoint.seed, position)
+                    batch.records.append((doc_id, data))
+                submit(batch)
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                batch = pending.pop(future)
+                try:
+                    progress.written += future.result()
+                except exceptions.GoogleAPIError as e:
+                    retryable = isinstance(e, RETRYABLE_ERRORS)
+                    if retryable:
+                        limit = max(1, limit // 2)
+                    if retryable and batch.attempt < conf.import_max_retries:
+                        batch.attempt += 1
+                        progress.retries += 1
+                        submit(batch, _backoff(batch.attempt))
+                    else:
+                        logger.exception(
+                            "Failed to import records {start}-{end}",
+                            start=batch.start,
+                            end=batch.end,
+                        )
+                        progress.failed += len(batch.records)
+                    continue
+                limit = min(parallelism, limit + 1)
+                done[batch.start] = batch.end
+
+            # a failed batch never gets into done, so the checkpoint stops there
+            while progress.position in done:
+                progress.position = done.pop(progress.position)
+            if checkpoint_file is not None and checkpoint.position < progress.position:
+                checkpoint.position = progress.position
+                checkpoint.save(checkpoint_file)
+            progress.elapsed = time.perf_counter() - started
+            yield replace(progress)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        cache.invalidate(client.project, col_path)
+
+    if checkpoint_file is not None and not progress.failed:
+        checkpoint_file.unlink(missing_ok=True)
+    progress.elapsed = time.perf_counter() - started
+    return progress
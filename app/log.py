@@ -0,0 +1,13 @@
+import sys
+
+from loguru import logger
+
+from app.settings import conf
+
+
+def setup_logging():
+    logger.remove()
+    logger.add(sys.stderr, level=conf.log_level)
+    if conf.log_file:
+        # every record including structured events (e.g. Firestore RPCs) as JSON
+        logger.add(conf.log_file, level="DEBUG", serialize=True)
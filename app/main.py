@@ -1,21 +1,43 @@
+import argparse
 import os
 import sys
+from typing import List, Optional
+
+from app.startup import startup  # isort: skip
 
 from PySide6.QtWidgets import QApplication
 
+from app.log import setup_logging
 from app.utils import apply_theme
 from app.widgets.main_window import MainWindow
 
-os.environ["FIRESTORE_EMULATOR_HOST"] = "localhost:8686"
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="stora")
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        default=bool(os.environ.get("STORA_STARTUP_REPORT")),
+        help="log how long every startup phase took",
+    )
+    # a bundled app can be launched with arguments of its own, like -psn_...
+    args, _ = parser.parse_known_args(argv)
+    return args
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv or [])
+    startup.enabled = args.startup_report
+    startup.mark("imports")
+    setup_logging()
     app = QApplication([])
+    startup.mark("qt application")
     mw = MainWindow()
     apply_theme(app, patch=True)
+    startup.mark("main window")
     mw.show()
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,359 @@
+import bisect
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+# upper bounds of latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# names of request types in google.cloud.firestore_v1.types.firestore, which is
+# imported only once there is a client to instrument
+_REQUEST_TYPES = {
+    "run_query": "RunQueryRequest",
+    "batch_get_documents": "BatchGetDocumentsRequest",
+    "commit": "CommitRequest",
+    "list_collection_ids": "ListCollectionIdsRequest",
+    "list_documents": "ListDocumentsRequest",
+    "partition_query": "PartitionQueryRequest",
+    "run_aggregation_query": "RunAggregationQueryRequest",
+}
+_OPERATION_NAMES = {
+    "run_query": "stream",
+    "batch_get_documents": "get",
+    "list_collection_ids": "collections",
+    "list_documents": "list_documents",
+    "partition_query": "partitions",
+    "run_aggregation_query": "aggregate",
+}
+
+
+class OperationStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.docs_read = 0
+        self.docs_written = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency_total_ms = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "docs_read": self.docs_read,
+            "docs_written": self.docs_written,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency_avg_ms": self.latency_total_ms / self.calls if self.calls else 0,
+            "latency_histogram_ms": dict(
+                zip(
+                    [f"<={b}" for b in LATENCY_BUCKETS_MS] + ["inf"],
+                    self.latency_buckets,
+                )
+            ),
+        }
+
+
+class Metrics:
+    """Per operation and collection counters of Firestore RPCs"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], OperationStats] = defaultdict(OperationStats)
+
+    def record(
+        self,
+        operation: str,
+        collection: str,
+        latency_ms: float,
+        docs_read: int = 0,
+        docs_written: int = 0,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        error: bool = False,
+    ):
+        with self._lock:
+            stats = self._stats[(operation, collection)]
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.docs_read += docs_read
+            stats.docs_written += docs_written
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.latency_total_ms += latency_ms
+            stats.latency_buckets[
+                bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)
+            ] += 1
+
+        logger.bind(
+            event="firestore_rpc",
+            operation=operation,
+            collection=collection,
+            latency_ms=round(latency_ms, 3),
+            docs_read=docs_read,
+            docs_written=docs_written,
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+            error=error,
+        ).debug("Firestore {} on {!r} took {:.1f}ms", operation, collection, latency_ms)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def rows(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {"operation": op, "collection": col, **stats.to_dict()}
+                for (op, col), stats in sorted(self._stats.items())
+            ]
+
+    def totals(self) -> Dict[str, int]:
+        totals = defaultdict(int)
+        with self._lock:
+            for stats in self._stats.values():
+                totals["calls"] += stats.calls
+                totals["errors"] += stats.errors
+                totals["docs_read"] += stats.docs_read
+                totals["docs_written"] += stats.docs_written
+                totals["bytes"] += stats.bytes_sent + stats.bytes_received
+        return dict(totals)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"totals": self.totals(), "operations": self.rows()}, indent=2
+        )
+
+
+metrics = Metrics()
+
+
+def _collection_of(name: str) -> str:
+    """Collection path of a document or parent resource name"""
+    _, _, path = name.partition("/documents")
+    path = path.strip("/")
+    if not path:
+        return ""
+    return path.rsplit("/", 1)[0] if path.count("/") % 2 else path
+
+
+def _query_collection(parent: str, structured_query) -> str:
+    if not structured_query.from_:
+        return _collection_of(parent)
+    selector = structured_query.from_[0]
+    if selector.all_descendants:
+        return f"group:{selector.collection_id}"
+    _, _, parent_path = parent.partition("/documents")
+    parent_path = parent_path.strip("/")
+    if parent_path:
+        return f"{parent_path}/{selector.collection_id}"
+    return selector.collection_id
+
+
+def _size(message) -> int:
+    try:
+        return type(message).pb(message).ByteSize()
+    except Exception:
+        return 0
+
+
+def _write_kind(write) -> str:
+    pb = write._pb
+    operation = pb.WhichOneof("operation")
+    if operation == "delete":
+        return "delete"
+    if operation == "update":
+        if pb.HasField("current_document") and not pb.current_document.exists:
+            return "add"
+        return "update" if pb.HasField("update_mask") else "set"
+    return operation or "write"
+
+
+def _write_name(write) -> str:
+    pb = write._pb
+    operation = pb.WhichOneof("operation")
+    if operation == "delete":
+        return pb.delete
+    if operation == "update":
+        return pb.update.name
+    if operation == "transform":
+        return pb.transform.document
+    return ""
+
+
+class _InstrumentedStream:
+    """Wraps a streaming response, recording the call once it's consumed"""
+
+    def __init__(self, responses: Iterable, on_done, count_doc):
+        self._responses = responses
+        self._iterator = iter(responses)
+        self._on_done = on_done
+        self._count_doc = count_doc
+        self._docs = 0
+        self._bytes = 0
+        self._done = False
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        try:
+            response = next(self._iterator)
+        except StopIteration:
+            self._finish(error=False)
+            raise
+        except Exception:
+            self._finish(error=True)
+            raise
+        self._docs += self._count_doc(response)
+        self._bytes += _size(response)
+        return response
+
+    def _finish(self, error: bool):
+        if not self._done:
+            self._done = True
+            self._on_done(self._docs, self._bytes, error)
+
+    def __getattr__(self, name):
+        return getattr(self._responses, name)
+
+    def __del__(self):
+        self._finish(error=False)
+
+
+class InstrumentedFirestoreAPI:
+    """A proxy of the GAPIC Firestore client which records every RPC"""
+
+    def __init__(self, api, registry: Metrics):
+        self._api = api
+        self._metrics = registry
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+        if name == "commit":
+            return self._wrap_commit(attr)
+        if name in _OPERATION_NAMES:
+            return self._wrap_read(name, attr)
+        return attr
+
+    @staticmethod
+    def _request(name: str, kwargs: dict):
+        from google.cloud.firestore_v1.types import firestore as types
+
+        request = kwargs.get("request")
+        if isinstance(request, dict) and name in _REQUEST_TYPES:
+            request = getattr(types, _REQUEST_TYPES[name])(request)
+        return request
+
+    def _wrap_read(self, name: str, method):
+        operation = _OPERATION_NAMES[name]
+
+        def wrapper(*args, **kwargs):
+            request = self._request(name, kwargs)
+            collection = self._read_collection(name, request)
+            sent = _size(request) if request is not None else 0
+            started = time.perf_counter()
+
+            def on_done(docs: int, received: int, error: bool):
+                self._metrics.record(
+                    operation,
+                    collection,
+                    (time.perf_counter() - started) * 1000,
+                    docs_read=docs,
+                    bytes_sent=sent,
+                    bytes_received=received,
+                    error=error,
+                )
+
+            try:
+                response = method(*args, **kwargs)
+            except Exception:
+                on_done(0, 0, True)
+                raise
+            return _InstrumentedStream(response, on_done, self._doc_counter(name))
+
+        return wrapper
+
+    @staticmethod
+    def _read_collection(name: str, request) -> str:
+        from google.cloud.firestore_v1.types import firestore as types
+
+        if request is None:
+            return ""
+        if name in ("run_query", "partition_query"):
+            return _query_collection(request.parent, request.structured_query)
+        if name == "run_aggregation_query":
+            return _query_collection(
+                request.parent, request.structured_aggregation_query.structured_query
+            )
+        if name == "batch_get_documents":
+            return _collection_of(request.documents[0]) if request.documents else ""
+        if name == "list_documents":
+            return _query_collection(
+                request.parent,
+                types.StructuredQuery(from_=[{"collection_id": request.collection_id}]),
+            )
+        return _collection_of(request.parent)
+
+    @staticmethod
+    def _doc_counter(name: str):
+        if name == "run_query":
+            return lambda r: int(r._pb.HasField("document"))
+        if name == "batch_get_documents":
+            return lambda r: int(r._pb.HasField("found"))
+        if name == "list_documents":
+            return lambda r: 1
+        return lambda r: 0
+
+    def _wrap_commit(self, method):
+        def wrapper(*args, **kwargs):
+            request = self._request("commit", kwargs)
+            writes: Dict[Tuple[str, str], int] = defaultdict(int)
+            for write in request.writes if request is not None else []:
+                writes[(_write_kind(write), _collection_of(_write_name(write)))] += 1
+            sent = _size(request) if request is not None else 0
+            started = time.perf_counter()
+            error = False
+            try:
+                response = method(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                latency = (time.perf_counter() - started) * 1000
+                for (kind, collection), count in (
+                    writes or {("commit", ""): 0}
+                ).items():
+                    self._metrics.record(
+                        kind,
+                        collection,
+                        latency,
+                        docs_written=0 if error else count,
+                        bytes_sent=sent,
+                        error=error,
+                    )
+            return response
+
+        return wrapper
+
+
+def instrument_client(
+    client: "firestore.Client", registry: Optional[Metrics] = None
+) -> "firestore.Client":
+    api = client._firestore_api
+    if not isinstance(api, InstrumentedFirestoreAPI):
+        client._firestore_api_internal = InstrumentedFirestoreAPI(
+            api, registry or metrics
+        )
+    return client
@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+
+@dataclass
+class FieldChange:
+    old: Any
+    new: Any
+
+
+class PendingChanges:
+    """Edits which aren't sent to the server yet, by document path and field"""
+
+    def __init__(self):
+        self._documents: Dict[str, Dict[str, FieldChange]] = {}
+        # update time of a document when it was edited first, so a commit can
+        # tell whether someone else changed it in the meantime
+        self._update_times: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return sum(map(len, self._documents.values()))
+
+    def stage(self, path: str, key: str, old, new, update_time: str):
+        fields = self._documents.setdefault(path, {})
+        self._update_times.setdefault(path, update_time)
+        change = fields.get(key)
+        if change is None:
+            fields[key] = FieldChange(old, new)
+        else:
+            change.new = new
+        if fields[key].old == fields[key].new:
+            self.discard(path, key)
+
+    def fields(self, path: str) -> Dict[str, FieldChange]:
+        return self._documents.get(path, {})
+
+    def get(self, path: str, key: str) -> Optional[FieldChange]:
+        return self._documents.get(path, {}).get(key)
+
+    def update_time(self, path: str) -> str:
+        return self._update_times.get(path, "")
+
+    @property
+    def paths(self) -> Iterable[str]:
+        return self._documents.keys()
+
+    def __iter__(self) -> Iterator[Tuple[str, str, FieldChange]]:
+        for path, fields in self._documents.items():
+            for key, change in fields.items():
+                yield path, key, change
+
+    def discard(self, path: str, key: Optional[str] = None):
+        """Forget changes of a field, or of the whole document"""
+        fields = self._documents.get(path)
+        if fields is None:
+            return
+        if key is not None:
+            fields.pop(key, None)
+        if key is None or not fields:
+            del self._documents[path]
+            del self._update_times[path]
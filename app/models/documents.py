@@ -0,0 +1,501 @@
+import json
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from PySide6.QtCore import (
+    QAbstractProxyModel,
+    QAbstractTableModel,
+    QModelIndex,
+    Qt,
+    QTimer,
+)
+from PySide6.QtGui import QBrush, QColor
+
+from app.models.preview import cell_preview
+from app.models.row_index import Filter, RowIndex
+from app.models.schema import Schema
+from app.models.store import MISSING, DocumentStore
+from app.settings import conf
+
+ID_KEY = "id"
+# background of cells with changes which aren't committed yet
+DIRTY_BRUSH = QBrush(QColor(255, 193, 7, 90))
+# a removal splitting into more ranges of sorted rows resets the view instead
+_MAX_REMOVED_RUNS = 100
+
+
+def cell_pretty_repr(value) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, indent=2, default=str)
+    return str(value)
+
+
+class TableItem:
+    """A cell of the documents table, built on demand when a user works with it."""
+
+    def __init__(self, db_id: str, key: str, content):
+        self.db_id = db_id
+        self.key = key
+        self.content = content
+        self.type_ = type(content)
+
+    @cached_property
+    def repr(self):
+        return cell_preview(self.content, conf.cell_preview_length)
+
+    @cached_property
+    def pretty_repr(self):
+        return cell_pretty_repr(self.content)
+
+
+class DocumentsTableModel(QAbstractTableModel):
+    """Keeps loaded documents in a columnar store and renders cells only when asked."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._store = DocumentStore()
+        self._schema = Schema()
+        self._headers: List[str] = []
+        # (document id, key) -> preview of a map, array or long string
+        self._previews: Dict[Tuple[str, str], str] = OrderedDict()
+        # document id -> keys of fields with changes which aren't committed yet
+        self._dirty: Dict[str, Set[str]] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._store)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self._headers[index.column()]
+        db_id = self._store.ids[index.row()]
+        if role == Qt.BackgroundRole:
+            return DIRTY_BRUSH if key in self._dirty.get(db_id, ()) else None
+        if role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        if key == ID_KEY:
+            return db_id
+        value = self._store.get(index.row(), key)
+        if value is MISSING:
+            return None
+        if role == Qt.ToolTipRole:
+            return cell_preview(value, conf.tooltip_preview_length)
+        return self._preview(db_id, key, value)
+
+    def _preview(self, db_id: str, key: str, value) -> str:
+        if not isinstance(value, (dict, list, str)):
+            return str(value)
+        if isinstance(value, str) and len(value) <= conf.cell_preview_length:
+            return value
+        previews = self._previews
+        preview = previews.get((db_id, key))
+        if preview is None:
+            preview = cell_preview(value, conf.cell_preview_length)
+            previews[(db_id, key)] = preview
+            if len(previews) > conf.preview_cache_size:
+                previews.popitem(last=False)
+        else:
+            previews.move_to_end((db_id, key))
+        return preview
+
+    def _forget_previews(self, db_ids: Iterable[str]):
+        if not self._previews:
+            return
+        for db_id in db_ids:
+            for key in self._headers:
+                self._previews.pop((db_id, key), None)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.ToolTipRole:
+            key = self._headers[section]
+            return None if key == ID_KEY else self._schema.describe(key)
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section]
+        return str(section + 1)
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    @property
+    def headers(self) -> List[str]:
+        return self._headers
+
+    @property
+    def ids(self) -> List[str]:
+        return self._store.ids
+
+    @property
+    def store(self) -> DocumentStore:
+        return self._store
+
+    @property
+    def schema(self) -> Schema:
+        return self._schema
+
+    def clear(self):
+        self.beginResetModel()
+        self._store = DocumentStore()
+        self._schema = Schema()
+        self._headers = []
+        self._previews.clear()
+        self._dirty.clear()
+        self.endResetModel()
+
+    def append_documents(self, ids: List[str], docs: List[Dict[str, Any]]):
+        """Add a page of documents to the end, inserting columns for unseen keys"""
+        if not ids:
+            return
+        start = len(self._store)
+        self.beginInsertRows(QModelIndex(), start, start + len(ids) - 1)
+        new_keys = self._store.append(ids, docs)
+        self.endInsertRows()
+        was_settled = self._schema.is_settled
+        self._schema.observe(docs)
+        self._insert_headers(new_keys)
+        if not was_settled:
+            self._reorder_headers()
+
+    def upsert_documents(self, ids: List[str], docs: List[Dict[str, Any]]):
+        """Replace already shown documents and append the new ones"""
+        new_ids = []
+        new_docs = []
+        for db_id, doc in zip(ids, docs):
+            row = self.row_of(db_id)
+            if row is None:
+                new_ids.append(db_id)
+                new_docs.append(doc)
+                continue
+            self._forget_previews([db_id])
+            self._insert_headers(self._store.replace(row, doc))
+            self.dataChanged.emit(
+                self.index(row, 0), self.index(row, len(self._headers) - 1)
+            )
+        self.append_documents(new_ids, new_docs)
+
+    def _insert_headers(self, keys: Iterable[str]):
+        keys = set(keys)
+        keys.discard(ID_KEY)
+        if not self._headers and (keys or len(self._store)):
+            self.beginInsertColumns(QModelIndex(), 0, 0)
+            self._headers.append(ID_KEY)
+            self.endInsertColumns()
+        if not keys:
+            return
+        # new fields are rarer than those seen before, "id" is always the last
+        pos = len(self._headers) - 1
+        self.beginInsertColumns(QModelIndex(), pos, pos + len(keys) - 1)
+        self._headers[pos:pos] = self._schema.ordered(keys)
+        self.endInsertColumns()
+
+    def _reorder_headers(self):
+        """Order columns by how common their fields are, until the sample is full.
+
+        Columns are moved rather than reset, so the view keeps its state.
+        """
+        order = self._schema.ordered(self._headers[:-1])
+        for pos, key in enumerate(order):
+            current = self._headers.index(key, pos)
+            if current == pos:
+                continue
+            self.beginMoveColumns(QModelIndex(), current, current, QModelIndex(), pos)
+            self._headers.insert(pos, self._headers.pop(current))
+            self.endMoveColumns()
+
+    def row_of(self, db_id: str) -> Optional[int]:
+        return self._store.row_of(db_id)
+
+    def remove_documents(self, ids: Iterable[str]):
+        ids = set(ids)
+        self._forget_previews(ids)
+        rows = sorted(row for row in map(self.row_of, ids) if row is not None)
+        # remove contiguous ranges starting from the end, so row numbers stay valid
+        while rows:
+            last = first = rows.pop()
+            while rows and rows[-1] == first - 1:
+                first = rows.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._store.delete(first, last + 1)
+            self.endRemoveRows()
+
+    def document(self, row: int) -> Dict[str, Any]:
+        return self._store.document(row)
+
+    def structure(self) -> Dict[str, type]:
+        """Dominant types of fields, those missing from the sample come last"""
+        structure = self._schema.structure()
+        for key, type_ in self._store.structure().items():
+            structure.setdefault(key, type_)
+        structure.pop(ID_KEY, None)
+        return structure
+
+    def memory_usage(self) -> int:
+        return self._store.memory_usage()
+
+    def doc_id(self, row: int) -> str:
+        return self._store.ids[row]
+
+    def key(self, column: int) -> str:
+        return self._headers[column]
+
+    def item(self, index: QModelIndex) -> Optional[TableItem]:
+        if not index.isValid():
+            return None
+        db_id = self._store.ids[index.row()]
+        key = self._headers[index.column()]
+        if key == ID_KEY:
+            return TableItem(db_id=db_id, key=key, content=db_id)
+        value = self._store.get(index.row(), key)
+        if value is MISSING:
+            return None
+        return TableItem(db_id=db_id, key=key, content=value)
+
+    def set_value(self, index: QModelIndex, value):
+        self.set_field(index.row(), self._headers[index.column()], value)
+
+    def set_field(self, row: int, key: str, value):
+        """Change a single field of a shown document; MISSING removes it"""
+        if key == ID_KEY:
+            return
+        self._previews.pop((self._store.ids[row], key), None)
+        if value is MISSING:
+            self._store.unset(row, key)
+        elif self._store.set(row, key, value):
+            self._insert_headers([key])
+        column = self._headers.index(key)
+        self.dataChanged.emit(self.index(row, column), self.index(row, column))
+
+    def set_dirty(self, db_id: str, key: str, dirty: bool = True):
+        keys = self._dirty.setdefault(db_id, set())
+        if dirty:
+            keys.add(key)
+        else:
+            keys.discard(key)
+            if not keys:
+                del self._dirty[db_id]
+        self._emit_row_changed(db_id, [Qt.BackgroundRole])
+
+    def clear_dirty(self, db_ids: Iterable[str]):
+        """Unmark all edited fields of the documents"""
+        for db_id in db_ids:
+            if self._dirty.pop(db_id, None) is not None:
+                self._emit_row_changed(db_id, [Qt.BackgroundRole])
+
+    def _emit_row_changed(self, db_id: str, roles: List[int]):
+        row = self.row_of(db_id)
+        if row is not None and self._headers:
+            last = len(self._headers) - 1
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last), roles)
+
+    def selected_doc_ids(self, indexes: Iterable[QModelIndex]) -> List[str]:
+        rows = sorted({i.row() for i in indexes if i.isValid()})
+        return [self._store.ids[r] for r in rows]
+
+
+class DocumentsProxyModel(QAbstractProxyModel):
+    """Sorts and filters rows of a documents model without comparing cells.
+
+    Rows to show come from a RowIndex, which keeps typed sort keys and sorted
+    orders of columns, so sorting or filtering again only replaces the mapping
+    of rows. Rows loaded or changed meanwhile are sorted in a bit later, to do
+    it once for many pages.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.row_index = RowIndex(id_key=ID_KEY)
+        self.sort_key: Optional[str] = None
+        self.descending = False
+        self.filters: List[Filter] = []
+        # proxy row -> source row, None while rows are shown as they are
+        self._rows: Optional[np.ndarray] = None
+        # source row -> proxy row or -1, built when it's needed
+        self._proxy_rows: Optional[np.ndarray] = None
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(conf.resort_delay)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    @property
+    def is_active(self) -> bool:
+        return self.sort_key is not None or bool(self.filters)
+
+    def setSourceModel(self, model: DocumentsTableModel):
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_source_reset)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.columnsAboutToBeInserted.connect(
+            lambda _, first, last: self.beginInsertColumns(QModelIndex(), first, last)
+        )
+        model.columnsInserted.connect(self.endInsertColumns)
+        model.columnsAboutToBeMoved.connect(
+            lambda _, first, last, __, to: self.beginMoveColumns(
+                QModelIndex(), first, last, QModelIndex(), to
+            )
+        )
+        model.columnsMoved.connect(self.endMoveColumns)
+        model.dataChanged.connect(self._on_data_changed)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        if self._rows is None:
+            return self.sourceModel().rowCount()
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def index(self, row: int, column: int, parent=QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not 0 <= row < self.rowCount():
+            return QModelIndex()
+        if not 0 <= column < self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        return QModelIndex()
+
+    def mapToSource(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        row = index.row() if self._rows is None else int(self._rows[index.row()])
+        return self.sourceModel().index(row, index.column())
+
+    def mapFromSource(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        row = index.row()
+        if self._rows is not None:
+            row = int(self._proxy_row_map()[row])
+        return self.index(row, index.column()) if row >= 0 else QModelIndex()
+
+    def _proxy_row_map(self) -> np.ndarray:
+        if self._proxy_rows is None:
+            self._proxy_rows = np.full(self.sourceModel().rowCount(), -1, np.int64)
+            self._proxy_rows[self._rows] = np.arange(len(self._rows))
+        return self._proxy_rows
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Vertical:
+            return str(section + 1) if role == Qt.DisplayRole else None
+        return self.sourceModel().headerData(section, orientation, role)
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """Called by the view when a header is clicked; a negative column unsorts"""
+        model = self.sourceModel()
+        self.sort_key = model.key(column) if 0 <= column < len(model.headers) else None
+        self.descending = order == Qt.DescendingOrder
+        self.refresh()
+
+    def set_filters(self, filters: List[Filter]):
+        self.filters = filters
+        self.refresh()
+
+    def _compute_rows(self) -> Optional[np.ndarray]:
+        if not self.is_active:
+            return None
+        return self.row_index.rows(
+            self.sourceModel().store, self.sort_key, self.descending, self.filters
+        )
+
+    def _set_rows(self, rows: Optional[np.ndarray]):
+        self._rows = rows
+        self._proxy_rows = None
+
+    def refresh(self):
+        """Sort and filter rows again, keeping the selection if only the order changed"""
+        self._refresh_timer.stop()
+        rows = self._compute_rows()
+        if (rows is None) != (self._rows is None) or (
+            rows is not None and len(rows) != len(self._rows)
+        ):
+            self.beginResetModel()
+            self._set_rows(rows)
+            self.endResetModel()
+            return
+        if rows is None or np.array_equal(rows, self._rows):
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [self.mapToSource(index) for index in persistent]
+        self._set_rows(rows)
+        self.changePersistentIndexList(
+            persistent, list(map(self.mapFromSource, sources))
+        )
+        self.layoutChanged.emit()
+
+    def _on_source_reset(self):
+        self._set_rows(self._compute_rows())
+        self.endResetModel()
+
+    def _on_rows_inserted(self, _, first: int, last: int):
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+            self.endInsertRows()
+            return
+        # new rows are shown at the end until they're sorted in
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + last - first)
+        self._set_rows(np.concatenate([self._rows, np.arange(first, last + 1)]))
+        self.endInsertRows()
+        self._refresh_timer.start()
+
+    def _on_rows_about_to_be_removed(self, _, first: int, last: int):
+        if self._rows is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            return
+        # the order of the other rows stays, so they're only mapped again
+        # instead of being sorted and filtered from scratch
+        positions = np.flatnonzero((self._rows >= first) & (self._rows <= last))
+        runs = np.split(positions, np.flatnonzero(np.diff(positions) != 1) + 1)
+        if len(runs) > _MAX_REMOVED_RUNS:
+            self.beginResetModel()
+            self._set_rows(np.delete(self._rows, positions))
+            self.endResetModel()
+            return
+        for run in reversed(runs):
+            if not len(run):
+                continue
+            self.beginRemoveRows(QModelIndex(), int(run[0]), int(run[-1]))
+            self._set_rows(np.delete(self._rows, run))
+            self.endRemoveRows()
+
+    def _on_rows_removed(self, _, first: int, last: int):
+        if self._rows is None:
+            self.endRemoveRows()
+            return
+        rows = self._rows.copy()
+        rows[rows > last] -= last - first + 1
+        self._set_rows(rows)
+
+    def _on_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles):
+        if self._rows is None:
+            self.dataChanged.emit(
+                self.mapFromSource(top_left), self.mapFromSource(bottom_right), roles
+            )
+            return
+        rows = self._proxy_row_map()[top_left.row() : bottom_right.row() + 1]
+        rows = rows[rows >= 0]
+        if len(rows):
+            self.dataChanged.emit(
+                self.index(int(rows.min()), top_left.column()),
+                self.index(int(rows.max()), bottom_right.column()),
+                roles,
+            )
+        keys = self.sourceModel().headers[top_left.column() : bottom_right.column() + 1]
+        watched = {self.sort_key, *(key.split(".")[0] for key, _, _ in self.filters)}
+        if list(roles) != [Qt.BackgroundRole] and watched.intersection(keys):
+            # the value may belong somewhere else now
+            self._refresh_timer.start()
@@ -0,0 +1,56 @@
+import json
+from itertools import islice
+from typing import Any, Iterable
+
+ELLIPSIS = "…"
+
+
+def _plural(count: int, noun: str) -> str:
+    return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
+
+
+def _summary(value: Any, max_length: int) -> str:
+    """Short description of a nested value, without looking inside it"""
+    if isinstance(value, dict):
+        return f"{{{_plural(len(value), 'key')}}}" if value else "{}"
+    if isinstance(value, list):
+        return f"[{_plural(len(value), 'item')}]" if value else "[]"
+    if isinstance(value, str) and len(value) > max_length:
+        return json.dumps(value[:max_length], ensure_ascii=False) + ELLIPSIS
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def _join(parts: Iterable[str], prefix: str, max_length: int) -> str:
+    text = prefix
+    for i, part in enumerate(parts):
+        text += (", " if i else " ") + part
+        if len(text) >= max_length:
+            return text[: max_length - 1] + ELLIPSIS
+    return text
+
+
+def cell_preview(value: Any, max_length: int = 200) -> str:
+    """A one-line summary of a value not longer than ``max_length``.
+
+    Maps and arrays are shown as ``{12 keys} "a": 1, …`` and
+    ``[340 items] "a", "b", …``; only as many elements are rendered as fit.
+    """
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        # an element takes at least a few characters, no need to look further
+        items = islice(value.items(), max_length // 4 + 1)
+        parts = (
+            f"{json.dumps(k, ensure_ascii=False)}: {_summary(v, max_length)}"
+            for k, v in items
+        )
+        return _join(parts, _summary(value, max_length), max_length)
+    if isinstance(value, list):
+        if not value:
+            return "[]"
+        parts = (_summary(v, max_length) for v in islice(value, max_length // 3 + 1))
+        return _join(parts, _summary(value, max_length), max_length)
+    text = str(value)
+    if len(text) > max_length:
+        return text[: max_length - 1] + ELLIPSIS
+    return text
@@ -0,0 +1,345 @@
+import bisect
+import datetime
+import json
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import dateutil.parser
+import numpy as np
+from google.cloud.firestore_v1 import DocumentReference, GeoPoint
+
+from app.models.store import (
+    BOOL,
+    DATETIME,
+    FLOAT,
+    MISSING,
+    OBJECT,
+    Column,
+    DocumentStore,
+)
+
+# ranks of value types in the order Firestore sorts them
+NULL, BOOLEAN, NUMBER, TIMESTAMP, STRING, BYTES, REFERENCE, GEOPOINT, ARRAY, MAP = (
+    range(10)
+)
+# field path, operator and value, as parsed by app.query.parse_filters
+Filter = Tuple[str, str, Any]
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_KIND_RANKS = {BOOL: BOOLEAN, DATETIME: TIMESTAMP}
+
+
+def type_rank(value: Any) -> int:
+    if value is None:
+        return NULL
+    if isinstance(value, bool):
+        return BOOLEAN
+    if isinstance(value, (int, float)):
+        return NUMBER
+    if isinstance(value, datetime.datetime):
+        return TIMESTAMP
+    if isinstance(value, str):
+        return STRING
+    if isinstance(value, bytes):
+        return BYTES
+    if isinstance(value, DocumentReference):
+        return REFERENCE
+    if isinstance(value, GeoPoint):
+        return GEOPOINT
+    if isinstance(value, list):
+        return ARRAY
+    return MAP
+
+
+def timestamp_key(value: datetime.datetime) -> int:
+    """Nanoseconds since the epoch, naive timestamps are taken as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    delta = value - _EPOCH
+    nanosecond = getattr(value, "nanosecond", value.microsecond * 1000)
+    return (delta.days * 86400 + delta.seconds) * 10**9 + nanosecond
+
+
+def sort_key(value: Any) -> Tuple[int, Any]:
+    """A key comparable with keys of values of any type, like Firestore orders them"""
+    rank = type_rank(value)
+    if rank == NULL:
+        return rank, 0
+    if rank == NUMBER:
+        # NaN goes first, as in Firestore
+        return rank, -math.inf if value != value else value
+    if rank == TIMESTAMP:
+        return rank, timestamp_key(value)
+    if rank == REFERENCE:
+        return rank, value.path
+    if rank == GEOPOINT:
+        return rank, (value.latitude, value.longitude)
+    if rank in (ARRAY, MAP):
+        return rank, json.dumps(value, sort_keys=True, default=str)
+    return rank, value
+
+
+def present_mask(column: Column, size: int) -> np.ndarray:
+    """Which of the first ``size`` rows have a value in the column"""
+    bits = np.frombuffer(bytes(column.present), np.uint8)
+    return np.unpackbits(bits, bitorder="little")[:size].astype(bool)
+
+
+def typed_values(column: Column, size: int) -> np.ndarray:
+    """A copy of values of a column which isn't kept as objects.
+
+    Timestamps are nanoseconds and booleans are 0 or 1. The store has to be
+    able to resize its arrays, so they're copied.
+    """
+    dtype = np.float64 if column.kind == FLOAT else np.int64
+    return np.array(column.values[:size], dtype=dtype)
+
+
+def _nested(value: Any, keys: Sequence[str]) -> Any:
+    for key in keys:
+        if not isinstance(value, dict) or key not in value:
+            return MISSING
+        value = value[key]
+    return value
+
+
+class ColumnKeys:
+    """Sort keys of one field in every row, as NumPy arrays.
+
+    Numbers, booleans and timestamps of a column of one type are the keys
+    themselves. Any other column is ranked once: values of every type are
+    sorted on their own, equal ones get the same integer key and ``distinct``
+    maps values of filters into those keys.
+    """
+
+    def __init__(self, present: np.ndarray, keys: np.ndarray, rank: Optional[int]):
+        self.present = present
+        self.keys = keys
+        # the type of every value, None if the column is ranked
+        self.rank = rank
+        # type -> key of its first value and its sorted distinct values
+        self.distinct: Dict[int, Tuple[int, List[Any]]] = {}
+        self._orders: Dict[bool, np.ndarray] = {}
+
+    @classmethod
+    def from_values(
+        cls, values: Sequence[Any], present: Optional[np.ndarray] = None
+    ) -> "ColumnKeys":
+        """Rank values, those of rows which aren't ``present`` are ignored"""
+        size = len(values)
+        if present is None:
+            present = np.fromiter((v is not MISSING for v in values), bool, size)
+        column = cls(present, np.zeros(size, np.int64), None)
+        rows = np.flatnonzero(present).tolist()
+        values = [values[row] for row in rows]
+
+        by_rank: Dict[int, Tuple[List[int], List[Any]]] = {}
+        if set(map(type, values)) == {str}:
+            # the most common case, strings are their own keys
+            by_rank[STRING] = (rows, values)
+        else:
+            for row, value in zip(rows, values):
+                rank, key = sort_key(value)
+                rank_rows, keys = by_rank.setdefault(rank, ([], []))
+                rank_rows.append(row)
+                keys.append(key)
+
+        offset = 0
+        for rank in sorted(by_rank):
+            rank_rows, keys = by_rank[rank]
+            distinct = sorted(set(keys))
+            positions = {key: i for i, key in enumerate(distinct)}
+            column.keys[rank_rows] = offset + np.fromiter(
+                map(positions.__getitem__, keys), np.int64, len(keys)
+            )
+            column.distinct[rank] = (offset, distinct)
+            offset += len(distinct)
+        return column
+
+    def order(self, descending: bool = False) -> np.ndarray:
+        """Rows sorted by the key, equal ones and missing ones in the row order"""
+        order = self._orders.get(descending)
+        if order is None:
+            rows = np.flatnonzero(self.present)
+            keys = self.keys[rows]
+            if descending:
+                # ~ turns integers around without overflowing
+                keys = -keys if keys.dtype.kind == "f" else ~keys
+            order = np.concatenate(
+                [rows[np.argsort(keys, kind="stable")], np.flatnonzero(~self.present)]
+            )
+            self._orders[descending] = order
+        return order
+
+    def mask(self, op: str, value: Any) -> np.ndarray:
+        """Rows matching a condition, with the semantics of a Firestore query"""
+        if op in ("in", "not-in"):
+            values = value if isinstance(value, list) else [value]
+            mask = np.zeros_like(self.present)
+            for v in values:
+                mask |= self._compare("==", v)
+            if op == "not-in":
+                mask = self.present & ~mask & ~self._compare("==", None)
+            return mask
+        if op == "!=":
+            # like in Firestore, missing and null values don't match
+            return self.present & ~self._compare("==", value) & ~self._is_null()
+        return self._compare(op, value)
+
+    def _is_null(self) -> np.ndarray:
+        if self.rank is not None:
+            return np.zeros_like(self.present)
+        return self._compare("==", None)
+
+    def _compare(self, op: str, value: Any) -> np.ndarray:
+        rank, key = sort_key(self._coerce(value))
+        if self.rank is not None:
+            if rank != self.rank:
+                return np.zeros_like(self.present)
+            keys = self.keys
+            if op == "==":
+                return self.present & (keys == key)
+            if op == "<":
+                return self.present & (keys < key)
+            if op == "<=":
+                return self.present & (keys <= key)
+            if op == ">":
+                return self.present & (keys > key)
+            if op == ">=":
+                return self.present & (keys >= key)
+            raise ValueError(f"Unsupported operator: {op}")
+
+        if rank not in self.distinct:
+            return np.zeros_like(self.present)
+        # keys of the value and of its type; a range condition only matches
+        # values of the same type
+        first, distinct = self.distinct[rank]
+        low = first + bisect.bisect_left(distinct, key)
+        high = first + bisect.bisect_right(distinct, key)
+        end = first + len(distinct)
+        bounds = {
+            "==": (low, high),
+            "<": (first, low),
+            "<=": (first, high),
+            ">": (high, end),
+            ">=": (low, end),
+        }
+        if op not in bounds:
+            raise ValueError(f"Unsupported operator: {op}")
+        start, stop = bounds[op]
+        if start >= stop:
+            return np.zeros_like(self.present)
+        return self.present & (self.keys >= start) & (self.keys < stop)
+
+    def _coerce(self, value: Any) -> Any:
+        """Filters are typed as JSON, so timestamps are given as strings"""
+        if not isinstance(value, str):
+            return value
+        if self.rank is None:
+            if TIMESTAMP not in self.distinct or STRING in self.distinct:
+                return value
+        elif self.rank != TIMESTAMP:
+            return value
+        try:
+            return dateutil.parser.isoparse(value)
+        except ValueError:
+            return value
+
+
+def _array_mask(values: Sequence[Any], op: str, value: Any) -> np.ndarray:
+    # arrays can't be turned into sort keys, so they're checked one by one
+    wanted = value if op == "array-contains-any" else [value]
+    if not isinstance(wanted, list):
+        wanted = [wanted]
+    return np.fromiter(
+        (isinstance(v, list) and any(w in v for w in wanted) for v in values),
+        bool,
+        len(values),
+    )
+
+
+class RowIndex:
+    """Sort orders and filters of rows of a document store.
+
+    Keys of a column are computed once and reused until the store changes,
+    together with the sorted orders of rows, so sorting again or changing a
+    filter only combines NumPy arrays.
+    """
+
+    def __init__(self, id_key: Optional[str] = None):
+        # a key standing for document ids instead of a field
+        self.id_key = id_key
+        self._store: Optional[DocumentStore] = None
+        self._version = -1
+        self._columns: Dict[str, ColumnKeys] = {}
+
+    def _sync(self, store: DocumentStore):
+        if store is not self._store or store.version != self._version:
+            self._store = store
+            self._version = store.version
+            self._columns.clear()
+
+    def column(self, store: DocumentStore, key: str) -> ColumnKeys:
+        """Sort keys of a field; a dotted path reads a field of a map"""
+        self._sync(store)
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = self._build(store, key)
+        return column
+
+    def _build(self, store: DocumentStore, key: str) -> ColumnKeys:
+        if key == self.id_key:
+            return ColumnKeys.from_values(store.ids)
+        stored = store.columns.get(key)
+        if stored is None:
+            return ColumnKeys.from_values(self._values(store, key))
+        size = len(store)
+        present = present_mask(stored, size)
+        if stored.kind == OBJECT:
+            return ColumnKeys.from_values(stored.values, present)
+        keys = typed_values(stored, size)
+        return ColumnKeys(present, keys, _KIND_RANKS.get(stored.kind, NUMBER))
+
+    @staticmethod
+    def _values(store: DocumentStore, key: str) -> List[Any]:
+        values = [MISSING] * len(store)
+        if key in store.columns:
+            for row, value in store.iter_column(key):
+                values[row] = value
+            return values
+        top, *path = key.split(".")
+        for row, value in store.iter_column(top):
+            values[row] = _nested(value, path)
+        return values
+
+    def order(
+        self, store: DocumentStore, key: str, descending: bool = False
+    ) -> np.ndarray:
+        return self.column(store, key).order(descending)
+
+    def mask(self, store: DocumentStore, filters: List[Filter]) -> np.ndarray:
+        """Rows matching every filter"""
+        mask = np.ones(len(store), bool)
+        for key, op, value in filters:
+            if op in ("array-contains", "array-contains-any"):
+                values = self._values(store, key)
+                mask &= _array_mask(values, op, value)
+            else:
+                mask &= self.column(store, key).mask(op, value)
+        return mask
+
+    def rows(
+        self,
+        store: DocumentStore,
+        key: Optional[str] = None,
+        descending: bool = False,
+        filters: Optional[List[Filter]] = None,
+    ) -> np.ndarray:
+        """Rows to show, sorted by a field and matching the filters"""
+        if key is None:
+            order = np.arange(len(store))
+        else:
+            order = self.order(store, key, descending)
+        if filters:
+            order = order[self.mask(store, filters)[order]]
+        return order
@@ -0,0 +1,106 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Type
+
+from app.db import TYPE_TO_DROPDOWN_INDEX
+from app.settings import conf
+
+
+class FieldStats:
+    """How often a field is present in sampled documents, and with which types"""
+
+    __slots__ = ("count", "types")
+
+    def __init__(self):
+        self.count = 0
+        self.types: Counter = Counter()
+
+    def dominant_type(self) -> Optional[Type]:
+        """The most common type among those a new value can be entered as.
+
+        Types sharing an input (e.g. int and float) are counted together and
+        nulls only count if there's nothing else.
+        """
+        groups: Counter = Counter()
+        for type_, count in self.types.items():
+            if type_ is not type(None):
+                groups[TYPE_TO_DROPDOWN_INDEX.get(type_, type_)] += count
+        if not groups:
+            return type(None) if self.types else None
+        group, _ = groups.most_common(1)[0]
+        return max(
+            (t for t in self.types if TYPE_TO_DROPDOWN_INDEX.get(t, t) == group),
+            key=self.types.__getitem__,
+        )
+
+
+class Schema:
+    """Fields of a collection inferred from a sample of its documents.
+
+    The first ``sample_size`` documents are all looked at, later ones less and
+    less often, so the statistics are updated cheaply as pages stream in.
+    """
+
+    def __init__(self, sample_size: Optional[int] = None):
+        self.sample_size = max(1, sample_size or conf.schema_sample_size)
+        self.fields: Dict[str, FieldStats] = {}
+        # documents passed to observe(), and those of them looked at
+        self.seen = 0
+        self.sampled = 0
+
+    @property
+    def is_settled(self) -> bool:
+        """Whether the initial sample is complete"""
+        return self.sampled >= self.sample_size
+
+    def observe(self, docs: Iterable[Dict[str, Any]]) -> Set[str]:
+        """Add documents to the sample, returns fields seen the first time"""
+        new_fields = set()
+        fields = self.fields
+        for doc in docs:
+            self.seen += 1
+            # the stride grows with the amount of documents, so about
+            # sample_size * ln(seen / sample_size) of them are looked at
+            if self.is_settled and self.seen % (self.seen // self.sample_size):
+                continue
+            self.sampled += 1
+            for key, value in doc.items():
+                stats = fields.get(key)
+                if stats is None:
+                    stats = fields[key] = FieldStats()
+                    new_fields.add(key)
+                stats.count += 1
+                stats.types[type(value)] += 1
+        return new_fields
+
+    def presence(self, key: str) -> float:
+        """Share of sampled documents having the field"""
+        stats = self.fields.get(key)
+        return stats.count / self.sampled if stats and self.sampled else 0.0
+
+    def describe(self, key: str) -> str:
+        """Presence and types of a field, e.g. for a tooltip"""
+        stats = self.fields.get(key)
+        if stats is None:
+            return "Not in sampled documents"
+        types = ", ".join(
+            f"{type_.__name__} {count / stats.count:.0%}"
+            for type_, count in stats.types.most_common()
+        )
+        return (
+            f"In {self.presence(key):.0%} of {self.sampled} sampled documents\n"
+            f"{types}"
+        )
+
+    def ordered(self, keys: Iterable[str]) -> List[str]:
+        """Keys of the most common fields first, unknown ones last, by name"""
+        fields = self.fields
+        return sorted(keys, key=lambda k: (-fields[k].count if k in fields else 0, k))
+
+    def structure(self) -> Dict[str, Type]:
+        """The dominant type of every field"""
+        structure = {}
+        for key in self.ordered(self.fields):
+            type_ = self.fields[key].dominant_type()
+            if type_ is not None:
+                structure[key] = type_
+        return structure
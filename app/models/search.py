@@ -0,0 +1,230 @@
+import bisect
+import re
+import sys
+import threading
+from itertools import count
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from google.cloud.firestore_v1 import DocumentReference, DocumentSnapshot, GeoPoint
+
+_WORD = re.compile(r"\w+")
+_TRUE = ("true",)
+_FALSE = ("false",)
+# dotted field path -> words of its values
+Terms = Dict[str, Set[str]]
+# collection path and document id
+DocumentKey = Tuple[str, str]
+
+
+class Match(NamedTuple):
+    collection: str
+    doc_id: str
+    # elements of an array are found in the path of the array
+    path: str
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def document_terms(doc: Dict[str, Any]) -> Terms:
+    """Words of every field of a document, including fields of nested maps"""
+    terms: Terms = {}
+    stack = list(doc.items())
+    while stack:
+        path, value = stack.pop()
+        type_ = type(value)
+        # the most common types are checked first and without the regex
+        if type_ is int:
+            words = (str(abs(value)),)
+        elif type_ is bool:
+            words = _TRUE if value else _FALSE
+        elif type_ is str:
+            words = _WORD.findall(value.lower())
+        elif isinstance(value, dict):
+            stack.extend((f"{path}.{key}", v) for key, v in value.items())
+            continue
+        elif isinstance(value, list):
+            stack.extend((path, v) for v in value)
+            continue
+        elif value is None or isinstance(value, (bytes, GeoPoint)):
+            continue
+        else:
+            text = value.path if isinstance(value, DocumentReference) else str(value)
+            words = tokenize(text)
+        if words:
+            found = terms.get(path)
+            if found is None:
+                found = terms[sys.intern(path)] = set()
+            # words repeat across documents, so they're shared
+            found.update(map(sys.intern, words))
+    return terms
+
+
+def iter_terms(
+    chunks: Iterable[Tuple[str, List[DocumentSnapshot]]],
+) -> Iterator[Tuple[str, List[str], List[Terms]]]:
+    """Words of scanned documents, to be added to an index by the GUI thread"""
+    for collection, docs in chunks:
+        terms = [document_terms(doc.to_dict() or {}) for doc in docs]
+        yield collection, [doc.id for doc in docs], terms
+
+
+class SearchIndex:
+    """Words of loaded documents of a database, pointing to documents having them.
+
+    Every document also keeps the words of each of its fields, so it's indexed
+    again or removed without touching other documents, and a match can tell the
+    field it was found in. Words of a search are matched as prefixes.
+
+    Documents can be indexed in a background thread while the index is searched.
+    """
+
+    def __init__(self):
+        # word -> numbers of documents having it
+        self._postings: Dict[str, Set[int]] = {}
+        self._terms: Dict[int, Terms] = {}
+        self._keys: Dict[int, DocumentKey] = {}
+        self._numbers: Dict[DocumentKey, int] = {}
+        self._next_number = count()
+        # sorted words for prefix lookups, None after new words were added
+        self._vocabulary: Optional[List[str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(
+        self,
+        collection: str,
+        ids: List[str],
+        docs: Iterable[Dict[str, Any]],
+        partial: bool = False,
+    ):
+        """Index documents, replacing what was indexed of them before.
+
+        Partial documents (e.g. of a query selecting fields) only replace
+        fields they have.
+        """
+        terms = [document_terms(doc) for doc in docs]
+        self.add_terms(collection, ids, terms, partial)
+
+    def add_terms(
+        self,
+        collection: str,
+        ids: List[str],
+        terms: Iterable[Terms],
+        partial: bool = False,
+    ):
+        with self._lock:
+            for doc_id, fields in zip(ids, terms):
+                self._add(collection, doc_id, fields, partial)
+
+    def _add(self, collection: str, doc_id: str, fields: Terms, partial: bool):
+        key = (collection, doc_id)
+        number = self._numbers.get(key)
+        if number is None:
+            number = self._numbers[key] = next(self._next_number)
+            self._keys[number] = key
+            old: Terms = {}
+        else:
+            old = self._terms[number]
+        if partial:
+            tops = {path.split(".", 1)[0] for path in fields}
+            kept = {p: w for p, w in old.items() if p.split(".", 1)[0] not in tops}
+            fields = {**kept, **fields}
+        self._terms[number] = fields
+
+        old_words = set().union(*old.values())
+        new_words = set().union(*fields.values())
+        for word in old_words - new_words:
+            self._discard(word, number)
+        for word in new_words - old_words:
+            numbers = self._postings.get(word)
+            if numbers is None:
+                numbers = self._postings[word] = set()
+                self._vocabulary = None
+            numbers.add(number)
+
+    def remove(self, collection: str, ids: Iterable[str]):
+        with self._lock:
+            for doc_id in ids:
+                number = self._numbers.pop((collection, doc_id), None)
+                if number is None:
+                    continue
+                del self._keys[number]
+                for word in set().union(*self._terms.pop(number).values()):
+                    self._discard(word, number)
+
+    def _discard(self, word: str, number: int):
+        numbers = self._postings[word]
+        numbers.discard(number)
+        if not numbers:
+            # the sorted vocabulary may keep it, it just finds nothing
+            del self._postings[word]
+
+    def _with_prefix(self, prefix: str) -> Set[int]:
+        """Numbers of documents having a word starting with the prefix"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        found: Set[int] = set()
+        i = bisect.bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            found.update(self._postings.get(vocabulary[i], ()))
+            i += 1
+        return found
+
+    def search(self, text: str, limit: int) -> Tuple[List[Match], int]:
+        """Fields with words of the text, of documents having all of them.
+
+        Also returns the amount of such documents. Documents come in the order
+        they were indexed first.
+        """
+        prefixes = set(tokenize(text))
+        if not prefixes:
+            return [], 0
+        with self._lock:
+            numbers = self._find(prefixes)
+        # fields are matched without holding up indexing: terms of a document are
+        # replaced rather than changed, and numbers of removed ones aren't reused
+        return self._matches(numbers, prefixes, limit), len(numbers)
+
+    def _find(self, prefixes: Set[str]) -> Set[int]:
+        """Numbers of documents having words with all of the prefixes"""
+        numbers: Optional[Set[int]] = None
+        # longer words tend to be rarer, so the set shrinks quickly
+        for prefix in sorted(prefixes, key=len, reverse=True):
+            found = self._with_prefix(prefix)
+            numbers = found if numbers is None else numbers & found
+            if not numbers:
+                return set()
+        return numbers
+
+    def _matches(
+        self, numbers: Set[int], prefixes: Set[str], limit: int
+    ) -> List[Match]:
+        matches = []
+        for number in sorted(numbers):
+            key = self._keys.get(number)
+            fields = self._terms.get(number)
+            if key is None or fields is None:
+                # removed since it was found
+                continue
+            collection, doc_id = key
+            for path, words in fields.items():
+                if any(w.startswith(p) for w in words for p in prefixes):
+                    matches.append(Match(collection, doc_id, path))
+            if len(matches) >= limit:
+                break
+        return matches[:limit]
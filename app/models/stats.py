@@ -0,0 +1,361 @@
+import datetime
+import heapq
+import math
+from collections import Counter
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from google.cloud.firestore_v1 import DocumentSnapshot, GeoPoint
+
+from app.models.preview import cell_preview
+from app.models.row_index import present_mask, timestamp_key, typed_values
+from app.models.store import BOOL, DATETIME, FLOAT, INT, OBJECT, DocumentStore
+from app.models.value_tree import type_name
+from app.settings import conf
+
+STATS_COLUMNS = (
+    "field",
+    "types",
+    "missing",
+    "null",
+    "distinct",
+    "min",
+    "max",
+    "mean",
+    "p50",
+    "p90",
+    "p99",
+    "most common",
+)
+PERCENTILES = (50, 90, 99)
+# a column of the store copied for summarizing: its kind, values and the mask
+# of rows having a value
+ColumnCopy = Tuple[str, Union[np.ndarray, List[Any]], np.ndarray]
+
+_KIND_TYPE_NAMES = {
+    BOOL: "boolean",
+    INT: "integer",
+    FLOAT: "float",
+    DATETIME: "timestamp",
+}
+_UINT64_MASK = (1 << 64) - 1
+
+
+def _mix(hashes: np.ndarray) -> np.ndarray:
+    """Scramble 64-bit hashes (splitmix64), hashes of ints are the ints themselves"""
+    with np.errstate(over="ignore"):
+        h = hashes.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return h ^ (h >> np.uint64(31))
+
+
+def _hash(value: Any) -> int:
+    if isinstance(value, (dict, list)):
+        # much cheaper than a canonical form, maps which only differ in the
+        # order of keys count as different values
+        value = repr(value)
+    elif isinstance(value, GeoPoint):
+        value = (value.latitude, value.longitude)
+    try:
+        return hash(value) & _UINT64_MASK
+    except TypeError:
+        return hash(str(value)) & _UINT64_MASK
+
+
+def hash_values(values: Iterable[Any], count: int) -> np.ndarray:
+    return np.fromiter(map(_hash, values), np.uint64, count)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    # halves are exact as floats, and frexp gives their bit lengths
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """Estimates the amount of distinct values in 2 ** precision bytes.
+
+    Every hash picks a register by its first bits and the register keeps the
+    longest run of leading zeros among the remaining bits seen so far.
+    """
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, np.uint8)
+
+    def add(self, hashes: np.ndarray):
+        if not len(hashes):
+            return
+        hashes = _mix(hashes)
+        p = self.precision
+        registers = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes << np.uint64(p)
+        zeros = np.minimum(64 - _bit_length(rest), 64 - p)
+        np.maximum.at(self.registers, registers, (zeros + 1).astype(np.uint8))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.exp2(-self.registers.astype(float))))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and empty:
+            # few values, counting empty registers is more precise
+            return round(m * math.log(m / empty))
+        return round(raw)
+
+
+class Reservoir:
+    """A uniform random sample of a stream of numbers, to estimate percentiles"""
+
+    def __init__(self, size: int, dtype, seed: int = 0):
+        self.values = np.empty(size, dtype)
+        self.seen = 0
+        self._random = np.random.default_rng(seed)
+
+    def add(self, values: np.ndarray):
+        size = len(self.values)
+        free = max(0, min(size - self.seen, len(values)))
+        self.values[self.seen : self.seen + free] = values[:free]
+        rest = values[free:]
+        if len(rest):
+            # the n-th value of the stream replaces a random one with
+            # probability size / n
+            ends = self.seen + free + np.arange(1, len(rest) + 1)
+            positions = self._random.integers(0, ends)
+            kept = positions < size
+            self.values[positions[kept]] = rest[kept]
+        self.seen += len(values)
+
+    def percentiles(self, q: List[float]) -> np.ndarray:
+        """Values of the sample below which are q percent of it"""
+        sample = np.sort(self.values[: min(self.seen, len(self.values))])
+        positions = (np.asarray(q) / 100 * len(sample)).astype(np.intp)
+        return sample[np.minimum(positions, len(sample) - 1)]
+
+
+class NumericSummary:
+    """Count, range, mean and a sample of numbers or timestamps (nanoseconds)"""
+
+    def __init__(self, dtype):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.sample = Reservoir(conf.stats_sample_size, dtype)
+
+    def add(self, values: np.ndarray):
+        if values.dtype.kind == "f":
+            values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total += float(values.sum(dtype=np.float64))
+        low, high = values.min(), values.max()
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        self.sample.add(values)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class FrequentValues:
+    """The most common values of a stream, counted in bounded memory.
+
+    Counts are exact while there are at most ``capacity`` distinct values.
+    Beyond that, whenever there are more, all counts are lowered by the one
+    right after the capacity (Misra-Gries), so they're lower bounds.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Counter = Counter()
+        self.exact = True
+
+    def add(self, values: Iterable[Any]):
+        counts = self.counts
+        counts.update(values)
+        if len(counts) <= self.capacity:
+            return
+        self.exact = False
+        threshold = heapq.nlargest(self.capacity + 1, counts.values())[-1]
+        for value, count in list(counts.items()):
+            if count <= threshold:
+                del counts[value]
+            else:
+                counts[value] = count - threshold
+
+    def most_common(self, n: int) -> List[Tuple[Any, int]]:
+        return self.counts.most_common(n)
+
+
+class FieldSummary:
+    """Statistics of the values of one field, updated a batch at a time"""
+
+    def __init__(self):
+        self.present = 0
+        self.types: Counter = Counter()
+        self.distinct = HyperLogLog()
+        self.numbers = NumericSummary(np.float64)
+        self.timestamps = NumericSummary(np.int64)
+        self.strings = FrequentValues(conf.stats_top_capacity)
+
+    @property
+    def nulls(self) -> int:
+        return self.types["null"]
+
+    def add(self, values: List[Any]):
+        """Values of documents which have the field, of any types"""
+        self.present += len(values)
+        by_type = Counter(map(type, values))
+        self.types.update(
+            {type_name(_example(values, t)): n for t, n in by_type.items()}
+        )
+        self.distinct.add(hash_values(values, len(values)))
+        numbers = [v for v in values if type(v) in (int, float)]
+        if numbers:
+            self.numbers.add(np.array(numbers, np.float64))
+        timestamps = [
+            timestamp_key(v) for v in values if isinstance(v, datetime.datetime)
+        ]
+        if timestamps:
+            self.timestamps.add(np.array(timestamps, np.int64))
+        if str in by_type:
+            self.strings.add(v for v in values if type(v) is str)
+
+    def add_array(self, kind: str, values: np.ndarray):
+        """Values of a typed column of the store, see typed_values()"""
+        self.present += len(values)
+        self.types[_KIND_TYPE_NAMES[kind]] += len(values)
+        if kind == BOOL:
+            self.distinct.add(hash_values(values.astype(bool).tolist(), len(values)))
+            return
+        if kind == DATETIME:
+            self.distinct.add(values.view(np.uint64))
+            self.timestamps.add(values)
+            return
+        numbers = values.astype(np.float64)
+        # integers and floats of the same value are the same number
+        self.distinct.add(numbers.view(np.uint64))
+        self.numbers.add(numbers)
+
+
+def _example(values: List[Any], type_: type) -> Any:
+    return next(v for v in values if type(v) is type_)
+
+
+class CollectionSummary:
+    """Statistics of every field of a stream of documents"""
+
+    def __init__(self):
+        self.documents = 0
+        self.fields: Dict[str, FieldSummary] = {}
+
+    def field(self, key: str) -> FieldSummary:
+        summary = self.fields.get(key)
+        if summary is None:
+            summary = self.fields[key] = FieldSummary()
+        return summary
+
+    def missing(self, key: str) -> int:
+        return self.documents - self.field(key).present
+
+    def add_documents(self, docs: List[Dict[str, Any]]):
+        self.documents += len(docs)
+        columns: Dict[str, List[Any]] = {}
+        for doc in docs:
+            for key, value in doc.items():
+                values = columns.get(key)
+                if values is None:
+                    values = columns[key] = []
+                values.append(value)
+        for key, values in columns.items():
+            self.field(key).add(values)
+
+
+def summarize_documents(
+    chunks: Iterable[List[DocumentSnapshot]],
+) -> Generator[int, None, CollectionSummary]:
+    """Summarize documents as they're read, yields the amount of them so far"""
+    summary = CollectionSummary()
+    for chunk in chunks:
+        summary.add_documents([doc.to_dict() or {} for doc in chunk])
+        yield summary.documents
+    return summary
+
+
+def copy_columns(store: DocumentStore) -> Tuple[int, Dict[str, ColumnCopy]]:
+    """Columns of the store, to be summarized while the store keeps changing"""
+    size = len(store)
+    columns = {}
+    for key, column in store.columns.items():
+        if column.kind == OBJECT:
+            values = column.values[:size]
+        else:
+            values = typed_values(column, size)
+        columns[key] = (column.kind, values, present_mask(column, size))
+    return size, columns
+
+
+def summarize_columns(
+    size: int, columns: Dict[str, ColumnCopy], batch_size: int
+) -> Generator[int, None, CollectionSummary]:
+    """Summarize copied columns a batch of rows at a time, yields rows done"""
+    summary = CollectionSummary()
+    for start in range(0, size, batch_size):
+        end = min(start + batch_size, size)
+        summary.documents = end
+        for key, (kind, values, present) in columns.items():
+            rows = np.flatnonzero(present[start:end]) + start
+            if not len(rows):
+                continue
+            if kind == OBJECT:
+                summary.field(key).add([values[row] for row in rows.tolist()])
+            else:
+                summary.field(key).add_array(kind, values[rows])
+        yield end
+    return summary
+
+
+def _format_number(value) -> str:
+    return f"{value:.6g}"
+
+
+def _format_timestamp(value) -> str:
+    # shown to milliseconds, means aren't whole nanoseconds anyway
+    milliseconds = int(value) // 10**6
+    return np.datetime_as_string(np.datetime64(milliseconds, "ms"), unit="auto")
+
+
+def stats_row(summary: CollectionSummary, key: str, top: int = 5) -> List[str]:
+    """Texts of a field in the order of STATS_COLUMNS"""
+    field = summary.fields[key]
+    types = ", ".join(
+        f"{name} {count / field.present:.0%}"
+        for name, count in field.types.most_common()
+    )
+    # estimates of small amounts may be a bit off, but not above the total
+    distinct = f"~{min(field.distinct.estimate(), field.present)}"
+    row = [key, types, str(summary.missing(key)), str(field.nulls), distinct]
+
+    numeric, format_ = field.numbers, _format_number
+    if not numeric.count and field.timestamps.count:
+        numeric, format_ = field.timestamps, _format_timestamp
+    if numeric.count:
+        row += map(format_, (numeric.minimum, numeric.maximum, numeric.mean))
+        row += map(format_, numeric.sample.percentiles(list(PERCENTILES)))
+    else:
+        row += [""] * (3 + len(PERCENTILES))
+
+    # counts are lower bounds once there were too many distinct strings
+    at_least = "" if field.strings.exact else "≥"
+    row.append(
+        ", ".join(
+            f"{cell_preview(value, 40)} ({at_least}{count})"
+            for value, count in field.strings.most_common(top)
+        )
+    )
+    return row
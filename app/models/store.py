@@ -0,0 +1,295 @@
+import datetime
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+
+# a cell without a value, as opposed to a field set to null
+MISSING = object()
+
+# storage kinds of columns; a column holding a mix of types is kept as objects
+BOOL = "bool"
+INT = "int"
+FLOAT = "float"
+# UTC timestamps as nanoseconds since the epoch
+DATETIME = "datetime"
+OBJECT = "object"
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+_KIND_TYPES = {
+    BOOL: bool,
+    INT: int,
+    FLOAT: float,
+    DATETIME: DatetimeWithNanoseconds,
+}
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+# the range of timestamps fitting into int64 nanoseconds
+_EPOCH_MIN = datetime.datetime(1678, 1, 1, tzinfo=datetime.timezone.utc)
+_EPOCH_MAX = datetime.datetime(2261, 12, 31, tzinfo=datetime.timezone.utc)
+_MEMORY_SAMPLE_SIZE = 200
+
+
+def kind_of(value) -> str:
+    type_ = type(value)
+    if type_ is bool:
+        return BOOL
+    if type_ is int and _INT64_MIN <= value <= _INT64_MAX:
+        return INT
+    if type_ is float:
+        return FLOAT
+    if type_ is DatetimeWithNanoseconds and value.tzinfo == datetime.timezone.utc:
+        if _EPOCH_MIN <= value <= _EPOCH_MAX:
+            return DATETIME
+    return OBJECT
+
+
+def _to_nanoseconds(value: DatetimeWithNanoseconds) -> int:
+    delta = value - _EPOCH
+    seconds = delta.days * 86400 + delta.seconds
+    return seconds * 10**9 + value.nanosecond
+
+
+def _from_nanoseconds(value: int) -> DatetimeWithNanoseconds:
+    dt = _EPOCH + datetime.timedelta(microseconds=value // 1000)
+    return DatetimeWithNanoseconds(
+        dt.year,
+        dt.month,
+        dt.day,
+        dt.hour,
+        dt.minute,
+        dt.second,
+        nanosecond=value % 10**9,
+        tzinfo=datetime.timezone.utc,
+    )
+
+
+def _empty_values(kind: str, size: int):
+    if kind == BOOL:
+        return bytearray(size)
+    if kind in (INT, DATETIME):
+        return array("q", bytes(8 * size))
+    if kind == FLOAT:
+        return array("d", bytes(8 * size))
+    return [None] * size
+
+
+def _deep_size(value) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(k) + _deep_size(v) for k, v in value.items())
+    elif isinstance(value, list):
+        size += sum(_deep_size(v) for v in value)
+    return size
+
+
+class Column:
+    """Values of one field in every row, with a bitmap of rows that have it"""
+
+    __slots__ = ("kind", "values", "present")
+
+    def __init__(self, kind: str, size: int):
+        self.kind = kind
+        self.values = _empty_values(kind, size)
+        self.present = bytearray((size + 7) // 8)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def has(self, row: int) -> bool:
+        return bool(self.present[row >> 3] & (1 << (row & 7)))
+
+    def get(self, row: int):
+        if not self.present[row >> 3] & (1 << (row & 7)):
+            return MISSING
+        value = self.values[row]
+        if self.kind == BOOL:
+            return bool(value)
+        if self.kind == DATETIME:
+            return _from_nanoseconds(value)
+        return value
+
+    def set(self, row: int, value):
+        if self.kind != OBJECT and kind_of(value) != self.kind:
+            self._promote()
+        if self.kind == DATETIME:
+            value = _to_nanoseconds(value)
+        self.values[row] = value
+        self.present[row >> 3] |= 1 << (row & 7)
+
+    def discard(self, row: int):
+        if self.kind == OBJECT:
+            # don't keep the value alive
+            self.values[row] = None
+        self.present[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+    def resize(self, size: int):
+        extra = size - len(self.values)
+        if extra > 0:
+            self.values.extend(_empty_values(self.kind, extra))
+        self.present.extend(bytes((size + 7) // 8 - len(self.present)))
+
+    def delete(self, first: int, last: int):
+        """Remove rows in [first, last)"""
+        del self.values[first:last]
+        bits = int.from_bytes(self.present, "little")
+        bits = (bits & ((1 << first) - 1)) | ((bits >> last) << first)
+        self.present = bytearray(bits.to_bytes((len(self.values) + 7) // 8, "little"))
+
+    def _promote(self):
+        values = [None] * len(self.values)
+        for row in self.rows():
+            values[row] = self.get(row)
+        self.kind = OBJECT
+        self.values = values
+
+    def rows(self) -> Iterator[int]:
+        """Rows which have a value"""
+        for i, byte in enumerate(self.present):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield (i << 3) | bit
+
+    def type_(self) -> Optional[type]:
+        """Type of values in the column, or of the last one if they're mixed"""
+        if self.kind != OBJECT:
+            return _KIND_TYPES[self.kind] if any(self.present) else None
+        for row in reversed(range(len(self.values))):
+            if self.has(row):
+                return type(self.values[row])
+        return None
+
+    def memory_usage(self) -> int:
+        size = sys.getsizeof(self.values) + sys.getsizeof(self.present)
+        if self.kind == OBJECT:
+            # extrapolated from a sample, so it's cheap to call after every page
+            step = max(1, len(self.values) // _MEMORY_SAMPLE_SIZE)
+            sample = [v for v in self.values[::step] if v is not None]
+            if sample:
+                present = bin(int.from_bytes(self.present, "little")).count("1")
+                size += sum(map(_deep_size, sample)) * present // len(sample)
+        return size
+
+
+class DocumentStore:
+    """Loaded documents kept column by column instead of as a dict per document.
+
+    Field names are interned and every field is one column. Numbers and booleans
+    are stored in typed arrays unless a column also holds other types.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.columns: Dict[str, Column] = {}
+        # document id -> row, rebuilt lazily after rows are removed
+        self._rows: Optional[Dict[str, int]] = {}
+        # changed with every write, so derived data knows when it's outdated
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row_of(self, doc_id: str) -> Optional[int]:
+        if self._rows is None:
+            self._rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        return self._rows.get(doc_id)
+
+    def get(self, row: int, key: str):
+        column = self.columns.get(key)
+        return MISSING if column is None else column.get(row)
+
+    def document(self, row: int) -> Dict[str, Any]:
+        doc = {}
+        for key, column in self.columns.items():
+            value = column.get(row)
+            if value is not MISSING:
+                doc[key] = value
+        return doc
+
+    def append(self, ids: List[str], docs: Iterable[Dict[str, Any]]) -> Set[str]:
+        """Add documents to the end, returns names of fields seen the first time"""
+        self.version += 1
+        start = len(self.ids)
+        self.ids.extend(ids)
+        if self._rows is not None:
+            self._rows.update((doc_id, start + i) for i, doc_id in enumerate(ids))
+        size = len(self.ids)
+        for column in self.columns.values():
+            column.resize(size)
+
+        new_keys = set()
+        for row, doc in enumerate(docs, start):
+            for key, value in doc.items():
+                column = self.columns.get(key)
+                if column is None:
+                    key = sys.intern(key)
+                    column = self.columns[key] = Column(kind_of(value), size)
+                    new_keys.add(key)
+                column.set(row, value)
+        return new_keys
+
+    def replace(self, row: int, doc: Dict[str, Any]) -> Set[str]:
+        """Overwrite a document, returns names of fields seen the first time"""
+        self.version += 1
+        new_keys = set()
+        for key, column in self.columns.items():
+            if key not in doc:
+                column.discard(row)
+        for key, value in doc.items():
+            column = self.columns.get(key)
+            if column is None:
+                key = sys.intern(key)
+                column = self.columns[key] = Column(kind_of(value), len(self.ids))
+                new_keys.add(key)
+            column.set(row, value)
+        return new_keys
+
+    def set(self, row: int, key: str, value) -> bool:
+        """Set a single field, returns whether the field is a new one"""
+        self.version += 1
+        column = self.columns.get(key)
+        is_new = column is None
+        if is_new:
+            key = sys.intern(key)
+            column = self.columns[key] = Column(kind_of(value), len(self.ids))
+        column.set(row, value)
+        return is_new
+
+    def unset(self, row: int, key: str):
+        self.version += 1
+        column = self.columns.get(key)
+        if column is not None:
+            column.discard(row)
+
+    def delete(self, first: int, last: int):
+        """Remove rows in [first, last)"""
+        self.version += 1
+        del self.ids[first:last]
+        for column in self.columns.values():
+            column.delete(first, last)
+        self._rows = None
+
+    def iter_column(self, key: str) -> Iterator[Tuple[int, Any]]:
+        """Rows and values of a field, skipping documents without it"""
+        column = self.columns.get(key)
+        if column is None:
+            return
+        for row in column.rows():
+            yield row, column.get(row)
+
+    def structure(self) -> Dict[str, type]:
+        """Type of every field, used as a template of new documents"""
+        structure = {}
+        for key, column in self.columns.items():
+            type_ = column.type_()
+            if type_ is not None:
+                structure[key] = type_
+        return structure
+
+    def memory_usage(self) -> int:
+        """Approximate size of the stored documents in bytes"""
+        size = sys.getsizeof(self.ids) + sum(sys.getsizeof(i) for i in self.ids)
+        return size + sum(c.memory_usage() for c in self.columns.values())
@@ -0,0 +1,275 @@
+import datetime
+from typing import Any, Iterator, List, Optional, Tuple
+
+from google.cloud.firestore_v1 import DocumentReference, GeoPoint
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from app.models.preview import cell_preview
+from app.settings import conf
+
+HEADERS = ("Key", "Value", "Type")
+Path = Tuple[Any, ...]
+
+
+def type_name(value: Any) -> str:
+    if isinstance(value, dict):
+        return "map"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "float"
+    if value is None:
+        return "null"
+    if isinstance(value, datetime.datetime):
+        return "timestamp"
+    if isinstance(value, GeoPoint):
+        return "geopoint"
+    if isinstance(value, DocumentReference):
+        return "reference"
+    if isinstance(value, bytes):
+        return "bytes"
+    return type(value).__name__
+
+
+def find_paths(value: Any, text: str) -> Iterator[Path]:
+    """Paths of elements whose key or scalar value contains the text, depth first.
+
+    It's a generator, so a search over a big value can be continued lazily.
+    """
+    text = text.lower()
+    stack: List[Tuple[Path, Any]] = [((), value)]
+    while stack:
+        path, current = stack.pop()
+        if isinstance(current, dict):
+            items = list(current.items())
+        elif isinstance(current, list):
+            items = list(enumerate(current))
+        else:
+            if path and text in str(current).lower():
+                yield path
+            continue
+        children = []
+        for key, child in items:
+            child_path = path + (key,)
+            if isinstance(key, str) and text in key.lower():
+                yield child_path
+            children.append((child_path, child))
+        stack.extend(reversed(children))
+
+
+def split_at_array(value: Any, path: Path) -> Tuple[Path, Path]:
+    """Split a path into the field path Firestore can address and the rest.
+
+    Elements of arrays can't be updated on their own, so the first part ends
+    at the outermost array on the way.
+    """
+    current = value
+    for i, key in enumerate(path):
+        if isinstance(current, list):
+            return path[:i], path[i:]
+        current = current[key]
+    return path, ()
+
+
+def value_at(value: Any, path: Path) -> Any:
+    for key in path:
+        value = value[key]
+    return value
+
+
+def replace_at(value: Any, path: Path, new: Any) -> Any:
+    """A copy of the value with the element at the path replaced.
+
+    Only maps and arrays on the way to the element are copied.
+    """
+    if not path:
+        return new
+    copy = dict(value) if isinstance(value, dict) else list(value)
+    copy[path[0]] = replace_at(value[path[0]], path[1:], new)
+    return copy
+
+
+class ValueNode:
+    """An element of a map or an array, or a range of elements of a big one"""
+
+    __slots__ = ("parent", "row", "key", "value", "keys", "start", "end", "children")
+
+    def __init__(
+        self,
+        parent: Optional["ValueNode"],
+        row: int,
+        key: Any,
+        value: Any,
+        keys: Optional[List[str]] = None,
+        start: int = 0,
+        end: Optional[int] = None,
+    ):
+        self.parent = parent
+        self.row = row
+        self.key = key
+        self.value = value
+        # keys of a map, shared with range nodes of it
+        self.keys = keys
+        self.start = start
+        self.end = end
+        self.children: Optional[List["ValueNode"]] = None
+
+    @property
+    def is_range(self) -> bool:
+        return self.end is not None
+
+    @property
+    def is_container(self) -> bool:
+        return self.is_range or isinstance(self.value, (dict, list))
+
+    def has_children(self) -> bool:
+        return self.is_range or (self.is_container and len(self.value) > 0)
+
+
+class ValueTreeModel(QAbstractItemModel):
+    """Shows a nested value as a tree, creating nodes only when they're expanded.
+
+    Maps and arrays with more than ``conf.value_tree_chunk_size`` elements are
+    split into ranges, nested as deep as needed to keep every level short.
+    """
+
+    def __init__(self, value: Any, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chunk_size = max(2, conf.value_tree_chunk_size)
+        # the value itself is the only top level node
+        self._root = ValueNode(None, 0, None, {"": value})
+
+    def _node(self, index: QModelIndex) -> ValueNode:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _children(self, node: ValueNode) -> List[ValueNode]:
+        if node.children is None:
+            node.children = self._create_children(node)
+        return node.children
+
+    def _create_children(self, node: ValueNode) -> List[ValueNode]:
+        if not node.is_container:
+            return []
+        value = node.value
+        if node.is_range:
+            keys, start, end = node.keys, node.start, node.end
+        else:
+            keys = list(value) if isinstance(value, dict) else None
+            start, end = 0, len(value)
+            node.keys = keys
+
+        count = end - start
+        if count > self.chunk_size:
+            step = self.chunk_size
+            while count > step * self.chunk_size:
+                step *= self.chunk_size
+            return [
+                ValueNode(node, row, None, value, keys, s, min(s + step, end))
+                for row, s in enumerate(range(start, end, step))
+            ]
+        children = []
+        for row, i in enumerate(range(start, end)):
+            key = keys[i] if keys is not None else i
+            children.append(ValueNode(node, row, key, value[key]))
+        return children
+
+    def index(self, row: int, column: int, parent=QModelIndex()) -> QModelIndex:
+        children = self._children(self._node(parent))
+        if not 0 <= row < len(children):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self._children(self._node(parent)))
+
+    def hasChildren(self, parent=QModelIndex()) -> bool:
+        return self._node(parent).has_children()
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(HEADERS)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if node.is_range:
+            if column == 0:
+                return f"[{node.start} … {node.end - 1}]"
+            return f"{node.end - node.start} elements" if column == 1 else ""
+        if column == 0:
+            return str(node.key)
+        if column == 1:
+            max_length = (
+                conf.tooltip_preview_length
+                if role == Qt.ToolTipRole
+                else conf.cell_preview_length
+            )
+            return cell_preview(node.value, max_length)
+        return type_name(node.value)
+
+    def value(self, index: QModelIndex) -> Any:
+        """The element of a node, or the elements of a range as a list"""
+        node = self._node(index)
+        if node is self._root:
+            return node.value[""]
+        if node.is_range:
+            if node.keys is not None:
+                keys = node.keys[node.start : node.end]
+                return {k: node.value[k] for k in keys}
+            return node.value[node.start : node.end]
+        return node.value
+
+    def path_of(self, index: QModelIndex) -> Optional[Path]:
+        """Keys from the top to an element, None for a range of elements"""
+        node = self._node(index)
+        if node.is_range:
+            return None
+        path = []
+        while node.parent is not None and node.parent is not self._root:
+            if not node.is_range:
+                path.append(node.key)
+            node = node.parent
+        return tuple(reversed(path))
+
+    def index_of_path(self, path: Path) -> QModelIndex:
+        """Index of an element given by keys from the top, creating nodes on the way"""
+        node = self._children(self._root)[0]
+        for key in path:
+            if isinstance(node.value, dict):
+                self._children(node)
+                position = node.keys.index(key)
+            else:
+                position = key
+            node = self._descend(node, position)
+        return self.createIndex(node.row, 0, node)
+
+    def _descend(self, node: ValueNode, position: int) -> ValueNode:
+        """The child holding the element at the position, through range nodes"""
+        while True:
+            children = self._children(node)
+            if not children or not children[0].is_range:
+                start = node.start if node.is_range else 0
+                return children[position - start]
+            node = next(c for c in children if c.start <= position < c.end)
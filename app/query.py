@@ -0,0 +1,110 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import BaseQuery
+
+OPERATORS = (
+    "array-contains-any",
+    "array-contains",
+    "not-in",
+    "in",
+    "==",
+    "!=",
+    "<=",
+    ">=",
+    "<",
+    ">",
+)
+INEQUALITY_OPERATORS = {"not-in", "!=", "<=", ">=", "<", ">"}
+_CONDITION_RE = re.compile(
+    r"^\s*(?P<field>[^\s=!<>]+)\s*(?P<op>"
+    + "|".join(re.escape(op) for op in OPERATORS)
+    + r")\s*(?P<value>.+?)\s*$"
+)
+_AND_RE = re.compile(r"\s+and\s+", re.IGNORECASE)
+
+
+def parse_value(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_filters(text: str) -> List[Tuple[str, str, Any]]:
+    filters = []
+    for condition in _AND_RE.split(text.strip()):
+        if not condition:
+            continue
+        match = _CONDITION_RE.match(condition)
+        if not match:
+            raise ValueError(f"Can't parse condition: {condition}")
+        filters.append(
+            (match["field"], match["op"], parse_value(match["value"].strip()))
+        )
+    return filters
+
+
+def parse_order_by(text: str) -> Tuple[Optional[str], bool]:
+    parts = text.split()
+    if not parts:
+        return None, False
+    if len(parts) > 2 or (len(parts) == 2 and parts[1].lower() not in ("asc", "desc")):
+        raise ValueError(f"Can't parse ordering: {text}")
+    return parts[0], len(parts) == 2 and parts[1].lower() == "desc"
+
+
+def parse_fields(text: str) -> List[str]:
+    return [f.strip() for f in text.split(",") if f.strip()]
+
+
+@dataclass
+class QuerySpec:
+    """A server-side query over a collection, built from the query bar"""
+
+    filters: List[Tuple[str, str, Any]] = field(default_factory=list)
+    order_by: Optional[str] = None
+    descending: bool = False
+    limit: Optional[int] = None
+    fields: List[str] = field(default_factory=list)
+
+    @classmethod
+    def parse(
+        cls, where: str = "", order_by: str = "", fields: str = "", limit: int = 0
+    ) -> "QuerySpec":
+        order_field, descending = parse_order_by(order_by)
+        return cls(
+            filters=parse_filters(where),
+            order_by=order_field,
+            descending=descending,
+            limit=limit or None,
+            fields=parse_fields(fields),
+        )
+
+    def apply(self, query: BaseQuery) -> BaseQuery:
+        """Build a query ordered by the document name last, so it can be paginated"""
+        for field_path, op, value in self.filters:
+            query = query.where(field_path, op, value)
+        order_by = self.order_by
+        if not order_by:
+            # Firestore requires ordering by the inequality field first
+            order_by = next(
+                (f for f, op, _ in self.filters if op in INEQUALITY_OPERATORS), None
+            )
+        if order_by:
+            direction = (
+                firestore.Query.DESCENDING
+                if self.descending
+                else firestore.Query.ASCENDING
+            )
+            query = query.order_by(order_by, direction=direction)
+        if self.fields:
+            # cursors built from snapshots need the ordering field values
+            fields = list(self.fields)
+            if order_by and order_by not in fields:
+                fields.append(order_by)
+            query = query.select(fields)
+        return query.order_by("__name__")
@@ -0,0 +1,59 @@
+import base64
+import datetime
+import json
+from typing import Any, Optional
+
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+from google.cloud import firestore
+from google.cloud.firestore_v1 import DocumentReference, GeoPoint
+
+TYPE_KEY = "__stora_type__"
+
+
+def encode_value(value: Any) -> Any:
+    """Convert a Firestore value to a JSON compatible one, keeping type tags"""
+    if isinstance(value, dict):
+        return {k: encode_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [encode_value(v) for v in value]
+    if isinstance(value, DatetimeWithNanoseconds):
+        return {TYPE_KEY: "datetime", "value": value.rfc3339()}
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc)
+        return {TYPE_KEY: "datetime", "value": value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")}
+    if isinstance(value, GeoPoint):
+        return {TYPE_KEY: "geopoint", "value": [value.latitude, value.longitude]}
+    if isinstance(value, DocumentReference):
+        return {TYPE_KEY: "reference", "value": value.path}
+    if isinstance(value, bytes):
+        return {TYPE_KEY: "bytes", "value": base64.b64encode(value).decode()}
+    return value
+
+
+def decode_value(value: Any, client: Optional[firestore.Client] = None) -> Any:
+    """Reverse ``encode_value``; references are restored only if a client is given"""
+    if isinstance(value, list):
+        return [decode_value(v, client) for v in value]
+    if not isinstance(value, dict):
+        return value
+    type_ = value.get(TYPE_KEY)
+    if type_ is None:
+        return {k: decode_value(v, client) for k, v in value.items()}
+    if type_ == "datetime":
+        return DatetimeWithNanoseconds.from_rfc3339(value["value"])
+    if type_ == "geopoint":
+        return GeoPoint(*value["value"])
+    if type_ == "reference":
+        return client.document(value["value"]) if client else value["value"]
+    if type_ == "bytes":
+        return base64.b64decode(value["value"])
+    raise ValueError(f"Unknown value type: {type_}")
+
+
+def dumps(document: dict) -> str:
+    return json.dumps(encode_value(document), separators=(",", ":"))
+
+
+def loads(text: str, client: Optional[firestore.Client] = None) -> dict:
+    return decode_value(json.loads(text), client)
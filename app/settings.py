@@ -2,5 +2,71 @@ class Settings:
     # material_theme = "dark_amber.xml"
     material_theme = ""
 
+    log_level = "INFO"
+    # a file to write structured JSON logs to, including every Firestore RPC
+    log_file = ""
+    # how often the RPC summary in the status bar is updated, in milliseconds
+    metrics_refresh_interval = 1000
+
+    # address of the Firestore emulator, unless FIRESTORE_EMULATOR_HOST is set
+    emulator_host = "localhost:8686"
+    # clients of closed databases kept open to connect to them again quickly
+    idle_clients = 4
+
+    # amount of documents loaded at once while browsing a collection
+    page_size = 200
+    # the next page is requested when the table is scrolled this close to the end
+    fetch_more_threshold = 50
+    # columns are ordered by how common their fields are in this many documents
+    schema_sample_size = 500
+    # amount of document ids shown at once under a collection in the tree
+    tree_page_size = 100
+    # maps, arrays and strings are summarized to this many characters in cells
+    cell_preview_length = 200
+    tooltip_preview_length = 2000
+    # amount of cell previews kept instead of being rendered again
+    preview_cache_size = 50000
+    # big maps and arrays are shown in ranges of this many elements
+    value_tree_chunk_size = 100
+    # sorted or filtered tables place loaded and changed documents after this
+    # many milliseconds, once for all changes made in the meantime
+    resort_delay = 300
+    # amount of fields listed as search results
+    search_results = 500
+    # milliseconds without typing before the search index is searched
+    search_delay = 200
+
+    # Firestore allows up to 500 writes in a single batch
+    write_batch_size = 500
+    # amount of write batches committed concurrently
+    write_parallelism = 4
+
+    # full collection scans are split into this many __name__ ranges
+    scan_partitions = 16
+    # amount of partitions streamed at the same time
+    scan_parallelism = 8
+
+    # amount of documents requested at once while exporting
+    export_page_size = 1000
+    # imports write batches of write_batch_size documents, up to this many at once
+    import_parallelism = 16
+    # a failed import batch is retried this many times, waiting longer each time
+    import_max_retries = 6
+    # seconds to wait before the first retry, doubled for every next one
+    import_backoff = 0.5
+
+    # statistics of fields keep a sample of this many numbers for percentiles
+    stats_sample_size = 10000
+    # and count up to this many distinct strings to find the most common ones
+    stats_top_capacity = 1000
+    # amount of loaded documents summarized at once
+    stats_batch_size = 10000
+
+    # browsed collections are kept on disk and shown before they're re-fetched
+    cache_enabled = True
+    # empty means a "stora" folder in the user's cache directory
+    cache_dir = ""
+    cache_max_bytes = 256 * 1024 * 1024
+
 
 conf = Settings()
@@ -0,0 +1,39 @@
+import time
+from typing import List, Tuple
+
+from loguru import logger
+
+# as early as possible, app.main imports it before anything heavy
+_STARTED = time.perf_counter()
+
+
+class StartupTimer:
+    """Durations of startup phases, from the launch until a database is shown"""
+
+    def __init__(self, started: float):
+        self.enabled = False
+        self._last = started
+        self._phases: List[Tuple[str, float]] = []
+        self._reported = False
+
+    def mark(self, phase: str):
+        """Record the time since the previous mark as spent on the phase"""
+        if self._reported:
+            return
+        now = time.perf_counter()
+        self._phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self):
+        """Log the phases once, if enabled"""
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        width = max(len(phase) for phase, _ in self._phases)
+        lines = [f"{phase:<{width}} {s * 1000:8.1f}ms" for phase, s in self._phases]
+        total = sum(s for _, s in self._phases)
+        lines.append(f"{'total':<{width}} {total * 1000:8.1f}ms")
+        logger.info("Startup phases:\n{}", "\n".join(lines))
+
+
+startup = StartupTimer(_STARTED)
@@ -1,13 +1,15 @@
 from pathlib import Path
 
 from PySide6.QtWidgets import QApplication, QWidget
-from qt_material import apply_stylesheet
 
 from app.settings import conf
 
 
 def apply_theme(app: QApplication, patch=False):
     if conf.material_theme:
+        # slow to import and not needed without a theme
+        from qt_material import apply_stylesheet
+
         apply_stylesheet(app, theme=conf.material_theme)
         if patch:
             qss = Path(__file__).parent.parent / "assets" / "styles.qss"
@@ -21,3 +23,11 @@ def apply_debug_css_borders(widget: QWidget):
         widget.setStyleSheet(f"{ss}\nborder: 1px solid black")
     for child in widget.children():
         apply_debug_css_borders(child)
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'add_document_item.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QApplication,
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QLayout,
+    QLineEdit,
+    QSizePolicy,
+    QSpacerItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from app.widgets.document_value_input import DocumentValueInputWidget
+
+
+class Ui_AddDocumentItemWidget(object):
+    def setupUi(self, AddDocumentItemWidget):
+        if not AddDocumentItemWidget.objectName():
+            AddDocumentItemWidget.setObjectName("AddDocumentItemWidget")
+        AddDocumentItemWidget.resize(717, 87)
+        sizePolicy = QSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(
+            AddDocumentItemWidget.sizePolicy().hasHeightForWidth()
+        )
+        AddDocumentItemWidget.setSizePolicy(sizePolicy)
+        AddDocumentItemWidget.setMinimumSize(QSize(0, 80))
+        AddDocumentItemWidget.setMaximumSize(QSize(16777215, 87))
+        AddDocumentItemWidget.setStyleSheet("")
+        self.verticalLayout = QVBoxLayout(AddDocumentItemWidget)
+        self.verticalLayout.setSpacing(0)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.verticalLayout.setSizeConstraint(QLayout.SetMinimumSize)
+        self.verticalLayout.setContentsMargins(-1, 0, -1, 0)
+        self.horizontalLayout = QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.horizontalLayout.setSizeConstraint(QLayout.SetMinimumSize)
+        self.horizontalSpacer = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.horizontalLayout.addItem(self.horizontalSpacer)
+
+        self.inp_name = QLineEdit(AddDocumentItemWidget)
+        self.inp_name.setObjectName("inp_name")
+        self.inp_name.setMinimumSize(QSize(150, 25))
+
+        self.horizontalLayout.addWidget(self.inp_name)
+
+        self.dd_type = QComboBox(AddDocumentItemWidget)
+        self.dd_type.addItem("")
+        self.dd_type.addItem("")
+        self.dd_type.addItem("")
+        self.dd_type.addItem("")
+        self.dd_type.addItem("")
+        self.dd_type.setObjectName("dd_type")
+
+        self.horizontalLayout.addWidget(self.dd_type)
+
+        self.w_inp = DocumentValueInputWidget(AddDocumentItemWidget)
+        self.w_inp.setObjectName("w_inp")
+        self.w_inp.setBaseSize(QSize(100, 0))
+
+        self.horizontalLayout.addWidget(self.w_inp)
+
+        self.horizontalSpacer_2 = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.horizontalLayout.addItem(self.horizontalSpacer_2)
+
+        self.verticalLayout.addLayout(self.horizontalLayout)
+
+        self.lbl_error = QLabel(AddDocumentItemWidget)
+        self.lbl_error.setObjectName("lbl_error")
+        sizePolicy1 = QSizePolicy(
+            QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Minimum
+        )
+        sizePolicy1.setHorizontalStretch(0)
+        sizePolicy1.setVerticalStretch(0)
+        sizePolicy1.setHeightForWidth(self.lbl_error.sizePolicy().hasHeightForWidth())
+        self.lbl_error.setSizePolicy(sizePolicy1)
+        self.lbl_error.setStyleSheet("color: red;")
+
+        self.verticalLayout.addWidget(self.lbl_error, 0, Qt.AlignHCenter)
+
+        self.retranslateUi(AddDocumentItemWidget)
+
+        QMetaObject.connectSlotsByName(AddDocumentItemWidget)
+
+    # setupUi
+
+    def retranslateUi(self, AddDocumentItemWidget):
+        AddDocumentItemWidget.setWindowTitle(
+            QCoreApplication.translate("AddDocumentItemWidget", "Form", None)
+        )
+        self.inp_name.setPlaceholderText(
+            QCoreApplication.translate("AddDocumentItemWidget", "Field name", None)
+        )
+        self.dd_type.setItemText(
+            0, QCoreApplication.translate("AddDocumentItemWidget", "String", "str")
+        )
+        self.dd_type.setItemText(
+            1, QCoreApplication.translate("AddDocumentItemWidget", "Bool", None)
+        )
+        self.dd_type.setItemText(
+            2, QCoreApplication.translate("AddDocumentItemWidget", "Number", None)
+        )
+        self.dd_type.setItemText(
+            3, QCoreApplication.translate("AddDocumentItemWidget", "Date", None)
+        )
+        self.dd_type.setItemText(
+            4, QCoreApplication.translate("AddDocumentItemWidget", "Map (Array)", None)
+        )
+
+        self.lbl_error.setText(
+            QCoreApplication.translate("AddDocumentItemWidget", "Error text", None)
+        )
+
+    # retranslateUi
+
+
+class AddDocumentItemWidget(QWidget, Ui_AddDocumentItemWidget):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setupUi(self)
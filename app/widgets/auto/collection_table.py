@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'collection_table.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QSizePolicy,
+    QSpacerItem,
+    QSpinBox,
+    QSplitter,
+    QTableView,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class Ui_CollectionTableWidget(object):
+    def setupUi(self, CollectionTableWidget):
+        if not CollectionTableWidget.objectName():
+            CollectionTableWidget.setObjectName("CollectionTableWidget")
+        CollectionTableWidget.resize(511, 425)
+        self.verticalLayout = QVBoxLayout(CollectionTableWidget)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontalLayout = QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.b_refresh = QPushButton(CollectionTableWidget)
+        self.b_refresh.setObjectName("b_refresh")
+
+        self.horizontalLayout.addWidget(self.b_refresh)
+
+        self.b_add = QPushButton(CollectionTableWidget)
+        self.b_add.setObjectName("b_add")
+
+        self.horizontalLayout.addWidget(self.b_add)
+
+        self.b_load_all = QPushButton(CollectionTableWidget)
+        self.b_load_all.setObjectName("b_load_all")
+
+        self.horizontalLayout.addWidget(self.b_load_all)
+
+        self.b_live = QPushButton(CollectionTableWidget)
+        self.b_live.setObjectName("b_live")
+        self.b_live.setCheckable(True)
+
+        self.horizontalLayout.addWidget(self.b_live)
+
+        self.b_stage = QPushButton(CollectionTableWidget)
+        self.b_stage.setObjectName("b_stage")
+        self.b_stage.setCheckable(True)
+
+        self.horizontalLayout.addWidget(self.b_stage)
+
+        self.b_review = QPushButton(CollectionTableWidget)
+        self.b_review.setObjectName("b_review")
+
+        self.horizontalLayout.addWidget(self.b_review)
+
+        self.b_import = QPushButton(CollectionTableWidget)
+        self.b_import.setObjectName("b_import")
+
+        self.horizontalLayout.addWidget(self.b_import)
+
+        self.b_export = QPushButton(CollectionTableWidget)
+        self.b_export.setObjectName("b_export")
+
+        self.horizontalLayout.addWidget(self.b_export)
+
+        self.b_stats = QPushButton(CollectionTableWidget)
+        self.b_stats.setObjectName("b_stats")
+        self.b_stats.setCheckable(True)
+
+        self.horizontalLayout.addWidget(self.b_stats)
+
+        self.horizontalSpacer = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.horizontalLayout.addItem(self.horizontalSpacer)
+
+        self.lbl_status = QLabel(CollectionTableWidget)
+        self.lbl_status.setObjectName("lbl_status")
+
+        self.horizontalLayout.addWidget(self.lbl_status)
+
+        self.b_cancel = QPushButton(CollectionTableWidget)
+        self.b_cancel.setObjectName("b_cancel")
+
+        self.horizontalLayout.addWidget(self.b_cancel)
+
+        self.verticalLayout.addLayout(self.horizontalLayout)
+
+        self.l_query = QHBoxLayout()
+        self.l_query.setObjectName("l_query")
+        self.inp_where = QLineEdit(CollectionTableWidget)
+        self.inp_where.setObjectName("inp_where")
+
+        self.l_query.addWidget(self.inp_where)
+
+        self.inp_order_by = QLineEdit(CollectionTableWidget)
+        self.inp_order_by.setObjectName("inp_order_by")
+
+        self.l_query.addWidget(self.inp_order_by)
+
+        self.inp_select = QLineEdit(CollectionTableWidget)
+        self.inp_select.setObjectName("inp_select")
+
+        self.l_query.addWidget(self.inp_select)
+
+        self.inp_limit = QSpinBox(CollectionTableWidget)
+        self.inp_limit.setObjectName("inp_limit")
+        self.inp_limit.setMaximum(1000000000)
+
+        self.l_query.addWidget(self.inp_limit)
+
+        self.b_apply_query = QPushButton(CollectionTableWidget)
+        self.b_apply_query.setObjectName("b_apply_query")
+
+        self.l_query.addWidget(self.b_apply_query)
+
+        self.b_reset_query = QPushButton(CollectionTableWidget)
+        self.b_reset_query.setObjectName("b_reset_query")
+
+        self.l_query.addWidget(self.b_reset_query)
+
+        self.verticalLayout.addLayout(self.l_query)
+
+        self.l_filter = QHBoxLayout()
+        self.l_filter.setObjectName("l_filter")
+        self.inp_filter = QLineEdit(CollectionTableWidget)
+        self.inp_filter.setObjectName("inp_filter")
+        self.inp_filter.setClearButtonEnabled(True)
+
+        self.l_filter.addWidget(self.inp_filter)
+
+        self.lbl_filter = QLabel(CollectionTableWidget)
+        self.lbl_filter.setObjectName("lbl_filter")
+
+        self.l_filter.addWidget(self.lbl_filter)
+
+        self.verticalLayout.addLayout(self.l_filter)
+
+        self.w_splitter = QSplitter(CollectionTableWidget)
+        self.w_splitter.setObjectName("w_splitter")
+        self.w_splitter.setOrientation(Qt.Vertical)
+        self.w_splitter.setChildrenCollapsible(False)
+        self.w_table = QTableView(self.w_splitter)
+        self.w_table.setObjectName("w_table")
+        self.w_splitter.addWidget(self.w_table)
+        self.w_stats_panel = QWidget(self.w_splitter)
+        self.w_stats_panel.setObjectName("w_stats_panel")
+        self.l_stats_panel = QVBoxLayout(self.w_stats_panel)
+        self.l_stats_panel.setObjectName("l_stats_panel")
+        self.l_stats_panel.setContentsMargins(0, 0, 0, 0)
+        self.l_stats = QHBoxLayout()
+        self.l_stats.setObjectName("l_stats")
+        self.lbl_stats = QLabel(self.w_stats_panel)
+        self.lbl_stats.setObjectName("lbl_stats")
+
+        self.l_stats.addWidget(self.lbl_stats)
+
+        self.horizontalSpacer_2 = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.l_stats.addItem(self.horizontalSpacer_2)
+
+        self.b_stats_loaded = QPushButton(self.w_stats_panel)
+        self.b_stats_loaded.setObjectName("b_stats_loaded")
+
+        self.l_stats.addWidget(self.b_stats_loaded)
+
+        self.b_stats_scan = QPushButton(self.w_stats_panel)
+        self.b_stats_scan.setObjectName("b_stats_scan")
+
+        self.l_stats.addWidget(self.b_stats_scan)
+
+        self.l_stats_panel.addLayout(self.l_stats)
+
+        self.w_stats = QTableWidget(self.w_stats_panel)
+        self.w_stats.setObjectName("w_stats")
+        self.w_stats.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.w_stats.setSelectionBehavior(QAbstractItemView.SelectRows)
+
+        self.l_stats_panel.addWidget(self.w_stats)
+
+        self.w_splitter.addWidget(self.w_stats_panel)
+
+        self.verticalLayout.addWidget(self.w_splitter)
+
+        self.retranslateUi(CollectionTableWidget)
+
+        QMetaObject.connectSlotsByName(CollectionTableWidget)
+
+    # setupUi
+
+    def retranslateUi(self, CollectionTableWidget):
+        CollectionTableWidget.setWindowTitle(
+            QCoreApplication.translate("CollectionTableWidget", "Form", None)
+        )
+        self.b_refresh.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Refresh", None)
+        )
+        self.b_add.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Add", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.b_load_all.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                "Load every document at once, reading the collection in parallel",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_load_all.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Load all", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.b_live.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                "Apply changes made by others as soon as they happen",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_live.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Live", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.b_stage.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                "Collect edits locally and send them together after reviewing",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_stage.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Stage edits", None)
+        )
+        self.b_review.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Review changes", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.b_import.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                "Write documents of an NDJSON or CSV file into the collection",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_import.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Import", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.b_export.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                "Write every document of the collection or query to an NDJSON or CSV file",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_export.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Export", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.b_stats.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                "Show statistics of every field of the loaded documents or the whole collection",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_stats.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Stats", None)
+        )
+        self.lbl_status.setText("")
+        self.b_cancel.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Cancel", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.inp_where.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                'Conditions joined with "and", values are parsed as JSON',
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.inp_where.setPlaceholderText(
+            QCoreApplication.translate(
+                "CollectionTableWidget", 'where: age >= 18 and status == "active"', None
+            )
+        )
+        self.inp_order_by.setPlaceholderText(
+            QCoreApplication.translate(
+                "CollectionTableWidget", "order by: created desc", None
+            )
+        )
+        self.inp_select.setPlaceholderText(
+            QCoreApplication.translate(
+                "CollectionTableWidget", "select: name, email", None
+            )
+        )
+        # if QT_CONFIG(tooltip)
+        self.inp_limit.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                "Maximum amount of documents, 0 means no limit",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.inp_limit.setSpecialValueText(
+            QCoreApplication.translate("CollectionTableWidget", "no limit", None)
+        )
+        self.b_apply_query.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Apply", None)
+        )
+        self.b_reset_query.setText(
+            QCoreApplication.translate("CollectionTableWidget", "Reset", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.inp_filter.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                'Filter documents already in the table without reading them again, like "where"',
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.inp_filter.setPlaceholderText(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                'filter loaded: age > 30 and status != "banned"',
+                None,
+            )
+        )
+        self.lbl_filter.setText("")
+        self.lbl_stats.setText("")
+        # if QT_CONFIG(tooltip)
+        self.b_stats_loaded.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget", "Summarize documents in the table", None
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_stats_loaded.setText(
+            QCoreApplication.translate(
+                "CollectionTableWidget", "Loaded documents", None
+            )
+        )
+        # if QT_CONFIG(tooltip)
+        self.b_stats_scan.setToolTip(
+            QCoreApplication.translate(
+                "CollectionTableWidget",
+                "Read every document of the collection or query and summarize it without keeping it",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_stats_scan.setText(
+            QCoreApplication.translate(
+                "CollectionTableWidget", "Whole collection", None
+            )
+        )
+
+    # retranslateUi
+
+
+class CollectionTableWidget(QWidget, Ui_CollectionTableWidget):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setupUi(self)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'collections_tree.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QApplication,
+    QHBoxLayout,
+    QHeaderView,
+    QPushButton,
+    QSizePolicy,
+    QSpacerItem,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class Ui_CollectionsTreeWidget(object):
+    def setupUi(self, CollectionsTreeWidget):
+        if not CollectionsTreeWidget.objectName():
+            CollectionsTreeWidget.setObjectName("CollectionsTreeWidget")
+        CollectionsTreeWidget.resize(280, 420)
+        sizePolicy = QSizePolicy(
+            QSizePolicy.Policy.MinimumExpanding, QSizePolicy.Policy.Preferred
+        )
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(
+            CollectionsTreeWidget.sizePolicy().hasHeightForWidth()
+        )
+        CollectionsTreeWidget.setSizePolicy(sizePolicy)
+        CollectionsTreeWidget.setMaximumSize(QSize(280, 16777215))
+        self.verticalLayout = QVBoxLayout(CollectionsTreeWidget)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontalLayout = QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.horizontalSpacer = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.horizontalLayout.addItem(self.horizontalSpacer)
+
+        self.b_refresh = QPushButton(CollectionsTreeWidget)
+        self.b_refresh.setObjectName("b_refresh")
+
+        self.horizontalLayout.addWidget(self.b_refresh)
+
+        self.horizontalSpacer_2 = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.horizontalLayout.addItem(self.horizontalSpacer_2)
+
+        self.verticalLayout.addLayout(self.horizontalLayout)
+
+        self.w_tree = QTreeWidget(CollectionsTreeWidget)
+        self.w_tree.setObjectName("w_tree")
+
+        self.verticalLayout.addWidget(self.w_tree)
+
+        self.retranslateUi(CollectionsTreeWidget)
+
+        QMetaObject.connectSlotsByName(CollectionsTreeWidget)
+
+    # setupUi
+
+    def retranslateUi(self, CollectionsTreeWidget):
+        CollectionsTreeWidget.setWindowTitle(
+            QCoreApplication.translate("CollectionsTreeWidget", "Form", None)
+        )
+        self.b_refresh.setText(
+            QCoreApplication.translate("CollectionsTreeWidget", "Refresh", None)
+        )
+        ___qtreewidgetitem = self.w_tree.headerItem()
+        ___qtreewidgetitem.setText(
+            0, QCoreApplication.translate("CollectionsTreeWidget", "Collections", None)
+        )
+
+    # retranslateUi
+
+
+class CollectionsTreeWidget(QWidget, Ui_CollectionsTreeWidget):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setupUi(self)
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'database_view.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QApplication,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QSizePolicy,
+    QSpacerItem,
+    QStackedWidget,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from app.widgets.collection_table import CollectionTableWidget
+from app.widgets.collections_tree import CollectionsTreeWidget
+
+
+class Ui_DatabaseViewWidget(object):
+    def setupUi(self, DatabaseViewWidget):
+        if not DatabaseViewWidget.objectName():
+            DatabaseViewWidget.setObjectName("DatabaseViewWidget")
+        DatabaseViewWidget.resize(592, 546)
+        self.verticalLayout_3 = QVBoxLayout(DatabaseViewWidget)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.lbl_db_name = QLabel(DatabaseViewWidget)
+        self.lbl_db_name.setObjectName("lbl_db_name")
+        self.lbl_db_name.setAlignment(Qt.AlignCenter)
+
+        self.verticalLayout_3.addWidget(self.lbl_db_name)
+
+        self.horizontalLayout = QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.l_sidebar = QVBoxLayout()
+        self.l_sidebar.setObjectName("l_sidebar")
+        self.w_collections_tree = CollectionsTreeWidget(DatabaseViewWidget)
+        self.w_collections_tree.setObjectName("w_collections_tree")
+
+        self.l_sidebar.addWidget(self.w_collections_tree)
+
+        self.inp_search = QLineEdit(DatabaseViewWidget)
+        self.inp_search.setObjectName("inp_search")
+        self.inp_search.setMaximumSize(QSize(280, 16777215))
+        self.inp_search.setClearButtonEnabled(True)
+
+        self.l_sidebar.addWidget(self.inp_search)
+
+        self.w_search_results = QTreeWidget(DatabaseViewWidget)
+        self.w_search_results.setObjectName("w_search_results")
+        self.w_search_results.setMaximumSize(QSize(280, 16777215))
+        self.w_search_results.setRootIsDecorated(False)
+        self.w_search_results.setUniformRowHeights(True)
+
+        self.l_sidebar.addWidget(self.w_search_results)
+
+        self.l_search_status = QHBoxLayout()
+        self.l_search_status.setObjectName("l_search_status")
+        self.lbl_search = QLabel(DatabaseViewWidget)
+        self.lbl_search.setObjectName("lbl_search")
+        self.lbl_search.setWordWrap(True)
+
+        self.l_search_status.addWidget(self.lbl_search)
+
+        self.b_index_all = QPushButton(DatabaseViewWidget)
+        self.b_index_all.setObjectName("b_index_all")
+
+        self.l_search_status.addWidget(self.b_index_all)
+
+        self.l_sidebar.addLayout(self.l_search_status)
+
+        self.horizontalLayout.addLayout(self.l_sidebar)
+
+        self.w_stack = QStackedWidget(DatabaseViewWidget)
+        self.w_stack.setObjectName("w_stack")
+        self.page_info = QWidget()
+        self.page_info.setObjectName("page_info")
+        self.verticalLayout = QVBoxLayout(self.page_info)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.verticalSpacer = QSpacerItem(
+            20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding
+        )
+
+        self.verticalLayout.addItem(self.verticalSpacer)
+
+        self.lbl_info = QLabel(self.page_info)
+        self.lbl_info.setObjectName("lbl_info")
+        self.lbl_info.setAlignment(Qt.AlignCenter)
+
+        self.verticalLayout.addWidget(self.lbl_info)
+
+        self.verticalSpacer_2 = QSpacerItem(
+            20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding
+        )
+
+        self.verticalLayout.addItem(self.verticalSpacer_2)
+
+        self.w_stack.addWidget(self.page_info)
+        self.page_table = QWidget()
+        self.page_table.setObjectName("page_table")
+        self.verticalLayout_2 = QVBoxLayout(self.page_table)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.w_collection_table = CollectionTableWidget(self.page_table)
+        self.w_collection_table.setObjectName("w_collection_table")
+
+        self.verticalLayout_2.addWidget(self.w_collection_table)
+
+        self.w_stack.addWidget(self.page_table)
+
+        self.horizontalLayout.addWidget(self.w_stack)
+
+        self.verticalLayout_3.addLayout(self.horizontalLayout)
+
+        self.retranslateUi(DatabaseViewWidget)
+
+        self.w_stack.setCurrentIndex(0)
+
+        QMetaObject.connectSlotsByName(DatabaseViewWidget)
+
+    # setupUi
+
+    def retranslateUi(self, DatabaseViewWidget):
+        DatabaseViewWidget.setWindowTitle(
+            QCoreApplication.translate("DatabaseViewWidget", "Form", None)
+        )
+        self.lbl_db_name.setText(
+            QCoreApplication.translate("DatabaseViewWidget", "Database name", None)
+        )
+        self.inp_search.setPlaceholderText(
+            QCoreApplication.translate(
+                "DatabaseViewWidget", "Search loaded documents", None
+            )
+        )
+        ___qtreewidgetitem = self.w_search_results.headerItem()
+        ___qtreewidgetitem.setText(
+            1, QCoreApplication.translate("DatabaseViewWidget", "Field", None)
+        )
+        ___qtreewidgetitem.setText(
+            0, QCoreApplication.translate("DatabaseViewWidget", "Document", None)
+        )
+        self.lbl_search.setText("")
+        # if QT_CONFIG(tooltip)
+        self.b_index_all.setToolTip(
+            QCoreApplication.translate(
+                "DatabaseViewWidget",
+                "Read every root collection in the background to search all of them",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_index_all.setText(
+            QCoreApplication.translate("DatabaseViewWidget", "Index all", None)
+        )
+        self.lbl_info.setText(
+            QCoreApplication.translate(
+                "DatabaseViewWidget", "Please select a collection to browse data", None
+            )
+        )
+
+    # retranslateUi
+
+
+class DatabaseViewWidget(QWidget, Ui_DatabaseViewWidget):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setupUi(self)
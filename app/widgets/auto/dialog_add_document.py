@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'dialog_add_document.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QAbstractButton,
+    QApplication,
+    QDialog,
+    QDialogButtonBox,
+    QPushButton,
+    QScrollArea,
+    QSizePolicy,
+    QSpacerItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from app.widgets.add_document_item import AddDocumentItemWidget
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        if not Dialog.objectName():
+            Dialog.setObjectName("Dialog")
+        Dialog.resize(600, 603)
+        Dialog.setMinimumSize(QSize(600, 0))
+        self.verticalLayout = QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.w_scroll = QScrollArea(Dialog)
+        self.w_scroll.setObjectName("w_scroll")
+        self.w_scroll.setMinimumSize(QSize(500, 0))
+        self.w_scroll.setWidgetResizable(True)
+        self.w_scroll_content = QWidget()
+        self.w_scroll_content.setObjectName("w_scroll_content")
+        self.w_scroll_content.setGeometry(QRect(0, 0, 574, 537))
+        self.verticalLayout_2 = QVBoxLayout(self.w_scroll_content)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.verticalSpacer_2 = QSpacerItem(
+            20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding
+        )
+
+        self.verticalLayout_2.addItem(self.verticalSpacer_2)
+
+        self.w_add_item_default = AddDocumentItemWidget(self.w_scroll_content)
+        self.w_add_item_default.setObjectName("w_add_item_default")
+
+        self.verticalLayout_2.addWidget(self.w_add_item_default)
+
+        self.b_add_field = QPushButton(self.w_scroll_content)
+        self.b_add_field.setObjectName("b_add_field")
+        self.b_add_field.setMaximumSize(QSize(150, 16777215))
+
+        self.verticalLayout_2.addWidget(self.b_add_field, 0, Qt.AlignHCenter)
+
+        self.verticalSpacer = QSpacerItem(
+            20, 20, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding
+        )
+
+        self.verticalLayout_2.addItem(self.verticalSpacer)
+
+        self.w_scroll.setWidget(self.w_scroll_content)
+
+        self.verticalLayout.addWidget(self.w_scroll)
+
+        self.b_box = QDialogButtonBox(Dialog)
+        self.b_box.setObjectName("b_box")
+        self.b_box.setOrientation(Qt.Horizontal)
+        self.b_box.setStandardButtons(QDialogButtonBox.Cancel | QDialogButtonBox.Save)
+
+        self.verticalLayout.addWidget(self.b_box)
+
+        self.retranslateUi(Dialog)
+        self.b_box.accepted.connect(Dialog.accept)
+        self.b_box.rejected.connect(Dialog.reject)
+
+        QMetaObject.connectSlotsByName(Dialog)
+
+    # setupUi
+
+    def retranslateUi(self, Dialog):
+        Dialog.setWindowTitle(
+            QCoreApplication.translate("Dialog", "Add document", None)
+        )
+        self.b_add_field.setText(
+            QCoreApplication.translate("Dialog", "Add another field", None)
+        )
+
+    # retranslateUi
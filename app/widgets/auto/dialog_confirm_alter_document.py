@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'dialog_confirm_alter_document.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QAbstractButton,
+    QApplication,
+    QDialog,
+    QDialogButtonBox,
+    QLabel,
+    QSizePolicy,
+    QSpacerItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        if not Dialog.objectName():
+            Dialog.setObjectName("Dialog")
+        Dialog.resize(459, 324)
+        self.verticalLayout = QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.verticalSpacer = QSpacerItem(
+            20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding
+        )
+
+        self.verticalLayout.addItem(self.verticalSpacer)
+
+        self.label = QLabel(Dialog)
+        self.label.setObjectName("label")
+        self.label.setAlignment(Qt.AlignCenter)
+
+        self.verticalLayout.addWidget(self.label)
+
+        self.label_2 = QLabel(Dialog)
+        self.label_2.setObjectName("label_2")
+        self.label_2.setAlignment(Qt.AlignLeading | Qt.AlignLeft | Qt.AlignVCenter)
+
+        self.verticalLayout.addWidget(self.label_2)
+
+        self.lbl_prev_value = QLabel(Dialog)
+        self.lbl_prev_value.setObjectName("lbl_prev_value")
+        self.lbl_prev_value.setStyleSheet(
+            "border: 1px solid grey;\n" "border-radius: 2px;\n" "padding: 5px;"
+        )
+        self.lbl_prev_value.setWordWrap(True)
+
+        self.verticalLayout.addWidget(self.lbl_prev_value)
+
+        self.label_4 = QLabel(Dialog)
+        self.label_4.setObjectName("label_4")
+        self.label_4.setAlignment(Qt.AlignLeading | Qt.AlignLeft | Qt.AlignVCenter)
+
+        self.verticalLayout.addWidget(self.label_4)
+
+        self.lbl_new_value = QLabel(Dialog)
+        self.lbl_new_value.setObjectName("lbl_new_value")
+        self.lbl_new_value.setStyleSheet(
+            "border: 1px solid grey;\n" "border-radius: 2px;\n" "padding: 5px;"
+        )
+        self.lbl_new_value.setWordWrap(True)
+
+        self.verticalLayout.addWidget(self.lbl_new_value)
+
+        self.verticalSpacer_2 = QSpacerItem(
+            20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding
+        )
+
+        self.verticalLayout.addItem(self.verticalSpacer_2)
+
+        self.b_box = QDialogButtonBox(Dialog)
+        self.b_box.setObjectName("b_box")
+        self.b_box.setOrientation(Qt.Horizontal)
+        self.b_box.setStandardButtons(QDialogButtonBox.Cancel | QDialogButtonBox.Ok)
+
+        self.verticalLayout.addWidget(self.b_box)
+
+        self.retranslateUi(Dialog)
+        self.b_box.accepted.connect(Dialog.accept)
+        self.b_box.rejected.connect(Dialog.reject)
+
+        QMetaObject.connectSlotsByName(Dialog)
+
+    # setupUi
+
+    def retranslateUi(self, Dialog):
+        Dialog.setWindowTitle(
+            QCoreApplication.translate("Dialog", "Confirmation", None)
+        )
+        self.label.setText(
+            QCoreApplication.translate(
+                "Dialog", "Please confirm you want to update the document", None
+            )
+        )
+        self.label_2.setText(QCoreApplication.translate("Dialog", "from:", None))
+        self.lbl_prev_value.setText(
+            QCoreApplication.translate("Dialog", "Previous content", None)
+        )
+        self.label_4.setText(QCoreApplication.translate("Dialog", "to:", None))
+        self.lbl_new_value.setText(
+            QCoreApplication.translate("Dialog", "New content", None)
+        )
+
+    # retranslateUi
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'dialog_connect_to_db.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QAbstractButton,
+    QApplication,
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QSizePolicy,
+    QSpacerItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        if not Dialog.objectName():
+            Dialog.setObjectName("Dialog")
+        Dialog.resize(400, 300)
+        self.verticalLayout = QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.verticalSpacer = QSpacerItem(
+            20, 82, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding
+        )
+
+        self.verticalLayout.addItem(self.verticalSpacer)
+
+        self.label = QLabel(Dialog)
+        self.label.setObjectName("label")
+        self.label.setAlignment(Qt.AlignCenter)
+
+        self.verticalLayout.addWidget(self.label)
+
+        self.horizontalLayout = QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.horizontalSpacer = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.horizontalLayout.addItem(self.horizontalSpacer)
+
+        self.l_form = QFormLayout()
+        self.l_form.setObjectName("l_form")
+        self.lbl_db_name = QLabel(Dialog)
+        self.lbl_db_name.setObjectName("lbl_db_name")
+
+        self.l_form.setWidget(0, QFormLayout.LabelRole, self.lbl_db_name)
+
+        self.inp_db_name = QLineEdit(Dialog)
+        self.inp_db_name.setObjectName("inp_db_name")
+
+        self.l_form.setWidget(0, QFormLayout.FieldRole, self.inp_db_name)
+
+        self.lbl_emulator_host = QLabel(Dialog)
+        self.lbl_emulator_host.setObjectName("lbl_emulator_host")
+
+        self.l_form.setWidget(1, QFormLayout.LabelRole, self.lbl_emulator_host)
+
+        self.inp_emulator_host = QLineEdit(Dialog)
+        self.inp_emulator_host.setObjectName("inp_emulator_host")
+
+        self.l_form.setWidget(1, QFormLayout.FieldRole, self.inp_emulator_host)
+
+        self.horizontalLayout.addLayout(self.l_form)
+
+        self.horizontalSpacer_2 = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.horizontalLayout.addItem(self.horizontalSpacer_2)
+
+        self.verticalLayout.addLayout(self.horizontalLayout)
+
+        self.verticalSpacer_2 = QSpacerItem(
+            20, 81, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding
+        )
+
+        self.verticalLayout.addItem(self.verticalSpacer_2)
+
+        self.buttons = QDialogButtonBox(Dialog)
+        self.buttons.setObjectName("buttons")
+        self.buttons.setOrientation(Qt.Horizontal)
+        self.buttons.setStandardButtons(QDialogButtonBox.Cancel | QDialogButtonBox.Ok)
+
+        self.verticalLayout.addWidget(self.buttons)
+
+        self.retranslateUi(Dialog)
+        self.buttons.accepted.connect(Dialog.accept)
+        self.buttons.rejected.connect(Dialog.reject)
+
+        QMetaObject.connectSlotsByName(Dialog)
+
+    # setupUi
+
+    def retranslateUi(self, Dialog):
+        Dialog.setWindowTitle(
+            QCoreApplication.translate("Dialog", "Connect to new database", None)
+        )
+        self.label.setText(
+            QCoreApplication.translate(
+                "Dialog", "Please provide a database name:", None
+            )
+        )
+        self.lbl_db_name.setText(QCoreApplication.translate("Dialog", "Project:", None))
+        self.lbl_emulator_host.setText(
+            QCoreApplication.translate("Dialog", "Emulator host:", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.inp_emulator_host.setToolTip(
+            QCoreApplication.translate(
+                "Dialog",
+                "Address of the Firestore emulator, empty for the default one",
+                None,
+            )
+        )
+
+
+# endif // QT_CONFIG(tooltip)
+# retranslateUi
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'dialog_metrics.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QAbstractButton,
+    QAbstractItemView,
+    QApplication,
+    QDialog,
+    QDialogButtonBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QSizePolicy,
+    QSpacerItem,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        if not Dialog.objectName():
+            Dialog.setObjectName("Dialog")
+        Dialog.resize(900, 500)
+        self.verticalLayout = QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.lbl_totals = QLabel(Dialog)
+        self.lbl_totals.setObjectName("lbl_totals")
+
+        self.verticalLayout.addWidget(self.lbl_totals)
+
+        self.w_table = QTableWidget(Dialog)
+        self.w_table.setObjectName("w_table")
+        self.w_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.w_table.setSortingEnabled(True)
+
+        self.verticalLayout.addWidget(self.w_table)
+
+        self.horizontalLayout = QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.b_reset = QPushButton(Dialog)
+        self.b_reset.setObjectName("b_reset")
+
+        self.horizontalLayout.addWidget(self.b_reset)
+
+        self.b_export = QPushButton(Dialog)
+        self.b_export.setObjectName("b_export")
+
+        self.horizontalLayout.addWidget(self.b_export)
+
+        self.horizontalSpacer = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.horizontalLayout.addItem(self.horizontalSpacer)
+
+        self.buttonBox = QDialogButtonBox(Dialog)
+        self.buttonBox.setObjectName("buttonBox")
+        self.buttonBox.setStandardButtons(QDialogButtonBox.Close)
+
+        self.horizontalLayout.addWidget(self.buttonBox)
+
+        self.verticalLayout.addLayout(self.horizontalLayout)
+
+        self.retranslateUi(Dialog)
+        self.buttonBox.rejected.connect(Dialog.reject)
+
+        QMetaObject.connectSlotsByName(Dialog)
+
+    # setupUi
+
+    def retranslateUi(self, Dialog):
+        Dialog.setWindowTitle(
+            QCoreApplication.translate("Dialog", "Firestore RPC metrics", None)
+        )
+        self.lbl_totals.setText("")
+        self.b_reset.setText(QCoreApplication.translate("Dialog", "Reset", None))
+        self.b_export.setText(QCoreApplication.translate("Dialog", "Export JSON", None))
+
+    # retranslateUi
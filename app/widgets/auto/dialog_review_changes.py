@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'dialog_review_changes.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QAbstractButton,
+    QAbstractItemView,
+    QApplication,
+    QDialog,
+    QDialogButtonBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QSizePolicy,
+    QSpacerItem,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        if not Dialog.objectName():
+            Dialog.setObjectName("Dialog")
+        Dialog.resize(900, 500)
+        self.verticalLayout = QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.lbl_summary = QLabel(Dialog)
+        self.lbl_summary.setObjectName("lbl_summary")
+
+        self.verticalLayout.addWidget(self.lbl_summary)
+
+        self.w_changes = QTableWidget(Dialog)
+        self.w_changes.setObjectName("w_changes")
+        self.w_changes.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.w_changes.setSelectionBehavior(QAbstractItemView.SelectRows)
+
+        self.verticalLayout.addWidget(self.w_changes)
+
+        self.horizontalLayout = QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.b_discard = QPushButton(Dialog)
+        self.b_discard.setObjectName("b_discard")
+
+        self.horizontalLayout.addWidget(self.b_discard)
+
+        self.horizontalSpacer = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.horizontalLayout.addItem(self.horizontalSpacer)
+
+        self.b_box = QDialogButtonBox(Dialog)
+        self.b_box.setObjectName("b_box")
+        self.b_box.setStandardButtons(QDialogButtonBox.Cancel | QDialogButtonBox.Ok)
+
+        self.horizontalLayout.addWidget(self.b_box)
+
+        self.verticalLayout.addLayout(self.horizontalLayout)
+
+        self.retranslateUi(Dialog)
+        self.b_box.accepted.connect(Dialog.accept)
+        self.b_box.rejected.connect(Dialog.reject)
+
+        QMetaObject.connectSlotsByName(Dialog)
+
+    # setupUi
+
+    def retranslateUi(self, Dialog):
+        Dialog.setWindowTitle(
+            QCoreApplication.translate("Dialog", "Pending changes", None)
+        )
+        self.lbl_summary.setText("")
+        # if QT_CONFIG(tooltip)
+        self.b_discard.setToolTip(
+            QCoreApplication.translate(
+                "Dialog",
+                "Forget the selected changes and show the loaded values again",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_discard.setText(
+            QCoreApplication.translate("Dialog", "Discard selected", None)
+        )
+
+    # retranslateUi
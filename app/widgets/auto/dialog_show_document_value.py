@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'dialog_show_document_value.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QPlainTextEdit,
+    QPushButton,
+    QSizePolicy,
+    QSpacerItem,
+    QSplitter,
+    QTreeView,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        if not Dialog.objectName():
+            Dialog.setObjectName("Dialog")
+        Dialog.resize(700, 500)
+        Dialog.setMinimumSize(QSize(500, 400))
+        self.verticalLayout = QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.l_search = QHBoxLayout()
+        self.l_search.setObjectName("l_search")
+        self.inp_search = QLineEdit(Dialog)
+        self.inp_search.setObjectName("inp_search")
+        self.inp_search.setClearButtonEnabled(True)
+
+        self.l_search.addWidget(self.inp_search)
+
+        self.b_find_next = QPushButton(Dialog)
+        self.b_find_next.setObjectName("b_find_next")
+
+        self.l_search.addWidget(self.b_find_next)
+
+        self.b_copy = QPushButton(Dialog)
+        self.b_copy.setObjectName("b_copy")
+
+        self.l_search.addWidget(self.b_copy)
+
+        self.verticalLayout.addLayout(self.l_search)
+
+        self.splitter = QSplitter(Dialog)
+        self.splitter.setObjectName("splitter")
+        self.splitter.setOrientation(Qt.Vertical)
+        self.w_tree = QTreeView(self.splitter)
+        self.w_tree.setObjectName("w_tree")
+        self.w_tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.w_tree.setUniformRowHeights(True)
+        self.splitter.addWidget(self.w_tree)
+        self.inp_detail = QPlainTextEdit(self.splitter)
+        self.inp_detail.setObjectName("inp_detail")
+        self.inp_detail.setReadOnly(True)
+        self.splitter.addWidget(self.inp_detail)
+
+        self.verticalLayout.addWidget(self.splitter)
+
+        self.l_edit = QHBoxLayout()
+        self.l_edit.setObjectName("l_edit")
+        self.b_edit = QPushButton(Dialog)
+        self.b_edit.setObjectName("b_edit")
+
+        self.l_edit.addWidget(self.b_edit)
+
+        self.b_increment = QPushButton(Dialog)
+        self.b_increment.setObjectName("b_increment")
+
+        self.l_edit.addWidget(self.b_increment)
+
+        self.b_array_add = QPushButton(Dialog)
+        self.b_array_add.setObjectName("b_array_add")
+
+        self.l_edit.addWidget(self.b_array_add)
+
+        self.b_array_remove = QPushButton(Dialog)
+        self.b_array_remove.setObjectName("b_array_remove")
+
+        self.l_edit.addWidget(self.b_array_remove)
+
+        self.horizontalSpacer = QSpacerItem(
+            40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum
+        )
+
+        self.l_edit.addItem(self.horizontalSpacer)
+
+        self.verticalLayout.addLayout(self.l_edit)
+
+        self.lbl_status = QLabel(Dialog)
+        self.lbl_status.setObjectName("lbl_status")
+
+        self.verticalLayout.addWidget(self.lbl_status)
+
+        self.retranslateUi(Dialog)
+
+        QMetaObject.connectSlotsByName(Dialog)
+
+    # setupUi
+
+    def retranslateUi(self, Dialog):
+        Dialog.setWindowTitle(
+            QCoreApplication.translate("Dialog", "Document value", None)
+        )
+        self.inp_search.setPlaceholderText(
+            QCoreApplication.translate("Dialog", "Search keys and values", None)
+        )
+        self.b_find_next.setText(
+            QCoreApplication.translate("Dialog", "Find next", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.b_copy.setToolTip(
+            QCoreApplication.translate(
+                "Dialog", "Copy the selected value, or the whole value, as JSON", None
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_copy.setText(QCoreApplication.translate("Dialog", "Copy JSON", None))
+        # if QT_CONFIG(tooltip)
+        self.b_edit.setToolTip(
+            QCoreApplication.translate(
+                "Dialog",
+                "Replace the selected element, only it is sent to the server",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_edit.setText(QCoreApplication.translate("Dialog", "Edit", None))
+        # if QT_CONFIG(tooltip)
+        self.b_increment.setToolTip(
+            QCoreApplication.translate(
+                "Dialog",
+                "Add to the selected number on the server, without reading it first",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_increment.setText(
+            QCoreApplication.translate("Dialog", "Increment", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.b_array_add.setToolTip(
+            QCoreApplication.translate(
+                "Dialog",
+                "Add an element to the selected array unless it's already there",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_array_add.setText(
+            QCoreApplication.translate("Dialog", "Add to array", None)
+        )
+        # if QT_CONFIG(tooltip)
+        self.b_array_remove.setToolTip(
+            QCoreApplication.translate(
+                "Dialog",
+                "Remove every element equal to the selected one from its array",
+                None,
+            )
+        )
+        # endif // QT_CONFIG(tooltip)
+        self.b_array_remove.setText(
+            QCoreApplication.translate("Dialog", "Remove from array", None)
+        )
+        self.lbl_status.setText("")
+
+    # retranslateUi
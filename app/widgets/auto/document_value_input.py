@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'document_value_input.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QApplication,
+    QCheckBox,
+    QDateTimeEdit,
+    QHBoxLayout,
+    QLineEdit,
+    QPlainTextEdit,
+    QSizePolicy,
+    QStackedWidget,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class Ui_DocumentValueInputWidget(object):
+    def setupUi(self, DocumentValueInputWidget):
+        if not DocumentValueInputWidget.objectName():
+            DocumentValueInputWidget.setObjectName("DocumentValueInputWidget")
+        DocumentValueInputWidget.resize(314, 240)
+        DocumentValueInputWidget.setMaximumSize(QSize(16777215, 16777215))
+        DocumentValueInputWidget.setBaseSize(QSize(0, 0))
+        self.horizontalLayout = QHBoxLayout(DocumentValueInputWidget)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.horizontalLayout.setContentsMargins(0, 0, 0, 0)
+        self.w_stacked = QStackedWidget(DocumentValueInputWidget)
+        self.w_stacked.setObjectName("w_stacked")
+        sizePolicy = QSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.w_stacked.sizePolicy().hasHeightForWidth())
+        self.w_stacked.setSizePolicy(sizePolicy)
+        self.w_stacked.setStyleSheet("")
+        self.w_stacked.setLineWidth(0)
+        self.p_str = QWidget()
+        self.p_str.setObjectName("p_str")
+        self.verticalLayout_2 = QVBoxLayout(self.p_str)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.verticalLayout_2.setContentsMargins(-1, 0, -1, 0)
+        self.inp_str = QLineEdit(self.p_str)
+        self.inp_str.setObjectName("inp_str")
+        self.inp_str.setMinimumSize(QSize(0, 25))
+
+        self.verticalLayout_2.addWidget(self.inp_str)
+
+        self.w_stacked.addWidget(self.p_str)
+        self.p_bool = QWidget()
+        self.p_bool.setObjectName("p_bool")
+        self.verticalLayout_3 = QVBoxLayout(self.p_bool)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.inp_bool = QCheckBox(self.p_bool)
+        self.inp_bool.setObjectName("inp_bool")
+
+        self.verticalLayout_3.addWidget(self.inp_bool)
+
+        self.w_stacked.addWidget(self.p_bool)
+        self.p_number = QWidget()
+        self.p_number.setObjectName("p_number")
+        self.verticalLayout_4 = QVBoxLayout(self.p_number)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.inp_number = QLineEdit(self.p_number)
+        self.inp_number.setObjectName("inp_number")
+        self.inp_number.setMinimumSize(QSize(0, 25))
+
+        self.verticalLayout_4.addWidget(self.inp_number)
+
+        self.w_stacked.addWidget(self.p_number)
+        self.p_date = QWidget()
+        self.p_date.setObjectName("p_date")
+        self.verticalLayout_5 = QVBoxLayout(self.p_date)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.verticalLayout_5.setContentsMargins(-1, 0, -1, 0)
+        self.inp_date = QDateTimeEdit(self.p_date)
+        self.inp_date.setObjectName("inp_date")
+        self.inp_date.setMinimumSize(QSize(0, 25))
+
+        self.verticalLayout_5.addWidget(self.inp_date)
+
+        self.w_stacked.addWidget(self.p_date)
+        self.p_map = QWidget()
+        self.p_map.setObjectName("p_map")
+        self.verticalLayout_6 = QVBoxLayout(self.p_map)
+        self.verticalLayout_6.setObjectName("verticalLayout_6")
+        self.inp_map = QPlainTextEdit(self.p_map)
+        self.inp_map.setObjectName("inp_map")
+        self.inp_map.setMaximumSize(QSize(16777215, 16777215))
+
+        self.verticalLayout_6.addWidget(self.inp_map)
+
+        self.w_stacked.addWidget(self.p_map)
+
+        self.horizontalLayout.addWidget(self.w_stacked)
+
+        self.retranslateUi(DocumentValueInputWidget)
+
+        self.w_stacked.setCurrentIndex(4)
+
+        QMetaObject.connectSlotsByName(DocumentValueInputWidget)
+
+    # setupUi
+
+    def retranslateUi(self, DocumentValueInputWidget):
+        DocumentValueInputWidget.setWindowTitle(
+            QCoreApplication.translate("DocumentValueInputWidget", "Form", None)
+        )
+        self.inp_bool.setText("")
+
+    # retranslateUi
+
+
+class DocumentValueInputWidget(QWidget, Ui_DocumentValueInputWidget):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setupUi(self)
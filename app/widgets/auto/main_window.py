@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'main_window.ui'
+##
+## Created by: Qt User Interface Compiler version 6.7.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QDate,
+    QDateTime,
+    QLocale,
+    QMetaObject,
+    QObject,
+    QPoint,
+    QRect,
+    QSize,
+    QTime,
+    QUrl,
+    Qt,
+)
+from PySide6.QtGui import (
+    QAction,
+    QBrush,
+    QColor,
+    QConicalGradient,
+    QCursor,
+    QFont,
+    QFontDatabase,
+    QGradient,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QLinearGradient,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QRadialGradient,
+    QTransform,
+)
+from PySide6.QtWidgets import (
+    QApplication,
+    QMainWindow,
+    QMenu,
+    QMenuBar,
+    QSizePolicy,
+    QStatusBar,
+    QTabWidget,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        if not MainWindow.objectName():
+            MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(800, 600)
+        self.a_connect_to_db = QAction(MainWindow)
+        self.a_connect_to_db.setObjectName("a_connect_to_db")
+        self.a_show_metrics = QAction(MainWindow)
+        self.a_show_metrics.setObjectName("a_show_metrics")
+        self.a_exit = QAction(MainWindow)
+        self.a_exit.setObjectName("a_exit")
+        self.centralwidget = QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.l_central = QVBoxLayout(self.centralwidget)
+        self.l_central.setObjectName("l_central")
+        self.l_central.setContentsMargins(0, 0, 0, 0)
+        self.w_tabs = QTabWidget(self.centralwidget)
+        self.w_tabs.setObjectName("w_tabs")
+        self.w_tabs.setDocumentMode(True)
+        self.w_tabs.setTabsClosable(True)
+        self.w_tabs.setMovable(True)
+
+        self.l_central.addWidget(self.w_tabs)
+
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menubar = QMenuBar(MainWindow)
+        self.menubar.setObjectName("menubar")
+        self.menubar.setGeometry(QRect(0, 0, 800, 22))
+        self.menuFile = QMenu(self.menubar)
+        self.menuFile.setObjectName("menuFile")
+        self.menuView = QMenu(self.menubar)
+        self.menuView.setObjectName("menuView")
+        MainWindow.setMenuBar(self.menubar)
+        self.status_bar = QStatusBar(MainWindow)
+        self.status_bar.setObjectName("status_bar")
+        MainWindow.setStatusBar(self.status_bar)
+
+        self.menubar.addAction(self.menuFile.menuAction())
+        self.menubar.addAction(self.menuView.menuAction())
+        self.menuFile.addAction(self.a_connect_to_db)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.a_exit)
+        self.menuView.addAction(self.a_show_metrics)
+
+        self.retranslateUi(MainWindow)
+
+        QMetaObject.connectSlotsByName(MainWindow)
+
+    # setupUi
+
+    def retranslateUi(self, MainWindow):
+        MainWindow.setWindowTitle(
+            QCoreApplication.translate(
+                "MainWindow", "Stora - Firestore GUI Client", None
+            )
+        )
+        self.a_connect_to_db.setText(
+            QCoreApplication.translate("MainWindow", "Connect to new database", None)
+        )
+        self.a_show_metrics.setText(
+            QCoreApplication.translate("MainWindow", "Firestore RPC metrics", None)
+        )
+        self.a_exit.setText(QCoreApplication.translate("MainWindow", "Exit", None))
+        self.menuFile.setTitle(QCoreApplication.translate("MainWindow", "File", None))
+        self.menuView.setTitle(QCoreApplication.translate("MainWindow", "View", None))
+
+    # retranslateUi
+
+
+class MainWindow(QWidget, Ui_MainWindow):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setupUi(self)
@@ -0,0 +1,21 @@
+from PySide6.QtDesigner import QPyDesignerCustomWidgetCollection
+from PySide6.QtWidgets import QWidget
+
+from add_document_item import AddDocumentItemWidget
+
+TOOLTIP = "AddDocumentItemWidget Widget"
+DOM_XML = """
+<ui language="c++">
+ <widget class="AddDocumentItemWidget" name="AddDocumentItemWidget">
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+QPyDesignerCustomWidgetCollection().registerCustomWidget(
+    AddDocumentItemWidget,
+    module="app.widgets.auto.add_document_item",
+    tool_tip=TOOLTIP,
+    xml=DOM_XML,
+)
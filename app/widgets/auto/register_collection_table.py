@@ -0,0 +1,21 @@
+from PySide6.QtDesigner import QPyDesignerCustomWidgetCollection
+from PySide6.QtWidgets import QWidget
+
+from collection_table import CollectionTableWidget
+
+TOOLTIP = "CollectionTableWidget Widget"
+DOM_XML = """
+<ui language="c++">
+ <widget class="CollectionTableWidget" name="CollectionTableWidget">
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+QPyDesignerCustomWidgetCollection().registerCustomWidget(
+    CollectionTableWidget,
+    module="app.widgets.auto.collection_table",
+    tool_tip=TOOLTIP,
+    xml=DOM_XML,
+)
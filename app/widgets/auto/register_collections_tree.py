@@ -0,0 +1,21 @@
+from PySide6.QtDesigner import QPyDesignerCustomWidgetCollection
+from PySide6.QtWidgets import QWidget
+
+from collections_tree import CollectionsTreeWidget
+
+TOOLTIP = "CollectionsTreeWidget Widget"
+DOM_XML = """
+<ui language="c++">
+ <widget class="CollectionsTreeWidget" name="CollectionsTreeWidget">
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+QPyDesignerCustomWidgetCollection().registerCustomWidget(
+    CollectionsTreeWidget,
+    module="app.widgets.auto.collections_tree",
+    tool_tip=TOOLTIP,
+    xml=DOM_XML,
+)
@@ -0,0 +1,21 @@
+from PySide6.QtDesigner import QPyDesignerCustomWidgetCollection
+from PySide6.QtWidgets import QWidget
+
+from database_view import DatabaseViewWidget
+
+TOOLTIP = "DatabaseViewWidget Widget"
+DOM_XML = """
+<ui language="c++">
+ <widget class="DatabaseViewWidget" name="DatabaseViewWidget">
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+QPyDesignerCustomWidgetCollection().registerCustomWidget(
+    DatabaseViewWidget,
+    module="app.widgets.auto.database_view",
+    tool_tip=TOOLTIP,
+    xml=DOM_XML,
+)
@@ -0,0 +1,21 @@
+from PySide6.QtDesigner import QPyDesignerCustomWidgetCollection
+from PySide6.QtWidgets import QWidget
+
+from document_value_input import DocumentValueInputWidget
+
+TOOLTIP = "DocumentValueInputWidget Widget"
+DOM_XML = """
+<ui language="c++">
+ <widget class="DocumentValueInputWidget" name="DocumentValueInputWidget">
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+QPyDesignerCustomWidgetCollection().registerCustomWidget(
+    DocumentValueInputWidget,
+    module="app.widgets.auto.document_value_input",
+    tool_tip=TOOLTIP,
+    xml=DOM_XML,
+)
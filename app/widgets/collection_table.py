@@ -1,51 +1,65 @@
-import json
 from functools import partial
-from typing import List, Optional
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from google.cloud import firestore
-from google.cloud.firestore_v1 import DocumentReference
-from PySide6.QtCore import Slot
+from google.cloud.firestore_v1 import DocumentReference, DocumentSnapshot
+from google.cloud.firestore_v1.base_query import BaseQuery
+from google.cloud.firestore_v1.watch import ChangeType, DocumentChange
+from PySide6.QtCore import QModelIndex, Slot
 from PySide6.QtGui import QKeyEvent, Qt
-from PySide6.QtWidgets import QMenu, QTableWidgetItem
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QFileDialog,
+    QMenu,
+    QMessageBox,
+    QTableWidgetItem,
+)
 
+from app.cache import CachedDocument, cache
+from app.db import (
+    commit_document_changes,
+    delete_document_paths,
+    iter_pages,
+    scan_collection,
+    stream_documents,
+    update_time_key,
+)
+from app.export import ExportProgress, export_documents, format_of
+from app.importer import (
+    Checkpoint,
+    ImportProgress,
+    checkpoint_path,
+    import_documents,
+)
+from app.models.changes import PendingChanges
+from app.models.documents import (
+    ID_KEY,
+    DocumentsProxyModel,
+    DocumentsTableModel,
+    TableItem,
+)
+from app.models.search import SearchIndex
+from app.models.stats import (
+    STATS_COLUMNS,
+    CollectionSummary,
+    copy_columns,
+    stats_row,
+    summarize_columns,
+    summarize_documents,
+)
+from app.query import QuerySpec, parse_filters
+from app.settings import conf
+from app.utils import format_bytes
 from app.widgets.auto.collection_table import (
     CollectionTableWidget as CollectionTableWidgetAuto,
 )
 from app.widgets.dialogs.add_document import AddDocumentDialog
+from app.widgets.dialogs.error import show_error
+from app.widgets.dialogs.review_changes import ReviewChangesDialog
 from app.widgets.dialogs.show_document_value import ShowDocumentValueDialog
 from app.widgets.dialogs.update_value import UpdateValueDialog
-
-
-class TableItem(QTableWidgetItem):
-    def __init__(self, db_id: str, key: str, content, *args):
-        super().__init__(*args)
-        self.db_id = db_id
-        self.key = key
-        self.content = content
-
-        self.type_ = type(self.content)
-        self.set_cell_text()
-
-    @property
-    def repr(self):
-        if self.type_ in {dict, list}:
-            return json.dumps(self.content)
-        else:
-            return str(self.content)
-
-    @property
-    def pretty_repr(self):
-        if self.type_ in {dict, list}:
-            return json.dumps(self.content, indent=2)
-        else:
-            return str(self.content)
-
-    def set_value(self, content):
-        self.content = content
-        self.set_cell_text()
-
-    def set_cell_text(self):
-        self.setText(self.repr)
+from app.workers import SnapshotListener, TaskManager
 
 
 class CollectionTableWidget(CollectionTableWidgetAuto):
@@ -60,20 +74,89 @@ class CollectionTableWidget(CollectionTableWidgetAuto):
             self.col_ref = self.client.collection(self.col_name)
         else:
             self.col_ref = None
-        self.structure = {}
+        self.query_spec = QuerySpec()
 
-        self._last_activated_item: Optional[TableItem] = None
+        self.model = DocumentsTableModel(self)
+        # sorts and filters loaded documents, indexes of the view belong to it
+        self.proxy = DocumentsProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.w_table.setModel(self.proxy)
 
+        self._last_activated_item: Optional[TableItem] = None
+        self._last_doc: Optional[DocumentSnapshot] = None
+        self._has_more_docs = False
+        self._page_size = conf.page_size
+        # documents of the page being loaded; unchanged ones are read from the
+        # model only if the page has to be cached
+        self._page_rows: List[Tuple[str, str, Optional[dict]]] = []
+        # whether the page differs from what was shown or cached before
+        self._page_changed = False
+        self._loaded_count = 0
+        self._update_times: Dict[str, str] = {}
+        # cached documents not confirmed by the server yet
+        self._stale_ids: Optional[Set[str]] = None
+        # last row of them the page being loaded reached
+        self._stale_end = -1
+        # collection and query of documents shown in the table
+        self._shown_key: Optional[Tuple[str, str, str]] = None
+
+        # edits collected while staging, by document path
+        self.changes = PendingChanges()
+
+        self.tasks = TaskManager(self)
+        # one listener per range of pages loaded while live mode is on
+        self._listeners: List[SnapshotListener] = []
+        # the last document listened to, and the amount of them
+        self._live_end: Optional[DocumentSnapshot] = None
+        self._live_count = 0
+
+        # set by the database view, loaded documents are indexed for search
+        self.search_index: Optional[SearchIndex] = None
+        self.index_tasks: Optional[TaskManager] = None
+        # a document and field to select once the document is loaded
+        self._jump_target: Optional[Tuple[str, str]] = None
+
+        self._init_ui()
         self._connect_slots()
 
+    def _init_ui(self):
+        self.b_cancel.setVisible(False)
+        self.w_stats_panel.setVisible(False)
+        header = self.w_table.horizontalHeader()
+        # the third click on a header shows documents in the loaded order again
+        header.setSortIndicatorClearable(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        self.w_table.setSortingEnabled(True)
+        self._update_review_button()
+
     def _connect_slots(self):
         self.w_table.customContextMenuRequested.connect(self.create_table_context_menu)
         self.w_table.keyPressEvent = self._on_table_item_key_press
         self.b_refresh.clicked.connect(self.refresh_documents_in_table)
         self.b_add.clicked.connect(self.create_document)
-
-        self.w_table.itemDoubleClicked.connect(self._set_last_activated_item)
-        self.w_table.itemChanged.connect(self.on_table_item_changed)
+        self.b_cancel.clicked.connect(self.cancel_loading)
+        self.b_live.toggled.connect(self.set_live_mode)
+        self.b_load_all.clicked.connect(self.load_all_documents)
+        self.b_export.clicked.connect(self.export_documents)
+        self.b_import.clicked.connect(self.import_documents)
+        self.b_review.clicked.connect(self.review_changes)
+        self.b_stats.toggled.connect(self.toggle_stats)
+        self.b_stats_loaded.clicked.connect(self.summarize_loaded_documents)
+        self.b_stats_scan.clicked.connect(self.summarize_collection)
+        self.b_apply_query.clicked.connect(self.apply_query)
+        self.b_reset_query.clicked.connect(self.reset_query)
+        self.inp_filter.textChanged.connect(self.filter_loaded_documents)
+        for signal in (
+            self.proxy.modelReset,
+            self.proxy.rowsInserted,
+            self.proxy.rowsRemoved,
+        ):
+            signal.connect(self._update_filter_label)
+        for inp in (self.inp_where, self.inp_order_by, self.inp_select):
+            inp.returnPressed.connect(self.apply_query)
+
+        self.w_table.doubleClicked.connect(self._set_last_activated_item)
+        self.w_table.verticalScrollBar().valueChanged.connect(self._on_table_scrolled)
 
     def get_db_path(self, db_id: str) -> str:
         return f"{self.col_name}/{db_id}"
@@ -81,34 +164,141 @@ class CollectionTableWidget(CollectionTableWidgetAuto):
     def get_doc_ref(self, db_id: str) -> DocumentReference:
         return self.client.document(self.get_db_path(db_id))
 
-    def _set_last_activated_item(self, item: TableItem):
+    def _set_last_activated_item(self, index: QModelIndex):
+        index = self.proxy.mapToSource(index)
+        item = self.model.item(index)
+        if item is None:
+            return
         self._last_activated_item = item
+        self.update_item(index, item)
+
+    def update_item(self, index: QModelIndex, item: TableItem):
+        staging = self.b_stage.isChecked()
+        if staging and item.key == ID_KEY:
+            return
         dialog = UpdateValueDialog(
             doc_ref=self.get_doc_ref(item.db_id),
             key=item.key,
             old_value=item.pretty_repr,
             type_=item.type_,
+            commit=not staging,
+        )
+        if not dialog.exec():
+            return
+        if staging:
+            self.stage_change(item, dialog.value)
+        else:
+            self.model.set_value(index, dialog.value)
+            self._update_times[item.db_id] = dialog.update_time
+            self._reindex_documents([item.db_id])
+
+    def stage_change(self, item: TableItem, value):
+        path = self.get_db_path(item.db_id)
+        update_time = self._update_times.get(item.db_id, "")
+        self.changes.stage(path, item.key, item.content, value, update_time)
+        row = self.model.row_of(item.db_id)
+        if row is not None:
+            self.model.set_field(row, item.key, value)
+        is_dirty = self.changes.get(path, item.key) is not None
+        self.model.set_dirty(item.db_id, item.key, is_dirty)
+        self._update_review_button()
+
+    def _apply_pending_changes(self, ids: List[str]):
+        """Show staged values again over documents which were (re)loaded"""
+        if not len(self.changes):
+            return
+        for db_id in ids:
+            fields = self.changes.fields(self.get_db_path(db_id))
+            row = self.model.row_of(db_id) if fields else None
+            if row is None:
+                continue
+            for key, change in fields.items():
+                self.model.set_field(row, key, change.new)
+                self.model.set_dirty(db_id, key)
+
+    def _update_review_button(self):
+        count = len(self.changes)
+        self.b_review.setVisible(count > 0)
+        self.b_review.setText(f"Review {count} change(s)")
+
+    @Slot()
+    def review_changes(self):
+        dialog = ReviewChangesDialog(self.changes, self)
+        accepted = dialog.exec()
+        for path, key, change in dialog.discarded:
+            self._restore_value(path, key, change.old)
+        self._update_review_button()
+        if accepted and len(self.changes):
+            self.commit_changes()
+
+    def _restore_value(self, path: str, key: str, value):
+        col_path, db_id = path.rsplit("/", 1)
+        row = self.model.row_of(db_id) if col_path == self.col_name else None
+        if row is not None:
+            self.model.set_field(row, key, value)
+            self.model.set_dirty(db_id, key, False)
+
+    def commit_changes(self):
+        """Send all staged edits in one write batch"""
+        writes = {
+            path: (
+                {key: change.new for key, change in self.changes.fields(path).items()},
+                self.changes.update_time(path),
+            )
+            for path in self.changes.paths
+        }
+        self.b_review.setDisabled(True)
+        self.show_status(f"Committing {len(self.changes)} change(s)...")
+        self.tasks.run(
+            commit_document_changes,
+            self.client,
+            writes,
+            key="commit",
+            on_result=self._on_changes_committed,
+            on_error=self._on_commit_failed,
         )
-        if dialog.exec():
-            item.set_value(dialog.value)
 
-    def on_table_item_changed(self, item: TableItem):
-        # ignore the modification
-        item.set_cell_text()
+    def _on_changes_committed(self, result: Tuple[Dict[str, str], List[str]]):
+        committed, conflicts = result
+        committed_ids = []
+        for path, update_time in committed.items():
+            col_path, db_id = path.rsplit("/", 1)
+            if col_path == self.col_name:
+                # the next edit is checked against the version written here
+                self._update_times[db_id] = update_time
+                committed_ids.append(db_id)
+            self.changes.discard(path)
+        self.model.clear_dirty(committed_ids)
+        self._reindex_documents(committed_ids)
+        self.b_review.setDisabled(False)
+        self._update_review_button()
+        self.show_status(f"Committed changes of {len(committed)} document(s)")
+        if conflicts:
+            show_error(
+                f"{len(conflicts)} document(s) were changed by someone else since "
+                "they were edited, so their changes weren't written:\n"
+                + "\n".join(conflicts[:20])
+                + ("\n..." if len(conflicts) > 20 else "")
+            )
+
+    def _on_commit_failed(self, _):
+        self.b_review.setDisabled(False)
+        self.show_status(self.loaded_status())
+        show_error("Failed to commit changes")
 
     @Slot()
     def create_document(self):
         dialog = AddDocumentDialog(
             collection=self.col_ref,
             title=f"Add document to {self.col_name}",
-            structure=self.structure,
+            structure=self.model.structure(),
         )
         dialog.exec()
         self.refresh_documents_in_table()
 
     def create_table_context_menu(self, pos):
-        db_ids = set(
-            item.db_id for item in self.w_table.selectedItems() if item is not None
+        db_ids = self.model.selected_doc_ids(
+            map(self.proxy.mapToSource, self.w_table.selectionModel().selectedIndexes())
         )
 
         menu = QMenu()
@@ -119,62 +309,683 @@ class CollectionTableWidget(CollectionTableWidgetAuto):
         menu.exec(self.w_table.viewport().mapToGlobal(pos))
 
     def delete_documents(self, doc_ids: List[str]):
-        for doc_id in doc_ids:
-            self.client.document(f"{self.col_name}/{doc_id}").delete()
-        self.refresh_documents_in_table()
+        total = len(doc_ids)
+        deleted_ids = []
+        failed_ids = []
+
+        def on_batch_committed(result: Tuple[List[str], List[str]]):
+            deleted, failed = result
+            deleted = [path.rsplit("/", 1)[-1] for path in deleted]
+            deleted_ids.extend(deleted)
+            failed_ids.extend(path.rsplit("/", 1)[-1] for path in failed)
+            self.model.remove_documents(deleted)
+            self._unindex_documents(deleted)
+            self.show_status(
+                f"Removing... {len(deleted_ids) + len(failed_ids)}/{total}"
+            )
+
+        def on_finished():
+            self.show_status(f"Removed {len(deleted_ids)} document(s)")
+            if failed_ids:
+                show_error(
+                    f"Failed to remove {len(failed_ids)} document(s):\n"
+                    + "\n".join(failed_ids[:20])
+                    + ("\n..." if len(failed_ids) > 20 else "")
+                )
+
+        self.show_status(f"Removing... 0/{total}")
+        self.tasks.run(
+            delete_document_paths,
+            self.client,
+            [self.get_db_path(doc_id) for doc_id in doc_ids],
+            on_partial=on_batch_committed,
+            on_error=lambda _: show_error("Failed to remove documents"),
+            on_finished=on_finished,
+        )
 
     def _on_table_item_key_press(self, event: QKeyEvent):
-        item: TableItem = self.w_table.currentItem()
+        index = self.proxy.mapToSource(self.w_table.currentIndex())
+        item = self.model.item(index)
+        if item is None:
+            type(self.w_table).keyPressEvent(self.w_table, event)
+            return
         # show an item preview
         if event.key() == Qt.Key_Space:
-            dialog = ShowDocumentValueDialog(key=item.key, value=item.content)
+            staging = self.b_stage.isChecked()
+            dialog = ShowDocumentValueDialog(
+                key=item.key,
+                value=item.content,
+                doc_ref=None if item.key == ID_KEY else self.get_doc_ref(item.db_id),
+                update_time=self._update_times.get(item.db_id, ""),
+                staging=staging,
+            )
             dialog.exec()
+            if dialog.changed and staging:
+                self.stage_change(item, dialog.value)
+            elif dialog.changed:
+                self._update_times[item.db_id] = dialog.update_time
+                self.refresh_documents_in_table()
         # modify the item
         elif event.key() in (Qt.Key_Enter, Qt.Key_Return, Qt.EnterKeyReturn):
-            dialog = UpdateValueDialog(
-                doc_ref=self.get_doc_ref(item.db_id),
-                key=item.key,
-                old_value=item.pretty_repr,
-                type_=item.type_,
+            self.update_item(index, item)
+        else:
+            type(self.w_table).keyPressEvent(self.w_table, event)
+
+    @Slot()
+    def apply_query(self):
+        try:
+            self.query_spec = QuerySpec.parse(
+                where=self.inp_where.text(),
+                order_by=self.inp_order_by.text(),
+                fields=self.inp_select.text(),
+                limit=self.inp_limit.value(),
+            )
+        except ValueError as e:
+            show_error(str(e))
+            return
+        self.refresh_documents_in_table()
+
+    @Slot()
+    def reset_query(self):
+        self.clear_query_inputs()
+        self.query_spec = QuerySpec()
+        self.refresh_documents_in_table()
+
+    @Slot()
+    def filter_loaded_documents(self, text: str):
+        try:
+            filters = parse_filters(text)
+        except ValueError as e:
+            self.lbl_filter.setText(str(e))
+            return
+        self.proxy.set_filters(filters)
+        self._update_filter_label()
+
+    def _update_filter_label(self):
+        if self.proxy.filters:
+            self.lbl_filter.setText(
+                f"{self.proxy.rowCount()} of {self.model.rowCount()} shown"
             )
-            if dialog.exec():
-                item.set_value(dialog.value)
-        # TODO: make sure arrows work
+        else:
+            self.lbl_filter.clear()
+
+    def clear_query_inputs(self):
+        self.inp_where.clear()
+        self.inp_order_by.clear()
+        self.inp_select.clear()
+        self.inp_limit.setValue(0)
+
+    def build_query(self) -> BaseQuery:
+        return self.query_spec.apply(self.col_ref)
 
     def refresh_documents_in_table(self, col_name: Optional[str] = None):
         if col_name:
+            if col_name != self.col_name:
+                self._jump_target = None
+                self.clear_stats()
+                self.clear_query_inputs()
+                self.query_spec = QuerySpec()
+                self.inp_filter.clear()
+                self.w_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
             self.col_name = col_name
             self.col_ref = self.client.collection(self.col_name)
 
+        self.tasks.cancel("load")
+        self.stop_live_updates()
+        self._last_doc = None
+        self._has_more_docs = True
+        self._loaded_count = 0
+        if self._shown_key == self.cache_key and self.model.rowCount():
+            # re-read the shown range and patch only documents that changed,
+            # keeping selection and scroll position
+            self._stale_ids = set(self.model.ids)
+            self.fetch_next_page(max(self.model.rowCount(), conf.page_size))
+            return
+
+        self._shown_key = self.cache_key
+        self._update_times = {}
+        self._stale_ids = None
+        self.model.clear()
+        self.show_cached_documents()
+
+    def _index_documents(self, ids: List[str], docs: List[dict]):
+        if self.search_index is None or not ids:
+            return
+        self.index_tasks.run(
+            self.search_index.add,
+            self.col_name,
+            ids,
+            docs,
+            # documents of a query selecting fields have only some of them
+            partial=bool(self.query_spec.fields),
+        )
+
+    def _reindex_documents(self, ids: List[str]):
+        rows = [(db_id, self.model.row_of(db_id)) for db_id in ids]
+        rows = [(db_id, row) for db_id, row in rows if row is not None]
+        self._index_documents(
+            [db_id for db_id, _ in rows],
+            [self.model.document(row) for _, row in rows],
+        )
+
+    def _unindex_documents(self, ids: Iterable[str]):
+        if self.search_index is not None:
+            self.index_tasks.run(self.search_index.remove, self.col_name, list(ids))
+
+    def show_document_field(self, db_id: str, path: str):
+        """Select the cell of a field, loading pages until the document is there"""
+        self._jump_target = (db_id, path)
+        if not self._jump_to_target() and not self.tasks.is_running("load"):
+            self._load_jump_target()
+
+    def _jump_to_target(self) -> bool:
+        if self._jump_target is None:
+            return False
+        db_id, path = self._jump_target
+        row = self.model.row_of(db_id)
+        if row is None:
+            return False
+        self._jump_target = None
+        headers = self.model.headers
+        key = path.split(".")[0]
+        column = headers.index(key if key in headers else ID_KEY)
+        source = self.model.index(row, column)
+        index = self.proxy.mapFromSource(source)
+        if not index.isValid():
+            # hidden by the filter of loaded documents
+            self.inp_filter.clear()
+            index = self.proxy.mapFromSource(source)
+        self.w_table.setCurrentIndex(index)
+        self.w_table.scrollTo(index, QAbstractItemView.PositionAtCenter)
+        self.w_table.setFocus()
+        return True
+
+    def _load_jump_target(self):
+        if self._jump_to_target():
+            return
+        if not self._has_more_docs:
+            db_id, _ = self._jump_target
+            self._jump_target = None
+            self.show_status(
+                f"{self.loaded_status()}, {db_id} isn't among the loaded documents"
+            )
+            return
+        # it's also called when a page is done, while its task is still running
+        self.tasks.cancel("load")
+        self.fetch_next_page()
+
+    def _on_table_scrolled(self, value: int):
+        bar = self.w_table.verticalScrollBar()
+        if value >= bar.maximum() - conf.fetch_more_threshold:
+            self.fetch_next_page()
+
+    @property
+    def cache_key(self) -> Tuple[str, str, str]:
+        return self.client.project, self.col_name, repr(self.query_spec)
+
+    def show_cached_documents(self):
+        """Show the last seen documents of the query, then re-fetch them.
+
+        The cache is read in the background like the server, under the same
+        task key, so a refresh or cancelling stops either of them.
+        """
+        if not conf.cache_enabled:
+            self.fetch_next_page()
+            return
+        self.show_status("Loading...", cancellable=True)
+        self.tasks.run(
+            cache.load,
+            *self.cache_key,
+            client=self.client,
+            key="load",
+            on_result=self._on_cache_loaded,
+            # the key is released only once the task is finished
+            on_finished=lambda: self.fetch_next_page(
+                max(len(self._stale_ids or ()), conf.page_size)
+            ),
+        )
+
+    def _on_cache_loaded(self, cached: List[CachedDocument]):
+        if not cached:
+            return
+        ids = []
         docs = []
-        headers = set()
-        for doc in self.col_ref.stream():
-            doc_dict = doc.to_dict()
-            doc_dict["id"] = doc.id
-            headers.update(set(doc_dict.keys()))
+        for doc_id, update_time, doc_dict in cached:
+            self._update_times[doc_id] = update_time
+            ids.append(doc_id)
             docs.append(doc_dict)
+        self.model.append_documents(ids, docs)
+        self._index_documents(ids, docs)
+        self._apply_pending_changes(ids)
+        self._stale_ids = set(ids)
+
+    def fetch_next_page(self, page_size: Optional[int] = None):
+        if not self._has_more_docs or self.tasks.is_running("load"):
+            return
+
+        page_size = page_size or conf.page_size
+        if self.query_spec.limit:
+            page_size = min(page_size, self.query_spec.limit - self._loaded_count)
+        query = self.build_query().limit(page_size)
+        if self._last_doc is not None:
+            query = query.start_after(self._last_doc)
+
+        self._page_size = page_size
+        self._page_rows = []
+        self._page_changed = False
+        self._stale_end = -1
+        status = "Revalidating..." if self._stale_ids is not None else "Loading..."
+        self.show_status(status, cancellable=True)
+        self.tasks.run(
+            stream_documents,
+            query,
+            key="load",
+            on_partial=self._on_documents_loaded,
+            on_result=self._on_page_loaded,
+            on_error=self._on_loading_failed,
+            # fewer, bigger chunks when a large range is re-read
+            chunk_size=max(50, page_size // 20),
+        )
 
-        headers = sorted(list(headers))
+    def _to_rows(self, docs: List[DocumentSnapshot]) -> Tuple[List[str], List[dict]]:
+        return [doc.id for doc in docs], [doc.to_dict() for doc in docs]
+
+    def _on_documents_loaded(self, chunk: List[DocumentSnapshot]):
+        self._last_doc = chunk[-1]
+
+        changed_ids = []
+        changed_docs = []
+        for snapshot in chunk:
+            db_id = snapshot.id
+            update_time = update_time_key(snapshot)
+            row = self.model.row_of(db_id)
+            if self._stale_ids is not None and db_id in self._stale_ids:
+                self._stale_ids.discard(db_id)
+                self._stale_end = max(self._stale_end, row)
+            if (
+                row is not None
+                and update_time
+                and self._update_times.get(db_id) == update_time
+            ):
+                # unchanged, so it isn't even converted to a dict
+                doc = None
+            else:
+                doc = snapshot.to_dict()
+                self._update_times[db_id] = update_time
+                changed_ids.append(db_id)
+                changed_docs.append(doc)
+            self._page_rows.append((db_id, update_time, doc))
+        self._page_changed |= bool(changed_ids)
+        self.model.upsert_documents(changed_ids, changed_docs)
+        self._index_documents(changed_ids, changed_docs)
+        self._apply_pending_changes(changed_ids)
+        self.show_status(
+            f"Loading... {self._loaded_count + len(self._page_rows)} document(s)",
+            cancellable=True,
+        )
+        self._jump_to_target()
+
+    def _on_page_loaded(self, _):
+        has_more = len(self._page_rows) == self._page_size
+        self._finish_page(has_more)
+
+    def _finish_page(self, has_more: bool):
+        start = self._loaded_count
+        page_rows = self._page_rows
+        self._loaded_count += len(page_rows)
+        if self.query_spec.limit:
+            has_more &= self._loaded_count < self.query_spec.limit
+        if self._stale_ids is not None:
+            stale = self._stale_ids
+            self._stale_ids = None
+            if has_more:
+                # documents inserted before the shown ones push the last of them
+                # to the next page, where they are checked
+                later = {i for i in stale if self._row_after(i, self._stale_end)}
+                stale -= later
+                self._stale_ids = later or None
+            # documents which weren't returned anymore were removed since last time
+            self._page_changed |= bool(stale)
+            self.model.remove_documents(stale)
+            self._unindex_documents(stale)
+
+        if self._page_changed and conf.cache_enabled:
+            self.tasks.run(
+                cache.store,
+                *self.cache_key,
+                self._documents_to_cache(page_rows),
+                start=start,
+                replace=start == 0,
+            )
+
+        self._has_more_docs = has_more
+        self.show_status(self.loaded_status())
+        if self.b_live.isChecked():
+            if start == 0:
+                self.start_live_updates()
+            else:
+                self._extend_live_updates()
+        if self._jump_target is not None:
+            self._load_jump_target()
+
+    def _row_after(self, db_id: str, row: int) -> bool:
+        own_row = self.model.row_of(db_id)
+        return own_row is not None and own_row > row
+
+    def _documents_to_cache(
+        self, page_rows: List[Tuple[str, str, Optional[dict]]]
+    ) -> List[CachedDocument]:
+        documents = []
+        for db_id, update_time, doc in page_rows:
+            if doc is None:
+                row = self.model.row_of(db_id)
+                if row is None:
+                    continue
+                doc = self.model.document(row)
+            documents.append((db_id, update_time, doc))
+        return documents
+
+    def scan_documents(self, ordered: bool = False) -> Iterator[List[DocumentSnapshot]]:
+        """Chunks of every document of the collection (or query), read in parallel"""
+        spec = self.query_spec
+        if spec.filters or spec.order_by or spec.limit:
+            # __name__ ranges can't be combined with arbitrary queries
+            return stream_documents(self.build_query(), chunk_size=200)
+        query = self.col_ref.select(spec.fields) if spec.fields else None
+        return scan_collection(self.client, self.col_name, query, ordered=ordered)
+
+    @Slot()
+    def load_all_documents(self):
+        """Read the whole collection (or query) at once, scanning it in parallel"""
+        self.tasks.cancel("load")
+        self._last_doc = None
+        self._loaded_count = 0
+        self._page_rows = []
+        self._page_changed = False
+        self._stale_ids = set(self.model.ids)
+        self.show_status("Loading all documents...", cancellable=True)
+        self.tasks.run(
+            self.scan_documents,
+            ordered=True,
+            key="load",
+            on_partial=self._on_documents_loaded,
+            on_result=lambda _: self._finish_page(has_more=False),
+            on_error=self._on_loading_failed,
+        )
+
+    @Slot()
+    def export_documents(self):
+        """Write the whole collection (or query) to a file, page by page"""
+        default_name = f"{self.col_name.replace('/', '_')}.ndjson"
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export documents",
+            default_name,
+            "NDJSON (*.ndjson *.jsonl);;CSV (*.csv)",
+        )
+        if not path:
+            return
+        if not Path(path).suffix:
+            path += ".csv" if selected_filter.startswith("CSV") else ".ndjson"
         try:
-            headers.remove("id")
-        except ValueError:
-            pass
-        else:
-            headers = list(headers) + ["id"]
+            format_ = format_of(path)
+        except ValueError as e:
+            show_error(str(e))
+            return
 
-        header_pos = {h: i for i, h in enumerate(headers)}
+        pages = iter_pages(
+            self.build_query(), conf.export_page_size, self.query_spec.limit
+        )
+        name = Path(path).name
+
+        def on_progress(progress: ExportProgress):
+            self.show_status(f"Exporting to {name}... {progress}", cancellable=True)
+
+        def on_exported(progress: ExportProgress):
+            self.show_status(f"Exported {progress} to {name}")
+
+        self.show_status(f"Exporting to {name}...", cancellable=True)
+        self.tasks.run(
+            export_documents,
+            pages,
+            path,
+            format_,
+            key="export",
+            on_partial=on_progress,
+            on_result=on_exported,
+            on_error=lambda _: self._on_export_failed(name),
+        )
 
-        self.w_table.setColumnCount(len(headers))
-        self.w_table.setRowCount(len(docs))
-        self.w_table.setHorizontalHeaderLabels(headers)
+    def _on_export_failed(self, name: str):
+        self.show_status(self.loaded_status())
+        show_error(f"Failed to export {self.col_name} to {name}")
 
-        self.structure = {}
-        for i, doc in enumerate(docs):
-            for k, v in doc.items():
-                item = TableItem(
-                    db_id=doc.get("id", doc.get("uuid", None)), key=k, content=v
+    @Slot()
+    def import_documents(self):
+        """Write documents of a file into the collection in concurrent batches"""
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            f"Import documents into {self.col_name}",
+            "",
+            "NDJSON or CSV (*.ndjson *.jsonl *.csv)",
+        )
+        if not path:
+            return
+        try:
+            format_of(path)
+        except ValueError as e:
+            show_error(str(e))
+            return
+
+        name = Path(path).name
+        checkpoint_file = checkpoint_path(path)
+        checkpoint = Checkpoint.load(checkpoint_file)
+        if checkpoint is not None and checkpoint.collection == self.col_name:
+            answer = QMessageBox.question(
+                self,
+                "Resume import",
+                f"{checkpoint.position} record(s) of {name} were already imported "
+                f"into {self.col_name}. Continue after them?",
+            )
+            if answer != QMessageBox.Yes:
+                checkpoint = None
+        else:
+            checkpoint = None
+
+        def on_progress(progress: ImportProgress):
+            self.show_status(f"Importing {name}... {progress}", cancellable=True)
+
+        def on_imported(progress: ImportProgress):
+            self.show_status(f"Imported {progress} from {name}, refresh to see them")
+            if progress.failed:
+                show_error(
+                    f"Failed to import {progress.failed} document(s) from {name}, "
+                    "importing it again continues from the first failed one"
                 )
-                self.w_table.setItem(i, header_pos[k], item)
-                self.structure[k] = type(v)
 
-        self.structure.pop("id", None)
+        self.show_status(f"Importing {name}...", cancellable=True)
+        self.tasks.run(
+            import_documents,
+            self.client,
+            self.col_name,
+            path,
+            # CSV cells are coerced to types of the loaded documents
+            structure=self.model.structure(),
+            checkpoint=checkpoint,
+            checkpoint_file=checkpoint_file,
+            key="import",
+            on_partial=on_progress,
+            on_result=on_imported,
+            on_error=lambda _: self._on_import_failed(name),
+        )
+
+    @Slot()
+    def toggle_stats(self, shown: bool):
+        self.w_stats_panel.setVisible(shown)
+        if shown and not self.w_stats.rowCount() and not self.tasks.is_running("stats"):
+            self.summarize_loaded_documents()
+
+    @Slot()
+    def summarize_loaded_documents(self):
+        """Compute statistics of fields of the table in the background"""
+        # columns are copied, so documents can be loaded meanwhile
+        size, columns = copy_columns(self.model.store)
+        self._summarize(
+            "loaded document(s)",
+            summarize_columns,
+            size,
+            columns,
+            conf.stats_batch_size,
+        )
+
+    @Slot()
+    def summarize_collection(self):
+        """Read every document of the collection (or query) to compute statistics
+        of its fields, keeping only the statistics"""
+        self._summarize(
+            f"document(s) of {self.col_name}",
+            summarize_documents,
+            self.scan_documents(),
+        )
+
+    def _summarize(self, what: str, fn, *args):
+        def on_progress(count: int):
+            self.show_status(f"Summarizing... {count} {what}", cancellable=True)
+
+        self.show_status("Summarizing...", cancellable=True)
+        self.tasks.run(
+            fn,
+            *args,
+            key="stats",
+            on_partial=on_progress,
+            on_result=lambda summary: self.show_stats(summary, what),
+            on_error=lambda _: self._on_summary_failed(),
+        )
+
+    def show_stats(self, summary: CollectionSummary, what: str):
+        self.show_status(self.loaded_status())
+        self.lbl_stats.setText(f"Statistics of {summary.documents} {what}")
+        keys = self.model.schema.ordered(summary.fields)
+        self.w_stats.clear()
+        self.w_stats.setColumnCount(len(STATS_COLUMNS))
+        self.w_stats.setHorizontalHeaderLabels(STATS_COLUMNS)
+        self.w_stats.setRowCount(len(keys))
+        for row, key in enumerate(keys):
+            for column, text in enumerate(stats_row(summary, key)):
+                item = QTableWidgetItem(text)
+                item.setToolTip(text)
+                self.w_stats.setItem(row, column, item)
+        self.w_stats.resizeColumnsToContents()
+
+    def clear_stats(self):
+        self.tasks.cancel("stats")
+        self.w_stats.clear()
+        self.w_stats.setRowCount(0)
+        self.lbl_stats.clear()
+
+    def _on_summary_failed(self):
+        self.show_status(self.loaded_status())
+        show_error(f"Failed to compute statistics of {self.col_name}")
+
+    def _on_import_failed(self, name: str):
+        self.show_status(self.loaded_status())
+        show_error(f"Failed to import {name} into {self.col_name}")
+
+    def _on_loading_failed(self, _):
+        self._has_more_docs = False
+        self.show_status("")
+        show_error(f"Failed to load documents of {self.col_name}")
+
+    @Slot()
+    def cancel_loading(self):
+        for key in ("export", "import", "stats"):
+            if self.tasks.is_running(key):
+                self.tasks.cancel(key)
+                self.show_status(f"{self.loaded_status()}, {key} cancelled")
+                return
+        self.tasks.cancel("load")
+        self._has_more_docs = False
+        self._jump_target = None
+        self.show_status(f"{self.loaded_status()}, loading cancelled")
+
+    def loaded_status(self) -> str:
+        memory = format_bytes(self.model.memory_usage())
+        return f"{self.model.rowCount()} document(s), {memory} in memory"
+
+    def show_status(self, text: str, cancellable: bool = False):
+        self.lbl_status.setText(text)
+        self.b_cancel.setVisible(cancellable)
+
+    @Slot()
+    def set_live_mode(self, enabled: bool):
+        if enabled:
+            self.start_live_updates()
+        else:
+            self.stop_live_updates()
+
+    def start_live_updates(self):
+        """Listen to changes of the loaded documents range"""
+        self.stop_live_updates()
+        self._extend_live_updates()
+
+    def _extend_live_updates(self):
+        """Listen to documents loaded after the range listened to already.
+
+        The range of a listener can't be changed and a new one delivers every
+        document of its range first, so each loaded page gets its own listener.
+        """
+        if self.col_ref is None:
+            return
+        if self._last_doc is None and self._has_more_docs:
+            # nothing is loaded yet, the first loaded page starts the listener
+            return
+        query = self.build_query()
+        if self._live_end is not None:
+            if self._live_end.id == getattr(self._last_doc, "id", None):
+                return
+            query = query.start_after(self._live_end)
+        if self._has_more_docs and self._last_doc is not None:
+            query = query.end_at(self._last_doc)
+        elif self.query_spec.limit:
+            if self._live_count >= self.query_spec.limit:
+                return
+            query = query.limit(self.query_spec.limit - self._live_count)
+        listener = SnapshotListener(query, self)
+        listener.changes.connect(self._on_live_changes)
+        self._listeners.append(listener)
+        self._live_end = self._last_doc
+        self._live_count = self._loaded_count
+
+    def stop_live_updates(self):
+        for listener in self._listeners:
+            listener.stop()
+            listener.deleteLater()
+        self._listeners = []
+        self._live_end = None
+        self._live_count = 0
+
+    def _on_live_changes(self, changes: List[DocumentChange]):
+        if self.sender() not in self._listeners:
+            return
+        removed = []
+        upserted = []
+        for change in changes:
+            doc = change.document
+            update_time = update_time_key(doc)
+            known_time = self._update_times.get(doc.id)
+            if change.type == ChangeType.REMOVED:
+                # a document moving between pages may be added by the listener
+                # of another page first, and then it has a newer update time
+                if known_time is None or known_time == update_time:
+                    removed.append(doc.id)
+            elif known_time != update_time or self.model.row_of(doc.id) is None:
+                # a new listener delivers documents which are loaded already
+                upserted.append(doc)
+        for doc in upserted:
+            self._update_times[doc.id] = update_time_key(doc)
+        self.model.remove_documents(removed)
+        self._unindex_documents(removed)
+        ids, docs = self._to_rows(upserted)
+        self.model.upsert_documents(ids, docs)
+        self._index_documents(ids, docs)
+        self._apply_pending_changes(ids)
@@ -1,32 +1,171 @@
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from google.cloud import firestore
-from google.cloud.firestore_v1 import CollectionReference
-from PySide6.QtCore import Slot
+from PySide6.QtCore import QObject, Qt, Signal, Slot
 from PySide6.QtWidgets import QTreeWidgetItem
 
+from app.db import iter_document_ids, list_collection_names, take
+from app.settings import conf
 from app.widgets.auto.collections_tree import (
     CollectionsTreeWidget as CollectionsTreeWidgetAuto,
 )
+from app.widgets.dialogs.error import show_error
+from app.workers import TaskManager
+
+KIND_ROLE = Qt.UserRole
+PATH_ROLE = Qt.UserRole + 1
+
+COLLECTION = "collection"
+DOCUMENT = "document"
+PLACEHOLDER = "placeholder"
+MORE = "more"
+
+
+class CollectionsTreeSignals(QObject):
+    collection_selected = Signal(str)
 
 
 class CollectionsTreeWidget(CollectionsTreeWidgetAuto):
+    """Collections and documents of a database, fetched when a node is expanded"""
+
     def __init__(self, *args, client: Optional[firestore.Client] = None, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.client = client
+        self.tasks = TaskManager(self)
+        self.signals = CollectionsTreeSignals()
+        # document id iterators of expanded collections, so they can be continued
+        self._doc_ids: Dict[str, Iterator[str]] = {}
 
         self._connect_slots()
 
     def _connect_slots(self):
         self.b_refresh.clicked.connect(self.refresh_collections_list)
+        self.w_tree.itemExpanded.connect(self._on_item_expanded)
+        self.w_tree.itemClicked.connect(self._on_item_clicked)
 
     @Slot()
     def refresh_collections_list(self):
+        self.tasks.cancel_all()
         self.w_tree.clear()
+        self._doc_ids.clear()
+        self.b_refresh.setDisabled(True)
+        self.tasks.run(
+            list_collection_names,
+            self.client,
+            key="collections",
+            on_result=lambda names: self._add_collections(None, "", names),
+            on_error=lambda _: show_error("Failed to load collections"),
+            on_finished=lambda: self.b_refresh.setDisabled(False),
+        )
+
+    def _create_item(
+        self, parent: Optional[QTreeWidgetItem], kind: str, text: str, path: str = ""
+    ) -> QTreeWidgetItem:
+        item = QTreeWidgetItem(parent if parent is not None else self.w_tree)
+        item.setText(0, text)
+        item.setData(0, KIND_ROLE, kind)
+        item.setData(0, PATH_ROLE, path)
+        if kind in (COLLECTION, DOCUMENT):
+            # shows the expand arrow until children are fetched
+            self._create_item(item, PLACEHOLDER, "Loading...")
+        elif kind == MORE:
+            item.setForeground(0, Qt.gray)
+        return item
+
+    def _add_collections(
+        self, parent: Optional[QTreeWidgetItem], doc_path: str, names: List[str]
+    ):
+        for name in names:
+            path = f"{doc_path}/{name}" if doc_path else name
+            self._create_item(parent, COLLECTION, name, path)
+
+    def _add_documents(self, parent: QTreeWidgetItem, result: Tuple[List[str], bool]):
+        ids, has_more = result
+        col_path = parent.data(0, PATH_ROLE)
+        for doc_id in ids:
+            self._create_item(parent, DOCUMENT, doc_id, f"{col_path}/{doc_id}")
+        if has_more:
+            self._create_item(parent, MORE, "Load more...", col_path)
+
+    def _remove_placeholders(self, parent: QTreeWidgetItem):
+        for i in reversed(range(parent.childCount())):
+            if parent.child(i).data(0, KIND_ROLE) in (PLACEHOLDER, MORE):
+                parent.takeChild(i)
 
-        for col in self.client.collections():
-            col: CollectionReference
-            item = QTreeWidgetItem(self.w_tree)
-            item.setText(0, col.id)
-            self.w_tree.addTopLevelItem(item)
+    @staticmethod
+    def _is_loaded(item: QTreeWidgetItem) -> bool:
+        return not (
+            item.childCount() == 1 and item.child(0).data(0, KIND_ROLE) == PLACEHOLDER
+        )
+
+    @Slot()
+    def _on_item_expanded(self, item: QTreeWidgetItem):
+        if self._is_loaded(item):
+            return
+        kind = item.data(0, KIND_ROLE)
+        path = item.data(0, PATH_ROLE)
+        if kind == COLLECTION:
+            self._doc_ids[path] = iter_document_ids(
+                self.client, path, conf.tree_page_size
+            )
+            self._load_more_documents(item)
+        elif kind == DOCUMENT:
+            self.tasks.run(
+                list_collection_names,
+                self.client,
+                path,
+                key=f"children:{path}",
+                on_result=lambda names: self._on_subcollections_loaded(item, names),
+                on_error=lambda _: self._on_children_failed(item),
+            )
+
+    def _load_more_documents(self, item: QTreeWidgetItem):
+        path = item.data(0, PATH_ROLE)
+        self.tasks.run(
+            take,
+            self._doc_ids[path],
+            conf.tree_page_size,
+            key=f"children:{path}",
+            on_result=lambda result: self._on_documents_loaded(item, result),
+            on_error=lambda _: self._on_children_failed(item),
+        )
+
+    def _on_documents_loaded(
+        self, item: QTreeWidgetItem, result: Tuple[List[str], bool]
+    ):
+        self._remove_placeholders(item)
+        self._add_documents(item, result)
+
+    def _on_subcollections_loaded(self, item: QTreeWidgetItem, names: List[str]):
+        self._remove_placeholders(item)
+        self._add_collections(item, item.data(0, PATH_ROLE), names)
+
+    def _on_children_failed(self, item: QTreeWidgetItem):
+        self._remove_placeholders(item)
+        path = item.data(0, PATH_ROLE)
+        if item.childCount():
+            # the failed iterator is exhausted, so a retry lists them again
+            self._doc_ids[path] = iter_document_ids(
+                self.client,
+                path,
+                conf.tree_page_size,
+                start_after=item.child(item.childCount() - 1).text(0),
+            )
+            self._create_item(item, MORE, "Load more...", path)
+        else:
+            # keep it expandable to retry later
+            self._create_item(item, PLACEHOLDER, "Loading...")
+            item.setExpanded(False)
+        show_error(f"Failed to load {path}")
+
+    @Slot()
+    def _on_item_clicked(self, item: QTreeWidgetItem, *_):
+        kind = item.data(0, KIND_ROLE)
+        if kind == COLLECTION:
+            self.signals.collection_selected.emit(item.data(0, PATH_ROLE))
+        elif kind == MORE:
+            parent = item.parent()
+            item.setText(0, "Loading...")
+            item.setData(0, KIND_ROLE, PLACEHOLDER)
+            self._load_more_documents(parent)
@@ -1,21 +1,43 @@
-from PySide6.QtCore import Qt, Slot
+from google.cloud import firestore
+from PySide6.QtCore import Qt, QThreadPool, QTimer, Slot
 from PySide6.QtWidgets import QHeaderView, QTreeWidgetItem
 
-from app.db import get_firestore_emulator_client
+from app.db import scan_all_collections
+from app.models.search import Match, SearchIndex, iter_terms
+from app.settings import conf
 from app.widgets.auto.database_view import DatabaseViewWidget as DatabaseViewWidgetAuto
+from app.widgets.dialogs.error import show_error
+from app.workers import TaskManager
+
+MATCH_ROLE = Qt.UserRole
 
 
 class DatabaseView(DatabaseViewWidgetAuto):
-    def __init__(self, db_name, *args, **kwargs):
+    def __init__(self, db_name: str, client: firestore.Client, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.table = self.w_collection_table.w_table
         self.tree = self.w_collections_tree.w_tree
 
         self.db_name = db_name
-        self.client = get_firestore_emulator_client(self.db_name)
+        # shared with other views of the database, see app.clients
+        self.client = client
         self.w_collection_table.client = self.client
         self.w_collections_tree.client = self.client
 
+        # words of every document loaded while browsing, of all collections
+        self.search_index = SearchIndex()
+        # documents are indexed off the GUI thread, one batch after another
+        index_pool = QThreadPool(self)
+        index_pool.setMaxThreadCount(1)
+        self.index_tasks = TaskManager(self, pool=index_pool)
+        self.tasks = TaskManager(self)
+        self.w_collection_table.search_index = self.search_index
+        self.w_collection_table.index_tasks = self.index_tasks
+        # searches once typing stops instead of on every key
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(conf.search_delay)
+
         self._init_ui()
         self._connect_slots()
 
@@ -27,12 +49,95 @@ class DatabaseView(DatabaseViewWidgetAuto):
 
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.w_search_results.setVisible(False)
 
     def _connect_slots(self):
-        self.tree.itemClicked.connect(self._on_collection_double_clicked)
+        self.w_collections_tree.signals.collection_selected.connect(
+            self._on_collection_selected
+        )
+        self.inp_search.textChanged.connect(lambda _: self._search_timer.start())
+        self._search_timer.timeout.connect(lambda: self.search(self.inp_search.text()))
+        self.w_search_results.itemActivated.connect(self._on_match_activated)
+        self.w_search_results.itemClicked.connect(self._on_match_activated)
+        self.b_index_all.clicked.connect(self.index_all_collections)
 
     @Slot()
-    def _on_collection_double_clicked(self, item: QTreeWidgetItem, *_):
-        col_name = item.text(0)
-        self.w_collection_table.refresh_documents_in_table(col_name)
+    def _on_collection_selected(self, col_path: str):
+        # refreshing with another collection also drops the live listener
+        self.w_collection_table.refresh_documents_in_table(col_path)
         self.w_stack.setCurrentWidget(self.page_table)
+
+    @Slot()
+    def search(self, text: str):
+        self._search_timer.stop()
+        self.w_search_results.clear()
+        text = text.strip()
+        self.w_search_results.setVisible(bool(text))
+        if not text:
+            self.lbl_search.clear()
+            return
+        matches, documents = self.search_index.search(text, conf.search_results)
+        for match in matches:
+            item = QTreeWidgetItem(
+                self.w_search_results,
+                [f"{match.collection}/{match.doc_id}", match.path],
+            )
+            item.setData(0, MATCH_ROLE, match)
+            item.setToolTip(0, item.text(0))
+        shown = "" if len(matches) < conf.search_results else ", first fields shown"
+        self.lbl_search.setText(
+            f"{documents} of {len(self.search_index)} indexed document(s){shown}"
+        )
+
+    @Slot()
+    def _on_match_activated(self, item: QTreeWidgetItem, *_):
+        self.show_match(item.data(0, MATCH_ROLE))
+
+    def show_match(self, match: Match):
+        """Open the collection of a found document and select the field"""
+        table = self.w_collection_table
+        if (
+            match.collection != table.col_name
+            or self.w_stack.currentWidget() is not self.page_table
+        ):
+            self._on_collection_selected(match.collection)
+        table.show_document_field(match.doc_id, match.path)
+
+    @Slot()
+    def index_all_collections(self):
+        """Read all root collections in the background and index their documents"""
+        self.b_index_all.setDisabled(True)
+        self.lbl_search.setText("Indexing...")
+        indexed = 0
+
+        def on_chunk(chunk):
+            nonlocal indexed
+            collection, ids, terms = chunk
+            self.index_tasks.run(self.search_index.add_terms, collection, ids, terms)
+            indexed += len(ids)
+            self.lbl_search.setText(f"Indexing... {indexed} document(s)")
+
+        def on_indexed(_):
+            self.lbl_search.setText(f"Indexed {indexed} document(s)")
+            # the pool runs one task at a time, so this one ends after the last batch
+            self.index_tasks.run(
+                lambda: None, on_finished=lambda: self.search(self.inp_search.text())
+            )
+
+        self.tasks.run(
+            iter_terms,
+            scan_all_collections(self.client),
+            key="index",
+            on_partial=on_chunk,
+            on_result=on_indexed,
+            on_error=lambda _: show_error("Failed to index collections"),
+            on_finished=lambda: self.b_index_all.setDisabled(False),
+        )
+
+    def release(self):
+        """Stop background activity before the view is thrown away"""
+        self.w_collection_table.stop_live_updates()
+        self.w_collection_table.tasks.cancel_all()
+        self.w_collections_tree.tasks.cancel_all()
+        self.tasks.cancel_all()
+        self.index_tasks.cancel_all()
@@ -1,24 +1,14 @@
 from typing import Any, Dict, List, Optional, Type
 
-from google.api_core.datetime_helpers import DatetimeWithNanoseconds
 from google.cloud.firestore_v1 import CollectionReference
-from loguru import logger
 from PySide6.QtWidgets import QDialog, QVBoxLayout
 
+from app.db import TYPE_TO_DROPDOWN_INDEX, add_document
 from app.utils import apply_theme
 from app.widgets.add_document_item import AddDocumentItemWidget
 from app.widgets.auto.dialog_add_document import Ui_Dialog
 from app.widgets.dialogs.error import show_error
-
-TYPE_TO_DROPDOWN_INDEX = {
-    str: 0,
-    bool: 1,
-    int: 2,
-    float: 2,
-    DatetimeWithNanoseconds: 3,
-    list: 4,
-    dict: 4,
-}
+from app.workers import TaskManager
 
 
 class AddDocumentDialog(QDialog, Ui_Dialog):
@@ -34,6 +24,7 @@ class AddDocumentDialog(QDialog, Ui_Dialog):
         self.setupUi(self)
         self.input_widgets: List[AddDocumentItemWidget] = [self.w_add_item_default]
         self.collection = collection
+        self.tasks = TaskManager(self)
 
         if title:
             self.setWindowTitle(title)
@@ -67,8 +58,7 @@ class AddDocumentDialog(QDialog, Ui_Dialog):
         return wgt
 
     def accept(self) -> None:
-        if self.create_document():
-            super().accept()
+        self.create_document()
 
     def create_document(self) -> bool:
         try:
@@ -81,11 +71,22 @@ class AddDocumentDialog(QDialog, Ui_Dialog):
             return False
 
         id_ = document.pop("id", None)
-        try:
-            self.collection.add(document, document_id=id_)
-        except Exception:
-            show_error("Failed to create document")
-            logger.exception("Failed to create document")
-            return False
-
+        self.b_box.setDisabled(True)
+        self.tasks.run(
+            add_document,
+            self.collection,
+            document,
+            id_,
+            key="create",
+            on_result=self._on_document_created,
+            on_error=self._on_create_failed,
+        )
         return True
+
+    def _on_document_created(self, _):
+        self.b_box.setDisabled(False)
+        super().accept()
+
+    def _on_create_failed(self, _):
+        self.b_box.setDisabled(False)
+        show_error("Failed to create document")
@@ -1,5 +1,8 @@
+from typing import Optional
+
 from PySide6.QtWidgets import QDialog
 
+from app.settings import conf
 from app.utils import apply_theme
 from app.widgets.auto.dialog_connect_to_db import Ui_Dialog
 
@@ -10,7 +13,12 @@ class ConnectToDBDialog(QDialog, Ui_Dialog):
 
         self.setupUi(self)
         apply_theme(self)
+        self.inp_emulator_host.setPlaceholderText(conf.emulator_host)
 
     @property
     def db_name(self):
         return self.inp_db_name.text()
+
+    @property
+    def emulator_host(self) -> Optional[str]:
+        return self.inp_emulator_host.text().strip() or None
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from PySide6.QtWidgets import QDialog, QFileDialog, QTableWidgetItem
+
+from app.metrics import metrics
+from app.utils import apply_theme, format_bytes
+from app.widgets.auto.dialog_metrics import Ui_Dialog
+
+COLUMNS = (
+    "operation",
+    "collection",
+    "calls",
+    "errors",
+    "docs_read",
+    "docs_written",
+    "bytes_sent",
+    "bytes_received",
+    "latency_avg_ms",
+)
+
+
+class NumericItem(QTableWidgetItem):
+    def __init__(self, value):
+        super().__init__(f"{value:.1f}" if isinstance(value, float) else str(value))
+        self.value = value
+
+    def __lt__(self, other):
+        if isinstance(other, NumericItem):
+            return self.value < other.value
+        return super().__lt__(other)
+
+
+class MetricsDialog(QDialog, Ui_Dialog):
+    def __init__(self, *args):
+        super().__init__(*args)
+
+        self.setupUi(self)
+        apply_theme(self)
+
+        self._connect_slots()
+        self.refresh()
+
+    def _connect_slots(self):
+        self.b_reset.clicked.connect(self.reset)
+        self.b_export.clicked.connect(self.export)
+
+    def refresh(self):
+        totals = metrics.totals()
+        self.lbl_totals.setText(
+            f"{totals.get('calls', 0)} RPCs, {totals.get('errors', 0)} errors, "
+            f"{totals.get('docs_read', 0)} documents read, "
+            f"{totals.get('docs_written', 0)} written, "
+            f"{format_bytes(totals.get('bytes', 0))} transferred"
+        )
+
+        rows = metrics.rows()
+        self.w_table.setSortingEnabled(False)
+        self.w_table.clear()
+        self.w_table.setColumnCount(len(COLUMNS) + 1)
+        self.w_table.setHorizontalHeaderLabels(list(COLUMNS) + ["latency histogram"])
+        self.w_table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            for j, column in enumerate(COLUMNS):
+                value = row[column]
+                item = (
+                    QTableWidgetItem(value)
+                    if isinstance(value, str)
+                    else NumericItem(value)
+                )
+                self.w_table.setItem(i, j, item)
+            histogram = ", ".join(
+                f"{bucket}: {count}"
+                for bucket, count in row["latency_histogram_ms"].items()
+                if count
+            )
+            self.w_table.setItem(i, len(COLUMNS), QTableWidgetItem(histogram))
+        self.w_table.setSortingEnabled(True)
+        self.w_table.resizeColumnsToContents()
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export metrics", "stora-metrics.json", "JSON (*.json)"
+        )
+        if path:
+            Path(path).write_text(metrics.to_json())
@@ -0,0 +1,69 @@
+from typing import List, Tuple
+
+from PySide6.QtWidgets import QDialog, QDialogButtonBox, QTableWidgetItem
+
+from app.models.changes import FieldChange, PendingChanges
+from app.models.preview import cell_preview
+from app.models.store import MISSING
+from app.settings import conf
+from app.utils import apply_theme
+from app.widgets.auto.dialog_review_changes import Ui_Dialog
+
+COLUMNS = ("document", "field", "old value", "new value")
+
+
+def _value_item(value) -> QTableWidgetItem:
+    if value is MISSING:
+        return QTableWidgetItem("")
+    item = QTableWidgetItem(cell_preview(value, conf.cell_preview_length))
+    item.setToolTip(cell_preview(value, conf.tooltip_preview_length))
+    return item
+
+
+class ReviewChangesDialog(QDialog, Ui_Dialog):
+    """Lists pending changes, accepting it means committing them"""
+
+    def __init__(self, changes: PendingChanges, *args):
+        super().__init__(*args)
+
+        self.setupUi(self)
+        apply_theme(self)
+
+        self.changes = changes
+        # changes removed from the pending ones, to restore their old values
+        self.discarded: List[Tuple[str, str, FieldChange]] = []
+        self._rows: List[Tuple[str, str, FieldChange]] = []
+
+        self.b_box.button(QDialogButtonBox.Ok).setText("Commit")
+        self._connect_slots()
+        self.refresh()
+
+    def _connect_slots(self):
+        self.b_discard.clicked.connect(self.discard_selected)
+
+    def refresh(self):
+        self._rows = list(self.changes)
+        documents = len({path for path, _, _ in self._rows})
+        self.lbl_summary.setText(
+            f"{len(self._rows)} change(s) in {documents} document(s) will be "
+            "written at once, unless someone else changed the documents since"
+        )
+        self.w_changes.clear()
+        self.w_changes.setColumnCount(len(COLUMNS))
+        self.w_changes.setHorizontalHeaderLabels(COLUMNS)
+        self.w_changes.setRowCount(len(self._rows))
+        for row, (path, key, change) in enumerate(self._rows):
+            self.w_changes.setItem(row, 0, QTableWidgetItem(path))
+            self.w_changes.setItem(row, 1, QTableWidgetItem(key))
+            self.w_changes.setItem(row, 2, _value_item(change.old))
+            self.w_changes.setItem(row, 3, _value_item(change.new))
+        self.w_changes.resizeColumnsToContents()
+        self.b_box.button(QDialogButtonBox.Ok).setEnabled(bool(self._rows))
+
+    def discard_selected(self):
+        rows = {index.row() for index in self.w_changes.selectedIndexes()}
+        for row in rows:
+            path, key, change = self._rows[row]
+            self.changes.discard(path, key)
+            self.discarded.append((path, key, change))
+        self.refresh()
@@ -1,30 +1,271 @@
-import json
+from typing import Any, Iterator, Optional
 
+from google.cloud import firestore
+from google.cloud.firestore_v1 import DocumentReference
+from google.cloud.firestore_v1.field_path import FieldPath
+from PySide6.QtCore import QModelIndex
 from PySide6.QtGui import QKeyEvent
-from PySide6.QtWidgets import QDialog
+from PySide6.QtWidgets import QApplication, QDialog, QInputDialog
 
+from app.db import update_document_value
+from app.models.documents import cell_pretty_repr
+from app.models.preview import cell_preview
+from app.models.value_tree import (
+    Path,
+    ValueTreeModel,
+    find_paths,
+    replace_at,
+    split_at_array,
+    value_at,
+)
+from app.query import parse_value
+from app.settings import conf
 from app.utils import apply_theme
 from app.widgets.auto.dialog_show_document_value import Ui_Dialog
+from app.widgets.dialogs.confirm_alter_document import ConfirmAlterDocumentDialog
+from app.widgets.dialogs.error import show_error
+from app.widgets.dialogs.update_value import UpdateValueDialog
+from app.workers import TaskManager
 
 
 class ShowDocumentValueDialog(QDialog, Ui_Dialog):
-    def __init__(self, key: str, value, *args):
+    """Browses a field of a document and, given its reference, edits parts of it.
+
+    Edits are sent as updates of the nested field path only, numbers are
+    incremented and arrays changed with server-side transforms. Each update is
+    done only if the document wasn't changed since it was read. While staging,
+    nothing is sent and the edited value of the field is kept instead.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        value,
+        *args,
+        doc_ref: Optional[DocumentReference] = None,
+        update_time: str = "",
+        staging: bool = False,
+    ):
         super().__init__(*args)
 
         self.setupUi(self)
         apply_theme(self)
 
+        self.key = key
+        self.doc_ref = doc_ref
+        # whether the document was updated (or the value staged) from the dialog
+        self.changed = False
+        # of the document when it was read, then after each update
+        self.update_time = update_time
+        self.staging = staging
+        self.tasks = TaskManager(self)
         self._value = value
+        self._matches: Optional[Iterator[Path]] = None
 
         self.setWindowTitle(key)
-        self.lbl_content.setText(self.pretty_value)
-        self.lbl_content.setFocus()
+        self._set_model(value)
+        self._init_ui()
+        self._connect_slots()
+
+    def _set_model(self, value, select: Path = ()):
+        self._value = value
+        self.model = ValueTreeModel(value, self)
+        self.w_tree.setModel(self.model)
+        self.w_tree.selectionModel().currentChanged.connect(self._on_current_changed)
+        self.w_tree.expand(self.model.index(0, 0))
+        index = self.model.index_of_path(select)
+        self.w_tree.setCurrentIndex(index)
+        self.w_tree.scrollTo(index)
+        self._on_current_changed(index)
+
+    def _init_ui(self):
+        self.w_tree.setColumnWidth(0, 200)
+        self.w_tree.setColumnWidth(1, 350)
+        self.w_tree.setFocus()
+        if not isinstance(self._value, (dict, list)):
+            # nothing to browse, the value is shown as text only
+            self.w_tree.hide()
+            self.inp_search.hide()
+            self.b_find_next.hide()
+        if self.doc_ref is None:
+            for button in self._edit_buttons:
+                button.hide()
+
+    def _connect_slots(self):
+        self.w_tree.keyPressEvent = self._on_tree_key_press
+        self.inp_search.textChanged.connect(self._reset_search)
+        self.inp_search.returnPressed.connect(self.find_next)
+        self.b_find_next.clicked.connect(self.find_next)
+        self.b_copy.clicked.connect(self.copy_json)
+        self.b_edit.clicked.connect(self.edit_value)
+        self.b_increment.clicked.connect(self.increment_value)
+        self.b_array_add.clicked.connect(self.add_to_array)
+        self.b_array_remove.clicked.connect(self.remove_from_array)
 
     @property
-    def pretty_value(self) -> str:
-        if isinstance(self._value, (list, dict)):
-            return json.dumps(self._value, indent=2)
-        return str(self._value)
+    def _edit_buttons(self):
+        return self.b_edit, self.b_increment, self.b_array_add, self.b_array_remove
+
+    def _on_current_changed(self, index: QModelIndex):
+        value = self.model.value(index)
+        if isinstance(value, (dict, list)):
+            # the whole value can be huge, the copy button gives all of it
+            text = cell_preview(value, conf.tooltip_preview_length)
+        else:
+            text = str(value)
+        self.inp_detail.setPlainText(text)
+        self._update_edit_buttons(index)
+
+    def _update_edit_buttons(self, index: QModelIndex):
+        path = self.model.path_of(index)
+        if self.doc_ref is None or path is None:
+            for button in self._edit_buttons:
+                button.setEnabled(False)
+            return
+        value = self.model.value(index)
+        _, rest = split_at_array(self._value, path)
+        self.b_edit.setEnabled(True)
+        # transforms work on fields, not on elements of arrays
+        self.b_increment.setEnabled(not rest and type(value) in (int, float))
+        self.b_array_add.setEnabled(not rest and isinstance(value, list))
+        self.b_array_remove.setEnabled(len(rest) == 1)
+
+    def _current_path(self) -> Path:
+        return self.model.path_of(self.w_tree.currentIndex()) or ()
+
+    def _field_path(self, path: Path) -> str:
+        return FieldPath(self.key, *path).to_api_repr()
+
+    def _name(self, path: Path) -> str:
+        return ".".join(map(str, (self.key, *path)))
+
+    def edit_value(self):
+        path = self._current_path()
+        old = value_at(self._value, path)
+        dialog = UpdateValueDialog(
+            key=self._name(path),
+            old_value=cell_pretty_repr(old),
+            type_=type(old),
+            commit=False,
+        )
+        if not dialog.exec():
+            return
+        new_value = replace_at(self._value, path, dialog.value)
+        confirm = ConfirmAlterDocumentDialog(old=str(old), new=str(dialog.value))
+        if not confirm.exec():
+            return
+        # an element of an array is written as the whole outermost array
+        field, _ = split_at_array(self._value, path)
+        self._update(field, value_at(new_value, field), new_value, path)
+
+    def increment_value(self):
+        path = self._current_path()
+        old = value_at(self._value, path)
+        label = f"Add to {self._name(path)}:"
+        if isinstance(old, int):
+            amount, ok = QInputDialog.getInt(self, "Increment", label, 1)
+        else:
+            amount, ok = QInputDialog.getDouble(
+                self, "Increment", label, 1.0, -1e15, 1e15, 6
+            )
+        if ok and amount:
+            new_value = replace_at(self._value, path, old + amount)
+            self._update(path, firestore.Increment(amount), new_value, path)
+
+    def add_to_array(self):
+        path = self._current_path()
+        text, ok = QInputDialog.getText(
+            self, "Add to array", "Element, parsed as JSON if possible:"
+        )
+        if not ok:
+            return
+        element = parse_value(text)
+        array = value_at(self._value, path)
+        if element not in array:
+            array = array + [element]
+        new_value = replace_at(self._value, path, array)
+        self._update(path, firestore.ArrayUnion([element]), new_value, path)
+
+    def remove_from_array(self):
+        path = self._current_path()
+        element = value_at(self._value, path)
+        array_path = path[:-1]
+        array = [e for e in value_at(self._value, array_path) if e != element]
+        new_value = replace_at(self._value, array_path, array)
+        self._update(
+            array_path, firestore.ArrayRemove([element]), new_value, array_path
+        )
+
+    @property
+    def value(self):
+        """The value of the field with all edits"""
+        return self._value
+
+    def _update(self, field: Path, update: Any, new_value: Any, select: Path):
+        """Send an update of a single field path and show the expected result"""
+        if self.staging:
+            # the whole field is staged, transforms are applied here already
+            self._on_updated(self.update_time, new_value, select)
+            return
+        # the selection stays until the result is shown
+        self.w_tree.setEnabled(False)
+        for button in self._edit_buttons:
+            button.setEnabled(False)
+        self.lbl_status.setText(f"Updating {self._name(field)}...")
+        self.tasks.run(
+            update_document_value,
+            self.doc_ref,
+            self._field_path(field),
+            update,
+            update_time=self.update_time,
+            key="update",
+            on_result=lambda update_time: self._on_updated(
+                update_time, new_value, select
+            ),
+            on_error=lambda _: self._on_updated(None, new_value, select),
+        )
+
+    def _on_updated(self, update_time: Optional[str], new_value: Any, select: Path):
+        self.w_tree.setEnabled(True)
+        if update_time is None:
+            self.lbl_status.setText("")
+            self._update_edit_buttons(self.w_tree.currentIndex())
+            show_error("Failed to update document!")
+            return
+        self.changed = True
+        self.update_time = update_time
+        self.lbl_status.setText("Staged" if self.staging else "Updated")
+        self._set_model(new_value, select)
+
+    def _reset_search(self):
+        self._matches = None
+        self.lbl_status.clear()
+
+    def find_next(self):
+        text = self.inp_search.text()
+        if not text:
+            return
+        if self._matches is None:
+            self._matches = find_paths(self._value, text)
+        path = next(self._matches, None)
+        if path is None:
+            self._matches = None
+            self.lbl_status.setText(f"No more matches of {text!r}")
+            return
+        index = self.model.index_of_path(path)
+        self.w_tree.setCurrentIndex(index)
+        self.w_tree.scrollTo(index)
+        self.lbl_status.setText(".".join(map(str, path)))
+
+    def copy_json(self):
+        value = self.model.value(self.w_tree.currentIndex())
+        QApplication.clipboard().setText(cell_pretty_repr(value))
+
+    def _on_tree_key_press(self, event: QKeyEvent):
+        if event.text() == " ":
+            self.accept()
+        else:
+            type(self.w_tree).keyPressEvent(self.w_tree, event)
 
     def keyPressEvent(self, event: QKeyEvent) -> None:
         if event.text() == " ":
@@ -3,11 +3,14 @@ from typing import Optional
 import dateutil.parser
 from google.api_core.datetime_helpers import DatetimeWithNanoseconds
 from google.cloud.firestore_v1 import DocumentReference
+from google.cloud.firestore_v1.field_path import FieldPath
 from PySide6.QtWidgets import QDialog
 
 from app.db import update_document_value
 from app.widgets.auto.dialog_update_value import Ui_Dialog
 from app.widgets.dialogs.confirm_alter_document import ConfirmAlterDocumentDialog
+from app.widgets.dialogs.error import show_error
+from app.workers import TaskManager
 
 
 class UpdateValueDialog(QDialog, Ui_Dialog):
@@ -18,6 +21,7 @@ class UpdateValueDialog(QDialog, Ui_Dialog):
         key: str = "",
         old_value=None,
         type_=None,
+        commit: bool = True,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
@@ -26,9 +30,16 @@ class UpdateValueDialog(QDialog, Ui_Dialog):
         self.doc_ref = doc_ref
         self.old_value = old_value
         self.key = key
+        # where the value is written, the key is a field name and not a path
+        self.field_path = FieldPath(key).to_api_repr()
         self.type_ = type_
+        # otherwise the value is only validated, to be committed later
+        self.commit = commit
+        # of the document, once the value is committed
+        self.update_time: Optional[str] = None
 
         self.w_inp = self.w_value_input
+        self.tasks = TaskManager(self)
         self._init_layout()
         self._connect_slots()
 
@@ -61,15 +72,38 @@ class UpdateValueDialog(QDialog, Ui_Dialog):
         self.buttonBox.button(self.buttonBox.Ok).setDisabled(has_error)
 
     def accept(self) -> None:
+        if not self.commit:
+            super().accept()
+            return
         dlg = ConfirmAlterDocumentDialog(
             old=str(self.old_value), new=str(self.w_inp.value)
         )
         if dlg.exec():
-            if self.update_document():
-                super().accept()
+            self.update_document()
 
-    def update_document(self) -> bool:
-        return update_document_value(self.doc_ref, key=self.key, value=self.w_inp.value)
+    def update_document(self):
+        self.buttonBox.setDisabled(True)
+        self.tasks.run(
+            update_document_value,
+            self.doc_ref,
+            self.field_path,
+            self.w_inp.value,
+            key="update",
+            on_result=self._on_document_updated,
+            on_error=self._on_update_failed,
+        )
+
+    def _on_document_updated(self, update_time: Optional[str]):
+        self.buttonBox.setDisabled(False)
+        if update_time is not None:
+            self.update_time = update_time
+            super().accept()
+        else:
+            show_error("Failed to update document!")
+
+    def _on_update_failed(self, _):
+        self.buttonBox.setDisabled(False)
+        show_error("Failed to update document!")
 
     @property
     def value(self):
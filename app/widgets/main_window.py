@@ -1,9 +1,16 @@
-from PySide6.QtCore import QSize
-from PySide6.QtWidgets import QApplication, QMainWindow
+from typing import Optional
 
+from PySide6.QtCore import QSize, QTimer
+from PySide6.QtGui import QCloseEvent
+from PySide6.QtWidgets import QApplication, QLabel, QMainWindow
+
+from app.metrics import metrics
+from app.settings import conf
+from app.startup import startup
+from app.utils import format_bytes
 from app.widgets.auto.main_window import Ui_MainWindow
-from app.widgets.database_view import DatabaseView
 from app.widgets.dialogs.connect_to_db import ConnectToDBDialog
+from app.widgets.dialogs.metrics import MetricsDialog
 
 
 class MainWindow(QMainWindow, Ui_MainWindow):
@@ -11,30 +18,94 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         super().__init__(*args, **kwargs)
         self.setupUi(self)
 
-        self.db_view = DatabaseView("please-select-a-db-first")
-        self.setCentralWidget(self.db_view)
+        # databases are opened in tabs, Firestore modules are loaded with the
+        # first one; the registry of clients comes with them
+        self.clients = None
 
         self._init_ui()
         self._connect_slots()
 
     def _init_ui(self):
-        if self.db_view.db_name == "please-select-a-db-first":
-            if not self.connect_to_new_database():
-                QApplication.quit()
+        self.lbl_metrics = QLabel()
+        self.status_bar.addPermanentWidget(self.lbl_metrics)
+        self._metrics_timer = QTimer(self)
+        self._metrics_timer.timeout.connect(self.update_metrics_summary)
+        self._metrics_timer.start(conf.metrics_refresh_interval)
+
         self.resize_to_almost_full_screen()
+        # asks for a database only when the window is already shown
+        QTimer.singleShot(0, self._connect_on_start)
+
+    def _connect_on_start(self):
+        startup.mark("window shown")
+        if not self.connect_to_new_database():
+            QApplication.quit()
 
     def resize_to_almost_full_screen(self):
         size = QSize(QApplication.primaryScreen().size())
         self.setGeometry(100, 100, size.width() - 200, size.height() - 200)
 
-    def connect_to_new_database(self):
+    def connect_to_new_database(self) -> bool:
         dialog = ConnectToDBDialog()
-        dialog.exec()
-        if not dialog.db_name:
+        accepted = dialog.exec()
+        startup.mark("choosing a database")
+        if not accepted or not dialog.db_name:
             return False
-        self.db_view = DatabaseView(dialog.db_name)
-        self.setCentralWidget(self.db_view)
+        self.open_database(dialog.db_name, dialog.emulator_host)
+        startup.mark("database view")
+        startup.report()
         return True
 
+    def open_database(self, project: str, emulator_host: Optional[str] = None):
+        """Show a tab of the database, switching to it if it's open already"""
+        from app.clients import clients
+        from app.widgets.database_view import DatabaseView
+
+        startup.mark("database modules")
+        self.clients = clients
+        key = clients.key(project, emulator_host)
+        tabs = self.w_tabs.tabBar()
+        for index in range(tabs.count()):
+            if tabs.tabData(index) == key:
+                self.w_tabs.setCurrentIndex(index)
+                return
+
+        view = DatabaseView(project, clients.acquire(*key))
+        project, host = key
+        title = project if host == conf.emulator_host else f"{project} @ {host}"
+        index = self.w_tabs.addTab(view, title)
+        tabs.setTabData(index, key)
+        self.w_tabs.setTabToolTip(index, f"{project} at {host}")
+        self.w_tabs.setCurrentIndex(index)
+
+    def close_database(self, index: int):
+        view = self.w_tabs.widget(index)
+        self.w_tabs.removeTab(index)
+        view.release()
+        self.clients.release(view.client)
+        view.deleteLater()
+
+    def closeEvent(self, event: QCloseEvent):
+        while self.w_tabs.count():
+            self.close_database(0)
+        if self.clients is not None:
+            self.clients.close_all()
+        super().closeEvent(event)
+
+    def update_metrics_summary(self):
+        totals = metrics.totals()
+        self.lbl_metrics.setText(
+            f"RPCs: {totals.get('calls', 0)} | "
+            f"reads: {totals.get('docs_read', 0)} | "
+            f"writes: {totals.get('docs_written', 0)} | "
+            f"{format_bytes(totals.get('bytes', 0))}"
+        )
+
+    def show_metrics(self):
+        dialog = MetricsDialog(self)
+        dialog.exec()
+
     def _connect_slots(self):
         self.a_connect_to_db.triggered.connect(self.connect_to_new_database)
+        self.a_show_metrics.triggered.connect(self.show_metrics)
+        self.w_tabs.tabCloseRequested.connect(self.close_database)
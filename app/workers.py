@@ -0,0 +1,152 @@
+import inspect
+from typing import Callable, Dict, Optional
+
+from loguru import logger
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class WorkerSignals(QObject):
+    partial = Signal(object)
+    result = Signal(object)
+    error = Signal(object)
+    finished = Signal()
+
+
+class Worker(QRunnable):
+    """Runs a callable in a thread pool.
+
+    If the callable returns a generator, every yielded item is sent through the
+    ``partial`` signal as soon as it's ready, and the cancellation flag is
+    checked between items. The return value (or ``StopIteration.value``) is sent
+    through ``result``.
+    """
+
+    def __init__(self, fn: Callable, *args, **kwargs):
+        super().__init__()
+        # the manager holds a reference until the worker is finished
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+            if inspect.isgenerator(result):
+                result = self._consume(result)
+        except Exception as e:
+            if not self.cancelled:
+                logger.exception("Background task {fn} failed", fn=self.fn)
+                self.signals.error.emit(e)
+        else:
+            if not self.cancelled:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+    def _consume(self, generator):
+        while not self.cancelled:
+            try:
+                item = next(generator)
+            except StopIteration as e:
+                return e.value
+            if not self.cancelled:
+                self.signals.partial.emit(item)
+        generator.close()
+
+
+class TaskManager(QObject):
+    """Starts workers on the global thread pool and keeps them alive until done.
+
+    A task started with a key supersedes the running task with the same key:
+    the old one is cancelled and its pending signals are ignored.
+    """
+
+    def __init__(self, *args, pool: Optional[QThreadPool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._workers: Dict[int, Worker] = {}
+        self._keyed: Dict[str, Worker] = {}
+
+    def run(
+        self,
+        fn: Callable,
+        *args,
+        key: Optional[str] = None,
+        on_partial: Optional[Callable] = None,
+        on_result: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+        on_finished: Optional[Callable] = None,
+        **kwargs,
+    ) -> Worker:
+        if key is not None:
+            self.cancel(key)
+
+        worker = Worker(fn, *args, **kwargs)
+        signals = worker.signals
+
+        def guarded(callback):
+            def wrapper(*a):
+                if not worker.cancelled:
+                    callback(*a)
+
+            return wrapper
+
+        if on_partial:
+            signals.partial.connect(guarded(on_partial))
+        if on_result:
+            signals.result.connect(guarded(on_result))
+        if on_error:
+            signals.error.connect(guarded(on_error))
+        signals.finished.connect(lambda: self._on_worker_finished(worker, key))
+        if on_finished:
+            signals.finished.connect(guarded(on_finished))
+
+        self._workers[id(worker)] = worker
+        if key is not None:
+            self._keyed[key] = worker
+        self.pool.start(worker)
+        return worker
+
+    def cancel(self, key: str):
+        worker = self._keyed.pop(key, None)
+        if worker is not None:
+            worker.cancel()
+
+    def cancel_all(self):
+        for worker in self._workers.values():
+            worker.cancel()
+        self._keyed.clear()
+
+    def is_running(self, key: str) -> bool:
+        return key in self._keyed
+
+    def _on_worker_finished(self, worker: Worker, key: Optional[str]):
+        self._workers.pop(id(worker), None)
+        if key is not None and self._keyed.get(key) is worker:
+            del self._keyed[key]
+
+
+class SnapshotListener(QObject):
+    """Delivers Firestore ``on_snapshot`` document changes to the GUI thread"""
+
+    changes = Signal(object)
+
+    def __init__(self, query, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._watch = query.on_snapshot(self._on_snapshot)
+
+    def _on_snapshot(self, docs, changes, read_time):
+        # called from a Firestore background thread
+        if changes:
+            self.changes.emit(changes)
+
+    def stop(self):
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
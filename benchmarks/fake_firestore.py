@@ -0,0 +1,508 @@
+"""An in-process stand-in for ``firestore.Client`` with synthetic data.
+
+Only the part of the client API used by Stora is implemented. Queries return
+real ``DocumentSnapshot`` objects, so converting them costs the same as with
+the real client; an optional latency is added to every RPC.
+"""
+
+import bisect
+import datetime
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+from google.cloud import firestore
+from google.cloud.firestore_v1 import DocumentSnapshot, GeoPoint
+from google.cloud.firestore_v1.types import WriteResult
+
+from app.db import AUTO_ID_ALPHABET
+
+_OPERATORS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "in": lambda a, b: a in b,
+    "not-in": lambda a, b: a not in b,
+    "array-contains": lambda a, b: isinstance(a, list) and b in a,
+    "array-contains-any": lambda a, b: isinstance(a, list) and any(x in a for x in b),
+}
+_MISSING = object()
+
+
+class FakeStore:
+    """Documents of every collection, kept sorted by id"""
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency_ms = latency_ms
+        self.lock = threading.RLock()
+        self.collections: Dict[str, Dict[str, dict]] = {}
+        self.ids: Dict[str, List[str]] = {}
+        self.update_times: Dict[str, DatetimeWithNanoseconds] = {}
+        self.rpc_count = 0
+
+    def rpc(self):
+        with self.lock:
+            self.rpc_count += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def set(self, col_path: str, doc_id: str, data: dict):
+        with self.lock:
+            docs = self.collections.setdefault(col_path, {})
+            ids = self.ids.setdefault(col_path, [])
+            if doc_id not in docs:
+                bisect.insort(ids, doc_id)
+            docs[doc_id] = data
+            self.update_times[f"{col_path}/{doc_id}"] = DatetimeWithNanoseconds.now(
+                datetime.timezone.utc
+            )
+
+    def delete(self, col_path: str, doc_id: str):
+        with self.lock:
+            docs = self.collections.get(col_path, {})
+            if docs.pop(doc_id, None) is not None:
+                ids = self.ids[col_path]
+                del ids[bisect.bisect_left(ids, doc_id)]
+            self.update_times.pop(f"{col_path}/{doc_id}", None)
+
+    def child_collections(self, parent: str = "") -> List[str]:
+        prefix = f"{parent}/" if parent else ""
+        with self.lock:
+            return sorted(
+                {
+                    path[len(prefix) :].split("/", 1)[0]
+                    for path, docs in self.collections.items()
+                    if docs and path.startswith(prefix)
+                }
+            )
+
+
+def _get_field(data: dict, field_path: str):
+    value = data
+    for part in field_path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+class FakeDocumentReference:
+    def __init__(self, client: "FakeClient", path: str):
+        self._client = client
+        self.path = path
+        self._collection_path, _, self.id = path.rpartition("/")
+
+    @property
+    def _path(self):
+        return tuple(self.path.split("/"))
+
+    def collections(self) -> List["FakeCollectionReference"]:
+        self._client.store.rpc()
+        return [
+            self._client.collection(f"{self.path}/{name}")
+            for name in self._client.store.child_collections(self.path)
+        ]
+
+    def get(self) -> DocumentSnapshot:
+        self._client.store.rpc()
+        return self._client.snapshot(self._collection_path, self.id)
+
+    def set(self, data: dict):
+        self._client.store.rpc()
+        self._client.store.set(self._collection_path, self.id, dict(data))
+
+    def update(self, data: dict, option=None) -> WriteResult:
+        # preconditions aren't checked
+        self._client.store.rpc()
+        store = self._client.store
+        with store.lock:
+            current = store.collections.get(self._collection_path, {}).get(self.id)
+            if current is None:
+                raise KeyError(self.path)
+            store.set(self._collection_path, self.id, {**current, **data})
+            return WriteResult(update_time=store.update_times[self.path])
+
+    def delete(self):
+        self._client.store.rpc()
+        self._client.store.delete(self._collection_path, self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, FakeDocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+
+class FakeWatch:
+    def unsubscribe(self):
+        pass
+
+
+class FakeQuery:
+    def __init__(
+        self,
+        client: "FakeClient",
+        col_path: str,
+        filters=(),
+        orders=(),
+        limit: Optional[int] = None,
+        start_after=None,
+        end_at=None,
+        fields: Optional[List[str]] = None,
+    ):
+        self._client = client
+        self._col_path = col_path
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._limit = limit
+        self._start_after = start_after
+        self._end_at = end_at
+        self._fields = fields
+
+    def _copy(self, **kwargs) -> "FakeQuery":
+        params = dict(
+            filters=self._filters,
+            orders=self._orders,
+            limit=self._limit,
+            start_after=self._start_after,
+            end_at=self._end_at,
+            fields=self._fields,
+        )
+        params.update(kwargs)
+        return FakeQuery(self._client, self._col_path, **params)
+
+    def where(self, field_path: str, op_string: str, value) -> "FakeQuery":
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path: str, direction: str = "ASCENDING") -> "FakeQuery":
+        descending = direction == firestore.Query.DESCENDING
+        return self._copy(orders=self._orders + ((field_path, descending),))
+
+    def limit(self, count: int) -> "FakeQuery":
+        return self._copy(limit=count)
+
+    def start_after(self, snapshot: DocumentSnapshot) -> "FakeQuery":
+        return self._copy(start_after=snapshot)
+
+    def end_at(self, snapshot: DocumentSnapshot) -> "FakeQuery":
+        return self._copy(end_at=snapshot)
+
+    def select(self, field_paths: List[str]) -> "FakeQuery":
+        return self._copy(fields=list(field_paths))
+
+    def on_snapshot(self, callback) -> FakeWatch:
+        return FakeWatch()
+
+    def _matches(self, doc_id: str, data: dict) -> bool:
+        for field_path, op, value in self._filters:
+            if field_path == "__name__":
+                actual = f"{self._col_path}/{doc_id}"
+                value = value.path if hasattr(value, "path") else value
+            else:
+                actual = _get_field(data, field_path)
+                if actual is _MISSING:
+                    return False
+            try:
+                if not _OPERATORS[op](actual, value):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+    def _ordered_ids(self, ids: List[str], docs: Dict[str, dict]) -> List[str]:
+        orders = [o for o in self._orders if o[0] != "__name__"]
+        if not orders:
+            return ids
+        # stable sorts from the last order to the first one
+        result = list(ids)
+        for field_path, descending in reversed(orders):
+            result.sort(
+                key=lambda i: (
+                    repr(type(_get_field(docs[i], field_path))),
+                    _get_field(docs[i], field_path),
+                ),
+                reverse=descending,
+            )
+        return result
+
+    def stream(self) -> Iterator[DocumentSnapshot]:
+        store = self._client.store
+        store.rpc()
+        with store.lock:
+            docs = dict(store.collections.get(self._col_path, {}))
+            ids = list(store.ids.get(self._col_path, []))
+        ids = self._ordered_ids(ids, docs)
+
+        start, end = 0, len(ids)
+        if not [o for o in self._orders if o[0] != "__name__"]:
+            # ids are sorted, so ranges on __name__ are found with a binary search
+            for field_path, op, value in self._filters:
+                if field_path == "__name__" and op == ">=":
+                    start = max(start, bisect.bisect_left(ids, value.id))
+                elif field_path == "__name__" and op == "<":
+                    end = min(end, bisect.bisect_left(ids, value.id))
+            if self._start_after is not None:
+                start = max(start, bisect.bisect_right(ids, self._start_after.id))
+        elif self._start_after is not None:
+            start = next(
+                (i + 1 for i, d in enumerate(ids) if d == self._start_after.id),
+                len(ids),
+            )
+        ids = ids[start:end]
+        if ("__name__", True) in self._orders:
+            ids.reverse()
+        count = 0
+        for doc_id in ids:
+            data = docs[doc_id]
+            if not self._matches(doc_id, data):
+                continue
+            if self._limit is not None and count >= self._limit:
+                return
+            count += 1
+            yield self._client.snapshot(self._col_path, doc_id, self._fields)
+            if self._end_at is not None and doc_id == self._end_at.id:
+                return
+
+    def get(self) -> List[DocumentSnapshot]:
+        return list(self.stream())
+
+
+class FakeCollectionReference(FakeQuery):
+    def __init__(self, client: "FakeClient", path: str):
+        super().__init__(client, path)
+        self.id = path.rsplit("/", 1)[-1]
+
+    @property
+    def _path(self):
+        return tuple(self._col_path.split("/"))
+
+    def document(self, document_id: Optional[str] = None) -> FakeDocumentReference:
+        document_id = document_id or random_id(random.Random())
+        return FakeDocumentReference(self._client, f"{self._col_path}/{document_id}")
+
+    def add(self, data: dict, document_id: Optional[str] = None):
+        doc_ref = self.document(document_id)
+        doc_ref.set(data)
+        return DatetimeWithNanoseconds.now(datetime.timezone.utc), doc_ref
+
+    def list_documents(self, page_size: Optional[int] = None):
+        store = self._client.store
+        store.rpc()
+        with store.lock:
+            ids = list(store.ids.get(self._col_path, []))
+        for i, doc_id in enumerate(ids):
+            if page_size and i and i % page_size == 0:
+                store.rpc()
+            yield self.document(doc_id)
+
+
+class FakeCollectionGroup:
+    """Documents of every collection with the same id, ordered by their paths"""
+
+    def __init__(
+        self,
+        client: "FakeClient",
+        collection_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ):
+        self._client = client
+        self._collection_id = collection_id
+        self._start = start
+        self._end = end
+
+    def _paths(self) -> List[str]:
+        store = self._client.store
+        with store.lock:
+            return sorted(
+                f"{col_path}/{doc_id}"
+                for col_path, ids in store.ids.items()
+                if col_path.rsplit("/", 1)[-1] == self._collection_id
+                for doc_id in ids
+            )
+
+    def stream(self) -> Iterator[DocumentSnapshot]:
+        self._client.store.rpc()
+        for path in self._paths():
+            if self._start is not None and path < self._start:
+                continue
+            if self._end is not None and path >= self._end:
+                return
+            col_path, _, doc_id = path.rpartition("/")
+            yield self._client.snapshot(col_path, doc_id)
+
+    def get(self) -> List[DocumentSnapshot]:
+        return list(self.stream())
+
+    def get_partitions(self, partition_count: int) -> Iterator["FakePartition"]:
+        self._client.store.rpc()
+        paths = self._paths()
+        step = max(1, len(paths) // partition_count)
+        cuts = paths[step::step][: partition_count - 1]
+        for start, end in zip([None] + cuts, cuts + [None]):
+            yield FakePartition(self._client, self._collection_id, start, end)
+
+
+class FakePartition:
+    def __init__(self, client: "FakeClient", collection_id: str, start, end):
+        self._args = client, collection_id, start, end
+
+    def query(self) -> FakeCollectionGroup:
+        return FakeCollectionGroup(*self._args)
+
+
+class FakeWriteBatch:
+    def __init__(self, client: "FakeClient"):
+        self._client = client
+        self._writes = []
+
+    def set(self, reference: FakeDocumentReference, data: dict):
+        self._writes.append(("set", reference, data))
+
+    def update(self, reference: FakeDocumentReference, data: dict, option=None):
+        # preconditions aren't checked
+        self._writes.append(("update", reference, data))
+
+    def delete(self, reference: FakeDocumentReference):
+        self._writes.append(("delete", reference, None))
+
+    def commit(self) -> List[WriteResult]:
+        store = self._client.store
+        store.rpc()
+        results = []
+        with store.lock:
+            for kind, ref, data in self._writes:
+                col_path, _, doc_id = ref.path.rpartition("/")
+                if kind == "delete":
+                    store.delete(col_path, doc_id)
+                elif kind == "set":
+                    store.set(col_path, doc_id, dict(data))
+                else:
+                    current = store.collections.get(col_path, {}).get(doc_id, {})
+                    store.set(col_path, doc_id, {**current, **data})
+                results.append(
+                    WriteResult(update_time=store.update_times.get(ref.path))
+                )
+        self._writes = []
+        return results
+
+
+class FakeClient:
+    """Implements the subset of ``firestore.Client`` used by Stora"""
+
+    def __init__(self, store: Optional[FakeStore] = None, project: str = "bench"):
+        self.store = store or FakeStore()
+        self.project = project
+
+    def collection(self, path: str) -> FakeCollectionReference:
+        return FakeCollectionReference(self, path)
+
+    def document(self, path: str) -> FakeDocumentReference:
+        return FakeDocumentReference(self, path)
+
+    def collection_group(self, collection_id: str) -> FakeCollectionGroup:
+        return FakeCollectionGroup(self, collection_id)
+
+    def collections(self) -> List[FakeCollectionReference]:
+        self.store.rpc()
+        return [self.collection(name) for name in self.store.child_collections()]
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def get_all(self, references: List[FakeDocumentReference]):
+        self.store.rpc()
+        for ref in references:
+            yield self.snapshot(ref._collection_path, ref.id)
+
+    def write_option(self, **kwargs):
+        return kwargs
+
+    def snapshot(
+        self, col_path: str, doc_id: str, fields: Optional[List[str]] = None
+    ) -> DocumentSnapshot:
+        path = f"{col_path}/{doc_id}"
+        data = self.store.collections.get(col_path, {}).get(doc_id)
+        if data is not None and fields is not None:
+            data = {f: data[f] for f in fields if f in data}
+        update_time = self.store.update_times.get(path)
+        return DocumentSnapshot(
+            self.document(path),
+            data,
+            exists=data is not None,
+            read_time=update_time,
+            create_time=update_time,
+            update_time=update_time,
+        )
+
+
+def random_id(rnd: random.Random) -> str:
+    return "".join(rnd.choice(AUTO_ID_ALPHABET) for _ in range(20))
+
+
+def _value(rnd: random.Random, kind: int, depth: int) -> Any:
+    kind %= 9
+    if kind == 0:
+        return rnd.randint(-(10**6), 10**6)
+    if kind == 1:
+        return rnd.random() * 1000
+    if kind == 2:
+        return "".join(rnd.choice(AUTO_ID_ALPHABET) for _ in range(rnd.randint(5, 40)))
+    if kind == 3:
+        return rnd.random() < 0.5
+    if kind == 4:
+        return None
+    if kind == 5:
+        return DatetimeWithNanoseconds.fromtimestamp(
+            rnd.randint(10**9, 2 * 10**9), datetime.timezone.utc
+        )
+    if kind == 6:
+        return GeoPoint(rnd.uniform(-90, 90), rnd.uniform(-180, 180))
+    if kind == 7:
+        return [rnd.randint(0, 100) for _ in range(rnd.randint(0, 10))]
+    if depth <= 0:
+        return {"value": rnd.randint(0, 100)}
+    return {f"f{i}": _value(rnd, rnd.randrange(9), depth - 1) for i in range(4)}
+
+
+def make_document(rnd: random.Random, width: int, depth: int) -> dict:
+    """A document with ``width`` fields of every Firestore type; maps are nested
+    ``depth`` levels deep"""
+    return {f"field_{i:03}": _value(rnd, i, depth) for i in range(width)}
+
+
+def populate(
+    store: FakeStore,
+    collections: int = 3,
+    documents: int = 1000,
+    width: int = 10,
+    depth: int = 1,
+    subcollections: int = 0,
+    seed: int = 0,
+) -> List[str]:
+    """Fill the store with synthetic collections, returns their paths.
+
+    Every ``subcollections``-th document gets a nested collection with a few
+    documents of its own, so the tree has something to expand.
+    """
+    rnd = random.Random(seed)
+    paths = []
+    for c in range(collections):
+        col_path = f"collection_{c:02}"
+        paths.append(col_path)
+        for i in range(documents):
+            doc_id = random_id(rnd)
+            store.set(col_path, doc_id, make_document(rnd, width, depth))
+            if subcollections and i % subcollections == 0:
+                for _ in range(3):
+                    store.set(
+                        f"{col_path}/{doc_id}/children",
+                        random_id(rnd),
+                        make_document(rnd, width, depth),
+                    )
+    return paths
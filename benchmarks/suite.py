@@ -0,0 +1,416 @@
+"""Headless benchmarks of the table and tree hot paths.
+
+Every benchmark is a function which prepares the state for one run and returns
+a callable doing the measured work. Each benchmark is timed ``repeat`` times,
+then run once more under tracemalloc to record its peak memory, so tracing
+doesn't distort the timings.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide6  # noqa: E402
+from PySide6.QtCore import QThreadPool  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from app.log import setup_logging  # noqa: E402
+from app.settings import conf  # noqa: E402
+from benchmarks.fake_firestore import FakeClient, FakeStore, populate  # noqa: E402
+
+BENCHMARKS: Dict[str, Callable[["Environment"], Callable[[], None]]] = {}
+
+
+def benchmark(fn):
+    BENCHMARKS[fn.__name__] = fn
+    return fn
+
+
+class Environment:
+    """The Qt application and a fake database shared by all benchmarks"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.app = QApplication.instance() or QApplication([])
+        self.client = self.create_client()
+        self.collections = self.client.store.child_collections()
+        self._widgets = []
+
+    def create_client(self) -> FakeClient:
+        """A client of a newly populated database, for benchmarks modifying it"""
+        store = FakeStore(latency_ms=self.args.latency_ms)
+        populate(
+            store,
+            collections=self.args.collections,
+            documents=self.args.documents,
+            width=self.args.width,
+            depth=self.args.depth,
+            subcollections=self.args.subcollections,
+            seed=self.args.seed,
+        )
+        return FakeClient(store)
+
+    def wait(self, timeout: float = 600):
+        """Process events until every background task and its callbacks are done"""
+        pool = QThreadPool.globalInstance()
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            self.app.processEvents()
+            if pool.activeThreadCount() == 0:
+                self.app.processEvents()
+                if pool.activeThreadCount() == 0:
+                    return
+            pool.waitForDone(10)
+        raise TimeoutError("Background tasks didn't finish in time")
+
+    def table(self, client: Optional[FakeClient] = None):
+        from app.widgets.collection_table import CollectionTableWidget
+
+        widget = CollectionTableWidget(
+            client=client or self.client, name=self.collections[0]
+        )
+        widget.resize(1200, 800)
+        widget.show()
+        self._widgets.append(widget)
+        return widget
+
+    def tree(self):
+        from app.widgets.collections_tree import CollectionsTreeWidget
+
+        widget = CollectionsTreeWidget(client=self.client)
+        self._widgets.append(widget)
+        return widget
+
+    def cleanup(self):
+        """Throw away widgets of the last run"""
+        for widget in self._widgets:
+            widget.tasks.cancel_all()
+            widget.deleteLater()
+        self._widgets.clear()
+        self.wait()
+
+
+@benchmark
+def table_refresh(env: Environment):
+    """Load the first page of a collection into the table"""
+    widget = env.table()
+
+    def run():
+        widget.refresh_documents_in_table(env.collections[0])
+        env.wait()
+
+    return run
+
+
+@benchmark
+def table_load_all(env: Environment):
+    """Read a whole collection with the parallel scan"""
+    widget = env.table()
+
+    def run():
+        widget.refresh_documents_in_table(env.collections[0])
+        env.wait()
+        widget.load_all_documents()
+        env.wait()
+
+    return run
+
+
+@benchmark
+def table_refresh_changes(env: Environment):
+    """Refresh a fully loaded collection where a handful of documents changed"""
+    client = env.create_client()
+    widget = env.table(client)
+    widget.refresh_documents_in_table(env.collections[0])
+    env.wait()
+    widget.load_all_documents()
+    env.wait()
+    ids = widget.model.ids
+    for doc_id in ids[:: max(1, len(ids) // 5)]:
+        client.store.set(env.collections[0], doc_id, {"changed": True})
+
+    def run():
+        widget.refresh_documents_in_table()
+        env.wait()
+
+    return run
+
+
+@benchmark
+def table_delete(env: Environment):
+    """Remove every loaded document of a collection"""
+    widget = env.table(env.create_client())
+    widget.refresh_documents_in_table(env.collections[0])
+    env.wait()
+    widget.load_all_documents()
+    env.wait()
+
+    def run():
+        widget.delete_documents(list(widget.model.ids))
+        env.wait()
+
+    return run
+
+
+@benchmark
+def table_cells_repr(env: Environment):
+    """Render every cell of a loaded collection, as the view and dialogs do"""
+    from PySide6.QtCore import Qt
+
+    widget = env.table()
+    widget.refresh_documents_in_table(env.collections[0])
+    env.wait()
+    widget.load_all_documents()
+    env.wait()
+    model = widget.model
+
+    def run():
+        for row in range(model.rowCount()):
+            for column in range(model.columnCount()):
+                index = model.index(row, column)
+                model.data(index, Qt.DisplayRole)
+                item = model.item(index)
+                if item is not None:
+                    item.repr
+
+    return run
+
+
+@benchmark
+def table_scroll_large_values(env: Environment):
+    """Scroll through documents holding 1 MB arrays and maps"""
+    client = FakeClient(FakeStore())
+    for i in range(50):
+        client.store.set(
+            "large",
+            f"doc{i:03}",
+            {
+                "array": list(range(100_000)),
+                "map": {f"key{j}": j for j in range(20_000)},
+                "text": "x" * 1_000_000,
+            },
+        )
+    widget = env.table(client)
+    widget.refresh_documents_in_table("large")
+    env.wait()
+    table = widget.w_table
+    bar = table.verticalScrollBar()
+
+    def run():
+        for _ in range(3):
+            for value in range(bar.minimum(), bar.maximum() + 1):
+                bar.setValue(value)
+                table.viewport().repaint()
+
+    return run
+
+
+@benchmark
+def bulk_import(env: Environment):
+    """Import an NDJSON export of a collection into an empty database"""
+    from app.db import iter_pages
+    from app.export import export_documents
+    from app.importer import import_documents
+
+    path = Path(tempfile.gettempdir()) / "stora-benchmark-export.ndjson"
+    query = env.client.collection(env.collections[0]).order_by("__name__")
+    for _ in export_documents(iter_pages(query, 1000), path):
+        pass
+    client = FakeClient(FakeStore(latency_ms=env.args.latency_ms))
+
+    def run():
+        for _ in import_documents(client, "imported", path):
+            pass
+
+    return run
+
+
+@benchmark
+def tree_refresh(env: Environment):
+    """List root collections and expand each of them"""
+    widget = env.tree()
+
+    def run():
+        widget.refresh_collections_list()
+        env.wait()
+        tree = widget.w_tree
+        for i in range(tree.topLevelItemCount()):
+            tree.topLevelItem(i).setExpanded(True)
+        env.wait()
+
+    return run
+
+
+@benchmark
+def collection_group_scan(env: Environment):
+    """Read every subcollection with the same id in parallel partitions"""
+    from app.db import scan_collection_group
+
+    def run():
+        for _ in scan_collection_group(env.client, "children"):
+            pass
+
+    return run
+
+
+@benchmark
+def table_stats(env: Environment):
+    """Compute statistics of every field of a fully loaded collection"""
+    widget = env.table()
+    widget.refresh_documents_in_table(env.collections[0])
+    env.wait()
+    widget.load_all_documents()
+    env.wait()
+
+    def run():
+        widget.summarize_loaded_documents()
+        env.wait()
+
+    return run
+
+
+@benchmark
+def search_index(env: Environment):
+    """Index every collection and search it for words of some documents"""
+    from app.db import scan_all_collections
+    from app.models.search import SearchIndex, iter_terms, tokenize
+
+    store = env.client.store
+    queries = []
+    for col_path in env.collections:
+        for doc in list(store.collections[col_path].values())[::50]:
+            words = tokenize(" ".join(str(v) for v in doc.values()))
+            queries.append(" ".join(words[:2]))
+
+    def run():
+        index = SearchIndex()
+        for col_path, ids, terms in iter_terms(scan_all_collections(env.client)):
+            index.add_terms(col_path, ids, terms)
+        for query in queries:
+            index.search(query, conf.search_results)
+
+    return run
+
+
+def measure(env: Environment, name: str, repeat: int) -> dict:
+    fn = BENCHMARKS[name]
+    timings = []
+    for _ in range(repeat):
+        run = fn(env)
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+        env.cleanup()
+
+    run = fn(env)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        env.cleanup()
+
+    return {
+        "name": name,
+        "description": fn.__doc__,
+        "repeat": repeat,
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.mean(timings),
+        "max_s": max(timings),
+        "peak_memory_bytes": peak,
+    }
+
+
+def compare(results: List[dict], baseline: dict) -> List[str]:
+    previous = {r["name"]: r for r in baseline.get("results", [])}
+    lines = []
+    for result in results:
+        old = previous.get(result["name"])
+        if not old:
+            continue
+        time_ratio = result["median_s"] / old["median_s"] if old["median_s"] else 0
+        mem_ratio = (
+            result["peak_memory_bytes"] / old["peak_memory_bytes"]
+            if old["peak_memory_bytes"]
+            else 0
+        )
+        lines.append(
+            f"{result['name']:<20} time x{time_ratio:.2f}  memory x{mem_ratio:.2f}"
+        )
+    return lines
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("names", nargs="*", help="benchmarks to run, all by default")
+    parser.add_argument("--collections", type=int, default=3)
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--width", type=int, default=20, help="fields per document")
+    parser.add_argument("--depth", type=int, default=2, help="nesting of maps")
+    parser.add_argument(
+        "--subcollections",
+        type=int,
+        default=0,
+        help="add a subcollection to every n-th document",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0, help="per RPC")
+    parser.add_argument("--page-size", type=int, default=conf.page_size)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to a file")
+    parser.add_argument("--baseline", help="compare with results of a previous run")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    setup_logging()
+    unknown = set(args.names).difference(BENCHMARKS)
+    if unknown:
+        sys.exit(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    # measure the way to the server, not the local cache
+    conf.cache_enabled = False
+    conf.page_size = args.page_size
+
+    env = Environment(args)
+    results = []
+    for name in args.names or BENCHMARKS:
+        result = measure(env, name, args.repeat)
+        results.append(result)
+        print(
+            f"{name:<20} median {result['median_s'] * 1000:9.1f}ms  "
+            f"min {result['min_s'] * 1000:9.1f}ms  "
+            f"peak {result['peak_memory_bytes'] / 2**20:7.1f}MB",
+            file=sys.stderr,
+        )
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pyside": PySide6.__version__,
+        "platform": platform.platform(),
+        "parameters": {k: v for k, v in vars(args).items() if k != "names"},
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        print("\n".join(compare(results, baseline)), file=sys.stderr)
@@ -11,11 +11,11 @@ ROOT = Path(__file__).parent
 COMPILED_WIDGETS_DIR = ROOT / "app" / "widgets" / "auto"
 
 
-@task
-def stora(ctx):
+@task(help={"startup_report": "log how long every startup phase took"})
+def stora(ctx, startup_report=False):
     from app.main import main
 
-    main()
+    main(["--startup-report"] if startup_report else [])
 
 
 @task
@@ -173,3 +173,146 @@ def release(ctx):
         ctx.run(f"git push origin {version}", echo=True)
     else:
         print("Failed to find version in the pyproject.toml")
+
+
+@task(
+    help={
+        "documents": "documents per collection",
+        "width": "fields per document",
+        "depth": "nesting of map fields",
+        "latency_ms": "simulated latency of every RPC",
+        "output": "file to write JSON results to",
+        "baseline": "results of a previous run to compare with",
+    }
+)
+def bench(
+    ctx,
+    documents=5000,
+    width=20,
+    depth=2,
+    latency_ms=0.0,
+    repeat=5,
+    output="",
+    baseline="",
+):
+    from benchmarks.suite import main
+
+    argv = [
+        f"--documents={documents}",
+        f"--width={width}",
+        f"--depth={depth}",
+        f"--latency-ms={latency_ms}",
+        f"--repeat={repeat}",
+    ]
+    if output:
+        argv.append(f"--output={output}")
+    if baseline:
+        argv.append(f"--baseline={baseline}")
+    main(argv)
+
+
+@task(
+    help={
+        "collection": "path of the collection to export",
+        "output": "file to write, .ndjson/.jsonl or .csv",
+        "where": 'conditions as in the query bar, e.g. \'age >= 18 and x == "y"\'',
+        "order_by": "field to sort by, optionally followed by desc",
+        "select": "comma separated fields to export",
+        "limit": "maximum amount of documents, 0 means no limit",
+        "emulator_host": "address of the Firestore emulator",
+    }
+)
+def export(
+    ctx,
+    project,
+    collection,
+    output,
+    where="",
+    order_by="",
+    select="",
+    limit=0,
+    emulator_host="",
+):
+    from app.db import get_firestore_emulator_client, iter_pages
+    from app.export import export_documents
+    from app.query import QuerySpec
+    from app.settings import conf
+
+    client = get_firestore_emulator_client(project, emulator_host or None)
+    spec = QuerySpec.parse(where=where, order_by=order_by, fields=select, limit=limit)
+    pages = iter_pages(
+        spec.apply(client.collection(collection)), conf.export_page_size, spec.limit
+    )
+    progress = "0 document(s)"
+    for progress in export_documents(pages, output):
+        print(f"\rExporting... {progress}", end="", flush=True)
+    print(f"\rExported {progress} to {output}")
+
+
+@task(
+    name="import",
+    help={
+        "collection": "path of the collection to write to",
+        "source": "file to read, .ndjson/.jsonl or .csv; - reads stdin",
+        "format": "ndjson or csv, by default guessed from the file name",
+        "types": "types of CSV columns, e.g. 'age=int,created=datetime'",
+        "batch_size": "documents per write batch, at most 500",
+        "parallelism": "maximum amount of batches committed at once",
+        "restart": "ignore the checkpoint of a previous run",
+        "emulator_host": "address of the Firestore emulator",
+    },
+)
+def import_(
+    ctx,
+    project,
+    collection,
+    source,
+    format="",
+    types="",
+    batch_size=0,
+    parallelism=0,
+    restart=False,
+    emulator_host="",
+):
+    from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+
+    from app.db import get_firestore_emulator_client
+    from app.importer import Checkpoint, checkpoint_path, import_documents
+
+    type_names = {
+        "str": str,
+        "bool": bool,
+        "int": int,
+        "float": float,
+        "datetime": DatetimeWithNanoseconds,
+        "map": dict,
+        "array": list,
+    }
+    structure = {}
+    for item in filter(None, types.split(",")):
+        key, _, type_name = item.partition("=")
+        structure[key.strip()] = type_names[type_name.strip()]
+
+    checkpoint_file = None if source == "-" else checkpoint_path(source)
+    checkpoint = None
+    if checkpoint_file and not restart:
+        checkpoint = Checkpoint.load(checkpoint_file)
+        if checkpoint and checkpoint.collection == collection:
+            print(f"Resuming after {checkpoint.position} record(s)")
+        else:
+            checkpoint = None
+
+    progress = "0 document(s)"
+    for progress in import_documents(
+        get_firestore_emulator_client(project, emulator_host or None),
+        collection,
+        source,
+        structure=structure,
+        batch_size=batch_size or None,
+        parallelism=parallelism or None,
+        checkpoint=checkpoint,
+        checkpoint_file=checkpoint_file,
+        format_=format or None,
+    ):
+        print(f"\rImporting... {progress}", end="", flush=True)
+    print(f"\rImported {progress} into {collection}")